@@ -0,0 +1,201 @@
+"""
+asyncio counterparts of the page objects, built on playwright.async_api.
+
+Locators, filter state and filter decisions (`filter_switch`, `swap_labels`) come
+from the same *Locators base classes as the sync page objects, the waits from the
+same `Readiness` helper (trends-request idle, cards changed), and cards are parsed
+with the same CARD_TEXTS_JS / parse_card, so the two variants cannot drift apart.
+Only the awaiting differs (and TrendCapture, which is sync-only).
+"""
+import asyncio
+from contextlib import nullcontext
+from typing import Dict, List, Optional
+
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError, expect
+
+from exploding_trends_page import CARD_TEXTS_JS, TRENDS_URL_RE, ExplodingTrendsLocators, parse_card
+from homepage_tickertrends import HomePageLocators
+from loginpage_tickertrends import LoginPageLocators
+from mainpage_tickertrends import MainPageLocators
+from readiness import CARDS_CHANGED_JS, FIRST_CARD_TEXT_JS, TREND_CARD_SELECTOR, Readiness
+
+
+class AsyncMainPage(MainPageLocators):
+    """Async page object for shared UI on tickertrends pages."""
+
+    def __init__(self, page: Page) -> None:
+        super().__init__(page)
+
+    async def close_subscription_popup_if_present(self) -> None:
+        """Closes the newsletter popup if present; never fails the flow."""
+        try:
+            if await self.overlay.count() == 0:
+                return
+            if await self.close_x.is_visible():
+                await self.close_x.click(timeout=1000)
+            if await self.overlay.is_visible():
+                await self.close_x.click(timeout=800, force=True)
+            await self.overlay.wait_for(state="hidden", timeout=1500)
+        except Exception:
+            pass
+
+    async def prepare_and_open_login(self) -> None:
+        """Closes popup (if any) and then opens login."""
+        await self.close_subscription_popup_if_present()
+        await self.login_btn.click()
+
+
+class AsyncLoginPage(LoginPageLocators):
+    """Async page object for the Login modal."""
+
+    def __init__(self, page: Page) -> None:
+        super().__init__(page)
+
+    async def login(self, username: str, password: str, timeout: int = 15_000) -> None:
+        """Opens the email login, submits the credentials and waits for the modal to go away."""
+        await self.continue_with_email_btn.click()
+        await expect(self.login_modal).to_be_visible(timeout=10_000)
+        await self.email_input.fill(username)
+        await self.password_input.fill(password)
+        await self.login_button.click()
+        await self.login_modal.wait_for(state="detached", timeout=timeout)
+
+
+class AsyncHomePage(HomePageLocators):
+    """Async page object for the TickerTrends Home page."""
+
+    def __init__(self, page: Page) -> None:
+        super().__init__(page)
+
+    async def open_exploding_trends(self, timeout: int = 20_000) -> None:
+        """Waits for and opens the Exploding Trends card."""
+        await self.exploding_card.wait_for(state="visible", timeout=timeout)
+        await expect(self.exploding_card).to_be_enabled()
+        await self.exploding_card.click()
+
+
+class AsyncExplodingTrendsPage(ExplodingTrendsLocators):
+    """Async page object for the Exploding Trends page (same steps and waits as the sync one)."""
+
+    def __init__(self, page: Page) -> None:
+        super().__init__(page)
+        self.ready = Readiness.for_page(page)
+
+    async def is_open(self, timeout: int = 5_000) -> bool:
+        """True once the sectors button is visible."""
+        try:
+            await self.category_button.wait_for(state="visible", timeout=timeout)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+
+    async def _cards_changed(self, before: str, timeout: int) -> bool:
+        try:
+            await self.page.wait_for_function(CARDS_CHANGED_JS, arg=[TREND_CARD_SELECTOR, before], timeout=timeout)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+
+    # ---------- FILTERS ----------
+    async def _switch_filter(self, kind: str, label: str, timeout: int) -> bool:
+        """See `ExplodingTrendsPage._switch_filter`."""
+        switch = self.filter_switch(kind, label)
+        if switch is None:
+            return False
+        chip, target, missing = switch
+        await chip.click()
+        await expect(target, missing).to_be_visible(timeout=timeout)
+        await target.click()
+        setattr(self, f"current_{kind}", label)
+        await self.ready.network_idle_async(TRENDS_URL_RE, timeout=timeout, name=f"{kind}_request_idle")
+        return True
+
+    async def choose_data_type(self, label: str, timeout: int = 5_000) -> None:
+        """Switch Data Type (e.g., 'Search Trend', 'Tiktok')."""
+        await self._switch_filter("data_type", label, timeout)
+
+    async def choose_view(self, label: str, timeout: int = 5_000) -> None:
+        """Change the 'View' dropdown, e.g. 'List View'."""
+        await self._switch_filter("view", label, timeout)
+
+    async def choose_time_granularity(self, label: str, timeout: int = 5_000) -> None:
+        """Switch to 'Daily', 'Weekly', or 'Monthly'."""
+        await self._switch_filter("granularity", label, timeout)
+
+    async def choose_category(self, label: str, timeout: int = 5_000) -> None:
+        """Select one sector by its visible label and apply (an already selected one is unselected)."""
+        await self.toggle_categories([label], timeout)
+
+    async def swap_category(self, old: Optional[str], new: Optional[str], timeout: int = 5_000) -> None:
+        """Unselect `old` and select `new` in a single menu open and apply once."""
+        labels = self.swap_labels(old, new)
+        if labels:
+            await self.toggle_categories(labels, timeout)
+
+    async def toggle_categories(self, labels: List[str], timeout: int = 5_000) -> None:
+        """See `ExplodingTrendsPage.toggle_categories`."""
+        await self.category_button.click()
+        await expect(self.apply_filter_btn).to_be_visible(timeout=timeout)  # menu is open
+        for label in labels:
+            option = self.category_option(label)
+            await expect(option, f"Label '{label}' not found").to_be_visible(timeout=timeout)
+            await option.click()
+
+        before = await self.page.evaluate(FIRST_CARD_TEXT_JS, TREND_CARD_SELECTOR)
+        await self.apply_filter_btn.click()
+        try:
+            await self.apply_filter_btn.wait_for(state="hidden", timeout=timeout)
+        except PlaywrightTimeoutError:
+            raise AssertionError("Sectors menu did not close after 'Apply Filter'")
+        await self.ready.network_idle_async(TRENDS_URL_RE, timeout=timeout, name="trends_request_idle")
+        await self._cards_changed(before, timeout=1_500)
+
+    # ---------- EXTRACTION ----------
+    async def extract_page_trends(self, timeout: int = 20_000) -> List[Dict[str, str]]:
+        """Extract the cards of the current page in one round-trip."""
+        await expect(self.trend_cards.first, "No trend cards found").to_be_visible(timeout=timeout)
+        raw_cards = await self.trend_cards.evaluate_all(CARD_TEXTS_JS)
+        return [parse_card(**raw) for raw in raw_cards]
+
+    async def extract_page_or_empty(self, timeout: int = 20_000) -> List[Dict[str, str]]:
+        """Like `extract_page_trends`, but an empty page returns []."""
+        try:
+            return await self.extract_page_trends(timeout=timeout)
+        except AssertionError:
+            return []
+
+    async def extract_all_trends(
+        self,
+        max_pages: int,
+        tabs: Optional[asyncio.Semaphore] = None,
+        timeout: int = 20_000,
+        empty_timeout: int = 3_000,
+        window: int = 3,
+    ) -> List[Dict[str, str]]:
+        """
+        Extract pages 1..max_pages; pages 2..N are loaded by `pageNo` URL in extra tabs.
+
+        Like `ExplodingTrendsPage.extract_all_trends_prefetch`, at most `window` pages
+        are loaded at a time (and no more tabs than the shared `tabs` semaphore allows).
+        It stops at the first empty page or at a page shorter than page 1, so nothing
+        past the last page is requested beyond the current window.
+        """
+        all_data = await self.extract_page_trends(timeout=timeout)
+        full_page = len(all_data)
+
+        async def load(page_no: int) -> List[Dict[str, str]]:
+            async with tabs if tabs is not None else nullcontext():
+                tab = await self.page.context.new_page()
+                try:
+                    await tab.goto(self.page_url(page_no), wait_until="domcontentloaded", timeout=timeout)
+                    return await AsyncExplodingTrendsPage(tab).extract_page_or_empty(timeout=empty_timeout)
+                finally:
+                    await tab.close()
+
+        for start in range(2, max_pages + 1, max(1, window)):
+            batch = range(start, min(start + max(1, window), max_pages + 1))
+            for rows in await asyncio.gather(*(load(n) for n in batch)):
+                all_data.extend(rows)
+                if len(rows) < full_page:
+                    return all_data  # empty or short page = last page
+        return all_data
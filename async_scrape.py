@@ -0,0 +1,125 @@
+"""
+Async scrape driver: many category / page tasks on a single event loop.
+
+One browser context is authenticated (cached session or a full login), then every
+category runs in its own tab and its pages 2..N are loaded in extra tabs. Two
+semaphores bound the work: `concurrency` categories at a time, and at most
+`concurrency` extra page tabs on top of them (separate so page tasks never wait on
+a permit held by their own category).
+
+    python async_scrape.py --concurrency 4
+"""
+import argparse
+import asyncio
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Sequence, Tuple
+
+from playwright.async_api import Browser, BrowserContext, async_playwright
+
+from async_pages import AsyncExplodingTrendsPage, AsyncHomePage, AsyncLoginPage, AsyncMainPage
+from test_tickertrends import (
+    BASE_URL,
+    CATEGORIES,
+    GRANULARITY,
+    MAX_PAGES,
+    SESSION_CACHE,
+    get_secret,
+    trend_rows,
+)
+
+Row = Dict[str, str]
+
+
+async def open_authenticated_context(browser: Browser) -> Tuple[BrowserContext, str]:
+    """Context with a valid session plus the Exploding Trends URL to open tabs at."""
+    cached = SESSION_CACHE.load()
+    if cached:
+        context = await browser.new_context(storage_state=cached["storage_state"])
+        page = await context.new_page()
+        await page.goto(cached["url"], wait_until="domcontentloaded", timeout=30_000)
+        await AsyncMainPage(page).close_subscription_popup_if_present()
+        if await AsyncExplodingTrendsPage(page).is_open(timeout=10_000):
+            await page.close()
+            return context, cached["url"]
+        SESSION_CACHE.invalidate()
+        await context.close()
+
+    context = await browser.new_context()
+    page = await context.new_page()
+    await page.goto(BASE_URL, wait_until="domcontentloaded", timeout=30_000)
+    await AsyncMainPage(page).prepare_and_open_login()
+    credentials = get_secret()
+    await AsyncLoginPage(page).login(credentials["tickertrends_email"], credentials["tickertrends_password"])
+    await AsyncHomePage(page).open_exploding_trends()
+    url = page.url
+    if await AsyncExplodingTrendsPage(page).is_open(timeout=20_000):
+        url = page.url
+        SESSION_CACHE.save_state(await context.storage_state(), url)
+    await page.close()
+    return context, url
+
+
+async def scrape_categories_async(
+    context: BrowserContext,
+    exploding_url: str,
+    categories: Sequence[str] = CATEGORIES,
+    concurrency: int = 4,
+) -> List[Row]:
+    """Scrape all categories concurrently; rows come back in `categories` order."""
+    scrape_time = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S %Z")
+    category_slots = asyncio.Semaphore(concurrency)
+    page_tabs = asyncio.Semaphore(concurrency)
+
+    async def scrape_one(cat: str) -> List[Row]:
+        async with category_slots:
+            page = await context.new_page()
+            try:
+                await page.goto(exploding_url, wait_until="domcontentloaded", timeout=30_000)
+                et = AsyncExplodingTrendsPage(page)
+                await et.choose_data_type("Tiktok")
+                await et.choose_view("List View")
+                await et.choose_time_granularity(GRANULARITY)
+                await et.choose_category(cat)
+                trends = await et.extract_all_trends(max_pages=MAX_PAGES, tabs=page_tabs)
+            finally:
+                await page.close()
+
+        logging.info(f"  → Collected {len(trends)} rows for {cat}")
+        return trend_rows(trends, scrape_time, cat)
+
+    results = await asyncio.gather(*(scrape_one(c) for c in categories), return_exceptions=True)
+
+    all_rows: List[Row] = []
+    for cat, res in zip(categories, results):
+        if isinstance(res, BaseException):
+            logging.warning(f"  ⚠️ Skipped {cat} due to error: {res}")
+            continue
+        all_rows.extend(res)
+    return all_rows
+
+
+async def main(concurrency: int, headless: bool = True) -> List[Row]:
+    async with async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=headless)
+        try:
+            context, exploding_url = await open_authenticated_context(browser)
+            return await scrape_categories_async(context, exploding_url, concurrency=concurrency)
+        finally:
+            await browser.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="Scrape all categories on one asyncio loop.")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--out", default="", help="write the rows to this JSON file")
+    args = parser.parse_args()
+
+    rows = asyncio.run(main(args.concurrency))
+    logging.info(f"Collected {len(rows)} rows")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False)
@@ -0,0 +1,201 @@
+"""
+End-to-end scraper benchmark against the offline mock site (no network needed).
+
+Runs the real page objects through login → Exploding Trends → filters → every
+category / page on `mock_tickertrends_site`, and reports:
+- per-page time (navigation + extraction, from one page's rows to the next);
+- per-category time (select, paginate, unselect);
+- full-run time (login included);
+- peak RSS of this process plus its children (Playwright driver, Chromium).
+
+    python benchmark_tickertrends.py --categories 4 --pages 11 --cards 24 --latency-ms 150
+    python benchmark_tickertrends.py --prefetch-tabs 3 --json bench.json
+    python benchmark_tickertrends.py --categories 12 --pages 11 --watermark-mb 600
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+from playwright.sync_api import sync_playwright
+
+from mainpage_tickertrends import MainPage
+from loginpage_tickertrends import LoginPage
+from homepage_tickertrends import HomePage
+from exploding_trends_page import ExplodingTrendsPage
+from trend_capture import TrendCapture
+from memory_guard import MemoryGuard, tree_rss_bytes
+from mock_tickertrends_site import SECTORS, MockSite, serve
+
+
+# ---------- MEMORY ----------
+class PeakRss:
+    """Samples the process tree RSS in a background thread and keeps the peak."""
+
+    def __init__(self, interval: float = 0.2) -> None:
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, tree_rss_bytes(os.getpid()))
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "PeakRss":
+        if Path("/proc/self/statm").exists():
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+
+# ---------- RUN ----------
+def _summary(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+    return {
+        "count": len(values),
+        "mean": statistics.fmean(values),
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max": ordered[-1],
+    }
+
+
+def run_benchmark(
+    base_url: str,
+    categories: Sequence[str],
+    max_pages: int,
+    prefetch_tabs: int = 0,
+    capture: bool = False,
+    headless: bool = True,
+    watermark_mb: float = 0,
+) -> Dict[str, Any]:
+    """Scrape `categories` from the mock at `base_url` and return the timings (`watermark_mb` > 0: memory-bounded)."""
+    page_times: List[float] = []
+    category_times: Dict[str, float] = {}
+    rows = 0
+
+    with PeakRss() as rss, sync_playwright() as pw:
+        run_start = time.perf_counter()
+        browser = pw.chromium.launch(headless=headless)
+        try:
+            page = browser.new_page()
+            page.goto(base_url, wait_until="domcontentloaded", timeout=30_000)
+            MainPage(page).prepare_and_open_login()
+            login_page = LoginPage(page)
+            login_page.open_email_login()
+            login_page.fill_username("bench@example.com")
+            login_page.fill_password("bench")
+            login_page.submit_login()
+            if not login_page.wait_until_logged_in():
+                raise RuntimeError("Login modal still open after submitting — is the mock site running?")
+            HomePage(page).open_exploding_trends()
+
+            et = ExplodingTrendsPage(page, capture=TrendCapture().attach(page) if capture else None)
+            et.choose_data_type("Tiktok")
+            et.choose_view("List View")
+            et.choose_time_granularity("Daily")
+            login_seconds = time.perf_counter() - run_start
+            guard = MemoryGuard(watermark_mb) if watermark_mb else None
+            between_pages = (lambda: guard.check(et, "page")) if guard is not None else None
+
+            for cat in categories:
+                cat_start = last = time.perf_counter()
+
+                def page_done(page_no: int, page_rows: List[Dict[str, str]]) -> None:
+                    nonlocal last
+                    now = time.perf_counter()
+                    page_times.append(now - last)
+                    last = now
+
+                et.choose_category(cat)
+                last = time.perf_counter()  # pages are timed from the applied filter on
+                trends = et.extract_all_trends(
+                    max_pages=max_pages, prefetch_tabs=prefetch_tabs, on_page=page_done, between_pages=between_pages
+                )
+                et.choose_category(cat)  # unselect
+                if guard is not None:
+                    guard.check(et, cat)
+                category_times[cat] = time.perf_counter() - cat_start
+                rows += len(trends)
+                logging.info(f"  {cat}: {len(trends)} rows in {category_times[cat]:.2f}s")
+        finally:
+            browser.close()
+        run_seconds = time.perf_counter() - run_start
+
+    return {
+        "config": {
+            "categories": len(categories),
+            "max_pages": max_pages,
+            "prefetch_tabs": prefetch_tabs,
+            "capture": capture,
+            "watermark_mb": watermark_mb,
+        },
+        "rows": rows,
+        "login_seconds": login_seconds,
+        "run_seconds": run_seconds,
+        "page_seconds": _summary(page_times),
+        "category_seconds": _summary(list(category_times.values())),
+        "per_category": category_times,
+        "peak_rss_mb": rss.peak / 1024 / 1024,
+        "memory_guard": guard.summary() if guard is not None else None,
+    }
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    print(f"\n{'metric':<16}{'count':>7}{'mean':>9}{'p50':>9}{'p95':>9}{'max':>9}")
+    for label, key in (("page (s)", "page_seconds"), ("category (s)", "category_seconds")):
+        s = result[key]
+        if s["count"]:
+            print(f"{label:<16}{s['count']:>7}{s['mean']:>9.3f}{s['p50']:>9.3f}{s['p95']:>9.3f}{s['max']:>9.3f}")
+    print(f"\nrows: {result['rows']}  login: {result['login_seconds']:.2f}s  "
+          f"full run: {result['run_seconds']:.2f}s  peak RSS: {result['peak_rss_mb']:.0f} MB")
+    if result["memory_guard"]:
+        print(f"recycles: {result['memory_guard']['recycles']} (watermark {result['memory_guard']['watermark_mb']:.0f} MB)")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="Benchmark the scraper against the offline mock site.")
+    parser.add_argument("--categories", type=int, default=4, help="how many sectors to scrape")
+    parser.add_argument("--pages", type=int, default=5, help="pages per category on the mock")
+    parser.add_argument("--cards", type=int, default=24, help="cards per page")
+    parser.add_argument("--latency-ms", type=int, default=150, help="mock /api/trends latency")
+    parser.add_argument("--prefetch-tabs", type=int, default=0)
+    parser.add_argument("--capture", action="store_true", help="read rows from the JSON responses")
+    parser.add_argument("--watermark-mb", type=float, default=0, help="recycle the page above this RSS (memory_guard)")
+    parser.add_argument("--headed", action="store_true")
+    parser.add_argument("--json", default="", help="also write the result to this file")
+    args = parser.parse_args()
+
+    site = MockSite(cards_per_page=args.cards, pages=args.pages, latency_ms=args.latency_ms)
+    server, base_url = serve(site)
+    try:
+        result = run_benchmark(
+            base_url,
+            SECTORS[: args.categories],
+            max_pages=args.pages,
+            prefetch_tabs=args.prefetch_tabs,
+            capture=args.capture,
+            headless=not args.headed,
+            watermark_mb=args.watermark_mb,
+        )
+    finally:
+        server.shutdown()
+
+    print_report(result)
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2), encoding="utf-8")
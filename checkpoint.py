@@ -0,0 +1,237 @@
+"""
+Checkpoint journal for resumable scrapes, at (category, page) granularity.
+
+Every finished page is committed to a local SQLite file together with its rows.
+A run's entries are deleted once its outputs are written (`clear`), so whatever is
+left in the journal belongs to a run that did not finish. `CheckpointJournal.resume`
+picks such a run up again, with its original run id and scrape time: finished
+categories are skipped, a category continues at its first unfinished page (by
+`pageNo` URL), and only what is missing is scraped. Each page gets a bounded
+number of retries with exponential backoff.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar, Union
+
+from exploding_trends_page import ExplodingTrendsPage
+
+Row = Dict[str, str]
+T = TypeVar("T")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    run_id   TEXT NOT NULL,
+    category TEXT NOT NULL,
+    page_no  INTEGER NOT NULL,
+    rows     TEXT NOT NULL,
+    done_at  REAL NOT NULL,
+    PRIMARY KEY (run_id, category, page_no)
+);
+CREATE TABLE IF NOT EXISTS categories (
+    run_id   TEXT NOT NULL,
+    category TEXT NOT NULL,
+    pages    INTEGER NOT NULL,
+    done_at  REAL NOT NULL,
+    PRIMARY KEY (run_id, category)
+);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      TEXT PRIMARY KEY,
+    scrape_time TEXT NOT NULL,
+    started_at  REAL NOT NULL
+);
+"""
+
+
+class CheckpointJournal:
+    """Finished (category, page) units of one run and their rows (safe to share across threads)."""
+
+    def __init__(self, path: Union[str, Path], run_id: str, scrape_time: str = "") -> None:
+        self.path = Path(path)
+        self.run_id = run_id
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        self.db.executescript(SCHEMA)
+        self._write(
+            "INSERT OR IGNORE INTO runs VALUES (?, ?, ?)", (run_id, scrape_time, time.time())
+        )
+        self.scrape_time = self._query("SELECT scrape_time FROM runs WHERE run_id = ?", (run_id,))[0][0]
+
+    @classmethod
+    def resume(
+        cls, path: Union[str, Path], run_id: str, scrape_time: str, max_age_hours: float = 12
+    ) -> "CheckpointJournal":
+        """
+        The newest unfinished run younger than `max_age_hours` (its run_id and
+        scrape_time are kept), else a new run `run_id` started at `scrape_time`.
+        """
+        db = sqlite3.connect(path)
+        try:
+            db.executescript(SCHEMA)
+            row = db.execute(
+                "SELECT run_id FROM runs WHERE started_at >= ? ORDER BY started_at DESC LIMIT 1",
+                (time.time() - max_age_hours * 3600,),
+            ).fetchone()
+        finally:
+            db.close()
+        if row is not None:
+            logging.info(f"↻ Resuming unfinished run {row[0]} from the checkpoint")
+            return cls(path, row[0])
+        return cls(path, run_id, scrape_time)
+
+    def clear(self) -> None:
+        """Forget this run (call once its outputs are written)."""
+        with self.lock, self.db:
+            for table in ("pages", "categories", "runs"):
+                self.db.execute(f"DELETE FROM {table} WHERE run_id = ?", (self.run_id,))
+
+    def _query(self, sql: str, params: tuple) -> list:
+        with self.lock:
+            return self.db.execute(sql, params).fetchall()
+
+    def _write(self, sql: str, params: tuple) -> None:
+        with self.lock, self.db:
+            self.db.execute(sql, params)
+
+    def close(self) -> None:
+        self.db.close()
+
+    # ---------- pages ----------
+    def record_page(self, category: str, page_no: int, rows: List[Row], last: bool = False) -> None:
+        """Journal one page; `last` also marks the category done, in the same transaction."""
+        now = time.time()
+        with self.lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)",
+                (self.run_id, category, page_no, json.dumps(rows, ensure_ascii=False), now),
+            )
+            if last:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO categories VALUES (?, ?, ?, ?)", (self.run_id, category, page_no, now)
+                )
+
+    def finished_pages(self, category: str) -> List[int]:
+        cur = self._query(
+            "SELECT page_no FROM pages WHERE run_id = ? AND category = ? ORDER BY page_no",
+            (self.run_id, category),
+        )
+        return [r[0] for r in cur]
+
+    def first_unfinished_page(self, category: str) -> int:
+        done = set(self.finished_pages(category))
+        page_no = 1
+        while page_no in done:
+            page_no += 1
+        return page_no
+
+    def rows_for(self, category: str) -> List[Row]:
+        """All journaled rows of a category, in page order."""
+        cur = self._query(
+            "SELECT rows FROM pages WHERE run_id = ? AND category = ? ORDER BY page_no",
+            (self.run_id, category),
+        )
+        return [row for (blob,) in cur for row in json.loads(blob)]
+
+    # ---------- categories ----------
+    def mark_category_done(self, category: str, pages: int) -> None:
+        self._write(
+            "INSERT OR REPLACE INTO categories VALUES (?, ?, ?, ?)",
+            (self.run_id, category, pages, time.time()),
+        )
+
+    def is_category_done(self, category: str) -> bool:
+        cur = self._query(
+            "SELECT 1 FROM categories WHERE run_id = ? AND category = ?", (self.run_id, category)
+        )
+        return bool(cur)
+
+
+def retry_with_backoff(
+    fn: Callable[[], T],
+    attempts: int = 3,
+    base_delay: float = 2.0,
+    what: str = "step",
+    on_retry: Optional[Callable[[int, Exception], None]] = None,
+) -> T:
+    """Call `fn`, retrying up to `attempts` times with 2s, 4s, 8s ... pauses in between."""
+    for attempt in range(1, attempts + 1):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == attempts:
+                raise
+            delay = base_delay * 2 ** (attempt - 1)
+            logging.warning(f"  ↻ {what} failed ({e}); retry {attempt}/{attempts - 1} in {delay:.0f}s")
+            if on_retry is not None:
+                on_retry(attempt, e)
+            time.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+def scrape_category_resumable(
+    et: ExplodingTrendsPage,
+    category: str,
+    journal: CheckpointJournal,
+    max_pages: int,
+    attempts: int = 3,
+    base_delay: float = 2.0,
+    stop_when: Optional[Callable[[List[Row]], bool]] = None,
+    on_retry: Optional[Callable[[int, Exception], None]] = None,
+) -> List[Row]:
+    """
+    Scrape one category page by page, journaling every finished page.
+
+    Already finished pages are skipped; the first unfinished page is opened directly
+    by its `pageNo` URL. A page the pager announced (Next enabled on the page before)
+    has to show cards: if it does not, it is retried, and after `attempts` tries it
+    raises, with everything before it kept in the journal for the next run. The
+    category is only marked done on its last page (Next disabled), at `max_pages`
+    or when `stop_when` says so.
+    """
+    if journal.is_category_done(category):
+        logging.info(f"  ✓ {category} already in checkpoint — skipped")
+        return journal.rows_for(category)
+
+    et.choose_category(category)
+    try:
+        done = set(journal.finished_pages(category))
+        page_no = 1
+
+        while page_no <= max_pages:
+            if page_no in done:
+                page_no += 1
+                continue
+
+            url = et.page_url(page_no)
+            tries = 0
+
+            def load_page() -> Tuple[List[Row], bool]:
+                nonlocal tries
+                tries += 1
+                if page_no > 1 or tries > 1:  # page 1 is already shown after choose_category
+                    et.page.goto(url, wait_until="domcontentloaded", timeout=30_000)
+                # Raises when the cards never render, so a slow page is retried instead of ending the category
+                return et.extract_page_trends(), et.has_next()
+
+            rows, has_next = retry_with_backoff(
+                load_page, attempts, base_delay, what=f"{category} p{page_no}", on_retry=on_retry
+            )
+            last = not has_next or page_no >= max_pages or (stop_when is not None and stop_when(rows))
+            journal.record_page(category, page_no, rows, last=last)
+            if last:
+                break
+            page_no += 1
+
+        if not journal.is_category_done(category):  # every page up to max_pages came from the journal
+            journal.mark_category_done(category, pages=len(journal.finished_pages(category)))
+        return journal.rows_for(category)
+    finally:
+        if et.current_page_no() != 1:
+            try:
+                et.page.goto(et.page_url(1), wait_until="domcontentloaded", timeout=30_000)
+            except Exception as e:  # never hide the scrape's own error
+                logging.warning(f"  ⚠️ Could not go back to page 1 of {category}: {e}")
+        et.choose_category(category)  # unselect
@@ -0,0 +1,102 @@
+"""
+Typed Arrow / Parquet output, partitioned by date= and category=.
+
+Numbers are parsed once here (growth, signed growth, ticker percent, scrape_time)
+so readers no longer re-parse strings, and low-cardinality columns are
+dictionary-encoded. Needs the optional `pyarrow` dependency.
+"""
+import logging
+import uuid
+from typing import Any, Dict, List, Optional
+
+from trend_values import parse_scrape_time, signed_growth, to_float
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:  # optional: only needed for the columnar output
+    pa = ds = None
+
+Row = Dict[str, str]
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise RuntimeError("pyarrow is required for the Parquet output (pip install pyarrow)")
+
+
+def trend_schema() -> "pa.Schema":
+    _require_pyarrow()
+    dict_str = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("scrape_time", pa.timestamp("s", tz="UTC")),
+        ("date", pa.string()),
+        ("granularity", dict_str),
+        ("category", dict_str),
+        ("name", pa.string()),
+        ("sign", dict_str),
+        ("growth", pa.float64()),
+        ("signed_growth", pa.float64()),
+        ("raw_growth", pa.string()),
+        ("ticker_symbol", dict_str),
+        ("ticker_percent", pa.float64()),
+    ])
+
+
+def rows_to_table(rows: List[Row]) -> "pa.Table":
+    """Turn scraped row dicts into a typed Arrow table."""
+    _require_pyarrow()
+    times = [parse_scrape_time(r["scrape_time"]) for r in rows]
+
+    columns: Dict[str, List[Any]] = {
+        "scrape_time": times,
+        "date": [t.strftime("%Y-%m-%d") for t in times],
+        "granularity": [r.get("granularity", "") for r in rows],
+        "category": [r.get("category", "") for r in rows],
+        "name": [r.get("name", "") for r in rows],
+        "sign": [r.get("sign", "") for r in rows],
+        "growth": [to_float(r.get("value")) for r in rows],
+        "signed_growth": [signed_growth(r.get("sign", ""), r.get("value")) for r in rows],
+        "raw_growth": [r.get("raw_growth", "") for r in rows],
+        "ticker_symbol": [r.get("ticker_symbol", "") for r in rows],
+        "ticker_percent": [to_float(r.get("ticker_percent")) for r in rows],
+    }
+    return pa.Table.from_pydict(columns, schema=trend_schema())
+
+
+class ParquetWriter:
+    """
+    Writes each finished category as Parquet under `root/date=.../category=.../`.
+
+    `root` can be a local path or a URI pyarrow understands (e.g. s3://bucket/parquet).
+    Same write_category / close interface as trend_sink.TrendSink.
+    """
+
+    def __init__(self, root: str, run_name: str, compression: str = "zstd", filesystem: Optional[Any] = None) -> None:
+        _require_pyarrow()
+        self.root = root
+        self.run_name = run_name
+        self.compression = compression
+        self.filesystem = filesystem
+        self.rows_written = 0
+
+    def write_category(self, category: str, rows: List[Row]) -> None:
+        if not rows:
+            return
+        ds.write_dataset(
+            rows_to_table(rows),
+            self.root,
+            filesystem=self.filesystem,
+            format="parquet",
+            partitioning=["date", "category"],
+            partitioning_flavor="hive",
+            # One basename per call: another write to the same partition must not replace this file
+            basename_template=f"{self.run_name}-{uuid.uuid4().hex[:12]}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            file_options=ds.ParquetFileFormat().make_write_options(compression=self.compression),
+        )
+        self.rows_written += len(rows)
+
+    def close(self) -> Dict[str, Any]:
+        logging.info(f"✅ {self.rows_written} rows written as Parquet under {self.root}")
+        return {"root": self.root, "rows": self.rows_written}
@@ -0,0 +1,168 @@
+"""
+Dashboard data: a small manifest plus one compact, pre-sorted shard per category.
+
+Each shard holds the rows of one category as arrays (keyword, growth chip, signed
+growth, ticker, ticker %), with the numbers already parsed, sorted by signed growth
+descending (a '+-' chip is a decline and sorts below every rise).
+Shards go to `<prefix>runs/<run>/<slug>.json` and are stored pre-compressed:
+- S3: the object itself is gzip with `Content-Encoding: gzip` (browsers decode it),
+  plus a `.br` twin with `Content-Encoding: br` when `brotli` is installed; S3 does
+  not negotiate, so the manifest names the twin (`br`) and script.js asks for it
+  where the browser accepts brotli (secure contexts), falling back to the gzip one;
+- local: `<slug>.json` next to `.json.gz` / `.json.br` for gzip_static /
+  brotli_static servers, which negotiate on the `.json` URL themselves.
+
+`<prefix>manifest.json` lists categories, row counts and shard paths of the run and
+is only replaced by a newer run, so the dashboard always opens the latest data.
+Same write_category / close interface as trend_sink.TrendSink.
+"""
+import gzip
+import json
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from trend_values import signed_growth, slug, to_float
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+Row = Dict[str, str]
+
+SHARD_COLUMNS = ["keyword", "growth_display", "growth", "ticker", "ticker_pct"]
+
+
+def _number(v: Optional[float]) -> Any:
+    if v is None:
+        return 0
+    return int(v) if v.is_integer() else v
+
+
+def shard_rows(rows: List[Row]) -> List[List[Any]]:
+    """Rows of one category as compact arrays, highest signed growth first."""
+    out = [[
+        r.get("name", ""),
+        r.get("raw_growth", ""),
+        _number(signed_growth(r.get("sign", ""), r.get("value"))),
+        r.get("ticker_symbol", ""),
+        _number(to_float(r.get("ticker_percent"))),
+    ] for r in rows]
+    out.sort(key=lambda r: r[2], reverse=True)
+    return out
+
+
+def _compact(doc: Any) -> bytes:
+    return json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class DashboardPublisher:
+    """
+    Publishes dashboard shards as categories finish and the manifest on close.
+
+    - bucket_name set → S3 under `prefix`, else files under `local_dir/prefix`
+    """
+
+    def __init__(
+        self,
+        run_name: str,
+        bucket_name: str = "",
+        prefix: str = "dashboard/",
+        s3_client: Any = None,
+        local_dir: str = "output",
+    ) -> None:
+        if bucket_name and s3_client is None:
+            raise ValueError("s3_client is required when bucket_name is set")
+        self.run_name = run_name
+        self.bucket_name = bucket_name
+        self.prefix = prefix
+        self.s3_client = s3_client
+        self.local_dir = Path(local_dir)
+        self.scrape_time = ""
+        self.categories: Dict[str, Dict[str, Any]] = {}
+
+    # ---------- storage ----------
+    def _put(self, key: str, body: bytes, encoding: str = "", cache_control: str = "") -> None:
+        if self.bucket_name:
+            extra = {"ContentEncoding": encoding} if encoding else {}
+            if cache_control:
+                extra["CacheControl"] = cache_control
+            self.s3_client.put_object(
+                Bucket=self.bucket_name, Key=key, Body=body, ContentType="application/json", **extra
+            )
+        else:
+            path = self.local_dir / key
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(body)
+
+    def _get_json(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            if self.bucket_name:
+                body = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)["Body"].read()
+            else:
+                body = (self.local_dir / key).read_bytes()
+            return json.loads(body)
+        except Exception:
+            return None  # no manifest yet
+
+    # ---------- sink interface ----------
+    def write_category(self, category: str, rows: List[Row]) -> None:
+        if not rows:
+            return
+        self.scrape_time = self.scrape_time or rows[0].get("scrape_time", "")
+        category_slug = slug(category)
+        key = f"{self.prefix}runs/{self.run_name}/{category_slug}.json"
+        raw = _compact({"run": self.run_name, "category": category, "columns": SHARD_COLUMNS, "rows": shard_rows(rows)})
+        gz = gzip.compress(raw, compresslevel=9, mtime=0)
+        br = brotli.compress(raw) if brotli is not None else None
+
+        immutable = "public, max-age=31536000, immutable"  # run paths never change
+        if self.bucket_name:
+            self._put(key, gz, encoding="gzip", cache_control=immutable)
+            if br is not None:
+                self._put(f"{key}.br", br, encoding="br", cache_control=immutable)
+        else:
+            self._put(key, raw)
+            self._put(f"{key}.gz", gz)
+            if br is not None:
+                self._put(f"{key}.br", br)
+
+        # Paths in the manifest are relative to it
+        path = key[len(self.prefix):]
+        self.categories[category] = {
+            "name": category,
+            "slug": category_slug,
+            "rows": len(rows),
+            "path": path,
+            "br": f"{path}.br" if br is not None and self.bucket_name else None,  # locally the server negotiates
+            "bytes": {"json": len(raw), "gzip": len(gz), "br": len(br) if br is not None else None},
+        }
+
+    def manifest(self) -> Dict[str, Any]:
+        return {
+            "run": self.run_name,
+            "scrape_time": self.scrape_time,
+            "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S %Z"),
+            "total_rows": sum(c["rows"] for c in self.categories.values()),
+            "columns": SHARD_COLUMNS,
+            "categories": sorted(self.categories.values(), key=lambda c: c["name"]),
+        }
+
+    def close(self) -> Dict[str, Any]:
+        """Point the manifest at this run, unless a newer run already published one."""
+        manifest = self.manifest()
+        key = f"{self.prefix}manifest.json"
+        if not self.categories:
+            logging.warning("Dashboard: no categories scraped — manifest left unchanged")
+            return manifest
+
+        current = self._get_json(key)
+        if current and current.get("run", "") > self.run_name:
+            logging.warning(f"Dashboard: manifest already at newer run {current['run']} — left unchanged")
+            return manifest
+
+        self._put(key, _compact(manifest), cache_control="no-cache")
+        logging.info(f"✅ Dashboard manifest → {self.run_name} ({len(self.categories)} categories, {manifest['total_rows']} rows)")
+        return manifest
@@ -1,196 +1,452 @@
-from playwright.sync_api import Page, Locator, expect
-import re
-from typing import List, Dict
-from typing import Optional
-
-class ExplodingTrendsPage:
-    """Page Object for the Exploding Trends page."""
-
-    def __init__(self, page: Page) -> None:
-        self.page = page
-        self.current_granularity: str = "Monthly"
-
-        # ----- Type selector -----
-        self.current_data_type = "Search Trend"
-
-        # ----- View selector (Chart/List) -----
-        self.current_view = "Chart View"
-
-
-        self.category_button: Locator = page.get_by_role(
-            "button", name=re.compile(r"(Select sectors|\d+\s+selected)", re.I)
-        ).first
-        self.apply_filter_btn: Locator = page.get_by_role("button", name="Apply Filter")
-
-        # ----- Trend Cards -----
-        self.trend_cards: Locator = page.locator("div.grid div.trend-ultra-compact")
-
-        # ----- Next button -----
-        # Last one is more robust
-        self.next_button: Locator = page.locator("button:has-text('Next')").last
-
-    # ---------- TYPE MENU ----------
-    def choose_data_type(self, label: str, timeout: int = 5_000) -> None:
-        """
-        Switch Data Type (e.g., 'Search Trend', 'Tiktok', 'Wiki', etc.)
-        Using simple visible text selectors.
-        """
-        if label.lower() == self.current_data_type.lower():
-            print(f"Already using data type '{label}' — skipping.")
-            return
-
-        # Open dropdown by clicking current type (e.g. "Search Trend")
-        self.page.get_by_text(re.compile(rf"^{re.escape(self.current_data_type)}$", re.I)).click()
-
-        # Click the target option
-        target = self.page.get_by_text(label, exact=True)
-        expect(target, f"Data Type '{label}' not found").to_be_visible(timeout=timeout)
-        target.click()
-
-        # Update internal state
-        self.current_data_type = label
-        print(f"Switched data type → {self.current_data_type}")
-
-    # ---------- VIEW SWITCH ----------
-    def choose_view(self, label: str, timeout: int = 5_000) -> None:
-        """
-        Change the 'View' dropdown by text, e.g. 'List View' or 'Chart View'.
-        Uses your pattern: click current text, then click target text.
-        """
-        if label.lower() == self.current_view.lower():
-            return  # already set
-
-        # Click the current view chip (e.g., "Chart View")
-        self.page.get_by_text(re.compile(rf"^{re.escape(self.current_view)}$")).click()
-
-        # Click the target item (e.g., "List View")
-        target = self.page.get_by_text(re.compile(rf"^{re.escape(label)}$"))
-        expect(target, f"View option '{label}' not found").to_be_visible(timeout=timeout)
-        target.click()
-
-        # Update local state
-        self.current_view = label
-
-    # ---------- TIME GRANULARITY ----------
-    def choose_time_granularity(self, label: str, timeout: int = 5_000) -> None:
-        """
-        Switch to 'Daily', 'Weekly', or 'Monthly' using visible text.
-        Avoid redundant clicks by tracking the current granularity.
-        """
-        if label.lower() == self.current_granularity.lower():
-            print(f"Already in '{label}' granularity — skipping change.")
-            return
-
-        # Click the current selection (e.g., "Monthly|")
-        self.page.get_by_text(re.compile(rf"^{self.current_granularity}\|?$", re.I)).click()
-
-        # Click the new option by visible text
-        target = self.page.get_by_text(re.compile(rf"^{re.escape(label)}", re.I))
-        expect(target, f"Granularity option '{label}' not found").to_be_visible(timeout=timeout)
-        target.click()
-
-        # Update internal state
-        self.current_granularity = label
-        print(f"Switched to granularity: {self.current_granularity}")
-
-    # ---------- CATEGORY ----------
-    def open_category_dropdown(self, timeout: int = 5_000) -> None:
-        """Open sectors menu and wait until it's actually open."""
-        self.category_button.click()
-        expect(self.apply_filter_btn).to_be_visible(timeout=timeout)  # menu is open
-
-    def choose_category(self, label: str, timeout: int = 5_000) -> None:
-        """Select one sector by its visible label and apply."""
-        self.open_category_dropdown(timeout)
-        option = self.page.locator("label").filter(has_text=label).first
-        expect(option, f"Label '{label}' not found").to_be_visible(timeout=timeout)
-        option.click()
-        self.apply_filter_btn.click()
-        expect(self.apply_filter_btn).to_be_hidden(timeout=timeout)
-
-
-    def extract_page_trends(self, timeout: int = 20_000) -> List[Dict[str, str]]:
-        """Extract current page trends + top associated ticker and its percent (robust, simple)."""
-        expect(self.trend_cards.first, "No trend cards found").to_be_visible(timeout=timeout)
-        self.page.wait_for_timeout(100)  # small paint debounce
-
-        cards = self.trend_cards.element_handles()  # snapshot
-        results: List[Dict[str, str]] = []
-        growth_re = re.compile(r"^\s*([+\-]{1,2})\s*([\d,\.]+(?:e[+\-]?\d+)?)\s*%?\s*$", re.I)
-        pct_re = re.compile(r"^\s*([\d\.]+)\s*%?\s*$")
-
-        for c in cards:
-            # --- trend name ---
-            h3 = c.query_selector("h3")
-            name = (h3.inner_text().strip() if h3 else "")
-
-            # --- growth chip (e.g., +4454%) ---
-            badge = c.query_selector("div.mb-2 > span")
-            raw_growth = (badge.inner_text().strip() if badge else "")
-            m = growth_re.match(raw_growth.replace("%", ""))
-            if m:
-                sign, val = m.groups()
-                # There are not any commas but just in case
-                val = val.replace(",", "")
-            else:
-                sign = val = ""
-
-            # --- top ticker + percent (button with two spans) ---
-            # Example element:
-            # <button ...><span>AAPL</span><span>83%</span></button>
-            ticker_btn = c.query_selector("button.flex.w-full.items-center.justify-between")
-            ticker_symbol, ticker_percent = "", ""
-            if ticker_btn:
-                spans = ticker_btn.query_selector_all("span")
-                if len(spans) >= 2:
-                    ticker_symbol = (spans[0].inner_text() or "").strip()
-                    pct_txt = (spans[1].inner_text() or "").strip()
-                    pm = pct_re.match(pct_txt)
-                    ticker_percent = pm.group(1) if pm else pct_txt  # '83' or fallback
-
-            results.append({
-                "name": name,
-                "sign": sign,  # '+', '-', '+-'
-                "value": val,  # numeric string (supports scientific notation)
-                "raw_growth": raw_growth,  # original chip text
-                "ticker_symbol": ticker_symbol,  # e.g., 'AAPL'
-                "ticker_percent": ticker_percent,  # e.g., '83'
-            })
-
-        return results
-
-    def has_next(self) -> bool:
-        """True if the 'Next' button exists and is not disabled."""
-        return self.next_button.count() > 0 and not self.next_button.is_disabled()
-
-    def go_next_page(self, timeout: int = 10_000) -> bool:
-        """Click 'Next' and wait for the URL (pageNo) to change."""
-        if not self.has_next():
-            return False
-
-        old_url = self.page.url
-        self.next_button.click()
-
-        # Wait until URL changes (pageNo increments)
-        self.page.wait_for_function(
-            "prev => window.location.href !== prev",
-            arg=old_url,
-            timeout=timeout,
-        )
-        return True
-
-    def extract_all_trends(self, max_pages: Optional[int] = None) -> List[Dict[str, str]]:
-        """Extract all trend cards from all available pages."""
-        all_data: List[Dict[str, str]] = []
-        page_count = 0
-
-        while True:
-            all_data.extend(self.extract_page_trends())
-            page_count += 1
-
-            if max_pages and page_count >= max_pages:
-                break
-            if not self.go_next_page():
-                break
-
+from playwright.sync_api import Page, Locator, expect
+import re
+from collections import deque
+from typing import Any, Callable, Deque, List, Dict, Tuple
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from readiness import Readiness
+from trend_values import parse_card  # re-exported: the card parsing is Playwright-free
+
+# XHR/fetch endpoint that fills the grid; page waits only track these requests
+TRENDS_URL_RE = re.compile(r"/api/[^?#]*trend", re.I)
+
+# Reads name / growth chip / top ticker of every card in a single evaluate_all call.
+# Example ticker element:
+# <button ...><span>AAPL</span><span>83%</span></button>
+CARD_TEXTS_JS = """
+cards => cards.map(c => {
+    const text = el => (el ? (el.innerText || "") : "").trim();
+    const btn = c.querySelector("button.flex.w-full.items-center.justify-between");
+    const spans = btn ? btn.querySelectorAll("span") : [];
+    const hasTicker = spans.length >= 2;
+    return {
+        name: text(c.querySelector("h3")),
+        raw_growth: text(c.querySelector("div.mb-2 > span")),
+        ticker_symbol: hasTicker ? text(spans[0]) : "",
+        pct_txt: hasTicker ? text(spans[1]) : "",
+    };
+})
+"""
+
+# Outer HTML of every card in one call, for off-browser parsing (snapshot_parse.py)
+CARD_HTML_JS = "cards => cards.map(c => c.outerHTML).join('\\n')"
+
+
+class ExplodingTrendsLocators:
+    """
+    Locators and filter state of the Exploding Trends page.
+
+    Building locators is synchronous in both Playwright APIs, so this is shared by
+    `ExplodingTrendsPage` and `async_pages.AsyncExplodingTrendsPage`.
+    """
+
+    def __init__(self, page: Any) -> None:
+        self.page = page
+        self.current_granularity: str = "Monthly"
+
+        # ----- Type selector -----
+        self.current_data_type = "Search Trend"
+
+        # ----- View selector (Chart/List) -----
+        self.current_view = "Chart View"
+
+
+        self.category_button: Locator = page.get_by_role(
+            "button", name=re.compile(r"(Select sectors|\d+\s+selected)", re.I)
+        ).first
+        self.apply_filter_btn: Locator = page.get_by_role("button", name="Apply Filter")
+
+        # ----- Trend Cards -----
+        self.trend_cards: Locator = page.locator("div.grid div.trend-ultra-compact")
+
+        # ----- Next button -----
+        # Last one is more robust
+        self.next_button: Locator = page.locator("button:has-text('Next')").last
+
+    # ----- Dropdown items (current chip opens the menu, then click the target) -----
+    def data_type_chip(self) -> Locator:
+        return self.page.get_by_text(re.compile(rf"^{re.escape(self.current_data_type)}$", re.I))
+
+    def data_type_option(self, label: str) -> Locator:
+        return self.page.get_by_text(label, exact=True)
+
+    def view_chip(self) -> Locator:
+        return self.page.get_by_text(re.compile(rf"^{re.escape(self.current_view)}$"))
+
+    def view_option(self, label: str) -> Locator:
+        return self.page.get_by_text(re.compile(rf"^{re.escape(label)}$"))
+
+    def granularity_chip(self) -> Locator:
+        # e.g., "Monthly|"
+        return self.page.get_by_text(re.compile(rf"^{self.current_granularity}\|?$", re.I))
+
+    def granularity_option(self, label: str) -> Locator:
+        return self.page.get_by_text(re.compile(rf"^{re.escape(label)}", re.I))
+
+    def category_option(self, label: str) -> Locator:
+        return self.page.locator("label").filter(has_text=label).first
+
+    def checked_category_options(self) -> Locator:
+        return self.page.locator("label:has(input[type='checkbox']:checked)")
+
+    # ----- Shared by the sync and the async page object -----
+    FILTER_NAMES = {"data_type": "Data Type", "view": "View option", "granularity": "Granularity option"}
+
+    def filter_switch(self, kind: str, label: str) -> Optional[Tuple[Locator, Locator, str]]:
+        """
+        (chip, option, not-found message) to switch filter `kind` ('data_type', 'view',
+        'granularity') to `label`; None when it is already set.
+        """
+        if label.lower() == getattr(self, f"current_{kind}").lower():
+            return None
+        chip, option = {
+            "data_type": (self.data_type_chip, self.data_type_option),
+            "view": (self.view_chip, self.view_option),
+            "granularity": (self.granularity_chip, self.granularity_option),
+        }[kind]
+        return chip(), option(label), f"{self.FILTER_NAMES[kind]} '{label}' not found"
+
+    @staticmethod
+    def swap_labels(old: Optional[str], new: Optional[str]) -> List[str]:
+        """Sectors to toggle to go from `old` to `new` (either may be None)."""
+        return [] if old == new else [label for label in (old, new) if label]
+
+    def page_url(self, page_no: int) -> str:
+        """Current URL with `pageNo` set to `page_no` (the other query params are kept)."""
+        parts = urlsplit(self.page.url)
+        query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != "pageNo"]
+        query.append(("pageNo", str(page_no)))
+        return urlunsplit(parts._replace(query=urlencode(query)))
+
+    def current_page_no(self) -> int:
+        """`pageNo` of the current URL; a URL without one shows page 1."""
+        values = [v for k, v in parse_qsl(urlsplit(self.page.url).query) if k == "pageNo"]
+        return int(values[-1]) if values and values[-1].isdigit() else 1
+
+
+class ExplodingTrendsPage(ExplodingTrendsLocators):
+    """Page Object for the Exploding Trends page."""
+
+    def __init__(self, page: Page, capture: Optional[Any] = None) -> None:
+        super().__init__(page)
+        self.ready = Readiness.for_page(page)
+        # Optional trend_capture.TrendCapture: read rows from the grid's JSON responses
+        self.capture = capture
+
+    def is_open(self, timeout: int = 5_000) -> bool:
+        """True once the sectors button is visible, i.e. we are on Exploding Trends and logged in."""
+        return self.ready.visible(self.category_button, timeout=timeout, name="exploding_trends_open")
+
+    def move_to(self, page: Page, timeout: int = 30_000) -> None:
+        """
+        Continue on another tab (e.g. a fresh one when memory_guard recycles): it opens
+        the current URL, which carries filters, sector and pageNo, and the filter
+        state of this object is kept. This object only switches once the new tab
+        shows the page; if it does not, the new tab is closed and this object stays
+        on the old one. The old tab is left to the caller to close.
+        """
+        url = self.page.url
+        old_page = self.page
+        if self.capture is not None:
+            self.capture.detach()
+            self.capture.attach(page)  # before goto, so the grid's response is seen
+        try:
+            ready = Readiness.for_page(page)
+            page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+            sectors = ExplodingTrendsLocators(page).category_button
+            if not ready.visible(sectors, timeout=timeout, name="exploding_trends_open"):
+                raise AssertionError(f"Exploding Trends did not open on the new tab ({url})")
+            ready.network_idle(TRENDS_URL_RE, timeout=timeout, name="trends_request_idle")
+        except Exception:
+            if self.capture is not None:
+                self.capture.detach()
+                self.capture.attach(old_page)
+            page.close()
+            raise
+
+        state = (self.current_data_type, self.current_view, self.current_granularity)
+        ExplodingTrendsLocators.__init__(self, page)
+        self.current_data_type, self.current_view, self.current_granularity = state
+        self.ready = ready
+
+    def _switch_filter(self, kind: str, label: str, timeout: int) -> bool:
+        """Open the filter's chip, pick `label` and wait for the grid's request; False if already set."""
+        switch = self.filter_switch(kind, label)
+        if switch is None:
+            return False
+        chip, target, missing = switch
+
+        # Open the dropdown by clicking the current value, then click the target option
+        chip.click()
+        expect(target, missing).to_be_visible(timeout=timeout)
+        if self.capture is not None:
+            self.capture.clear()  # payloads before the switch belong to the previous filter
+        target.click()
+
+        # Update internal state
+        setattr(self, f"current_{kind}", label)
+        self.ready.network_idle(TRENDS_URL_RE, timeout=timeout, name=f"{kind}_request_idle")
+        return True
+
+    # ---------- TYPE MENU ----------
+    def choose_data_type(self, label: str, timeout: int = 5_000) -> None:
+        """
+        Switch Data Type (e.g., 'Search Trend', 'Tiktok', 'Wiki', etc.)
+        Using simple visible text selectors.
+        """
+        if not self._switch_filter("data_type", label, timeout):
+            print(f"Already using data type '{label}' — skipping.")
+            return
+        print(f"Switched data type → {self.current_data_type}")
+
+    # ---------- VIEW SWITCH ----------
+    def choose_view(self, label: str, timeout: int = 5_000) -> None:
+        """
+        Change the 'View' dropdown by text, e.g. 'List View' or 'Chart View'.
+        Uses your pattern: click current text, then click target text.
+        """
+        self._switch_filter("view", label, timeout)  # no-op when already set
+
+    # ---------- TIME GRANULARITY ----------
+    def choose_time_granularity(self, label: str, timeout: int = 5_000) -> None:
+        """
+        Switch to 'Daily', 'Weekly', or 'Monthly' using visible text.
+        Avoid redundant clicks by tracking the current granularity.
+        """
+        if not self._switch_filter("granularity", label, timeout):
+            print(f"Already in '{label}' granularity — skipping change.")
+            return
+        print(f"Switched to granularity: {self.current_granularity}")
+
+    # ---------- CATEGORY ----------
+    def open_category_dropdown(self, timeout: int = 5_000) -> None:
+        """Open sectors menu and wait until it's actually open."""
+        self.category_button.click()
+        expect(self.apply_filter_btn).to_be_visible(timeout=timeout)  # menu is open
+
+    def choose_category(self, label: str, timeout: int = 5_000) -> None:
+        """Select one sector by its visible label and apply (an already selected one is unselected)."""
+        self.toggle_categories([label], timeout)
+
+    def swap_category(self, old: Optional[str], new: Optional[str], timeout: int = 5_000) -> None:
+        """Unselect `old` and select `new` in a single menu open and apply once."""
+        labels = self.swap_labels(old, new)
+        if labels:
+            self.toggle_categories(labels, timeout)
+
+    def toggle_categories(self, labels: List[str], timeout: int = 5_000) -> None:
+        """Open the sectors menu once, click every label in `labels` and apply."""
+        self.open_category_dropdown(timeout)
+        for label in labels:
+            option = self.category_option(label)
+            expect(option, f"Label '{label}' not found").to_be_visible(timeout=timeout)
+            option.click()
+        self._apply_categories(timeout)
+
+    def clear_categories(self, timeout: int = 5_000) -> None:
+        """Unselect every selected sector and apply, e.g. when a failed step left the selection unknown."""
+        if not self.apply_filter_btn.is_visible():  # the failed step may have left the menu open
+            self.open_category_dropdown(timeout)
+        checked = self.checked_category_options()
+        for _ in range(checked.count()):
+            checked.first.click()  # no longer :checked afterwards, so .first moves on
+        self._apply_categories(timeout)
+
+    def _apply_categories(self, timeout: int) -> None:
+        if self.capture is not None:
+            self.capture.clear()  # payloads before Apply belong to the previous filter
+        before = self.ready.card_fingerprint()
+        self.apply_filter_btn.click()
+        if not self.ready.hidden(self.apply_filter_btn, timeout=timeout, name="filter_menu_hidden"):
+            raise AssertionError("Sectors menu did not close after 'Apply Filter'")
+
+        # Grid is ready once the trends request settled and the cards were re-rendered.
+        # Same first card before/after is possible, so that last check is kept short.
+        self.ready.network_idle(TRENDS_URL_RE, timeout=timeout, name="trends_request_idle")
+        self.ready.cards_changed(before, timeout=1_500, name="cards_after_filter")
+
+
+    def extract_page_trends(self, timeout: int = 20_000) -> List[Dict[str, str]]:
+        """Extract current page trends + top associated ticker and its percent (robust, simple)."""
+        if self.capture is not None:
+            rows = self.capture.take_rows(timeout=min(timeout, 5_000))
+            if rows is not None:
+                return rows
+            # No payload seen → fall back to the rendered cards
+
+        expect(self.trend_cards.first, "No trend cards found").to_be_visible(timeout=timeout)
+
+        # One round-trip for the whole page; the browser only hands back plain strings
+        raw_cards = self.trend_cards.evaluate_all(CARD_TEXTS_JS)
+        return [parse_card(**raw) for raw in raw_cards]
+
+    def page_snapshot(self, timeout: int = 20_000) -> str:
+        """Outer HTML of the current page's trend cards, in one call (parsed later by snapshot_parse)."""
+        expect(self.trend_cards.first, "No trend cards found").to_be_visible(timeout=timeout)
+        return self.trend_cards.evaluate_all(CARD_HTML_JS)
+
+    def snapshot_all_pages(self, on_snapshot: Callable[[int, str], Any], max_pages: Optional[int] = None) -> int:
+        """
+        Walk the pages like `extract_all_trends`, but only hand each page's snapshot to
+        `on_snapshot(page_no, html)` and move on; returns the number of pages.
+        """
+        page_count = 0
+        while True:
+            page_count += 1
+            on_snapshot(page_count, self.page_snapshot())
+            if max_pages and page_count >= max_pages:
+                break
+            if not self.go_next_page():
+                break
+        return page_count
+
+    def has_next(self) -> bool:
+        """True if the 'Next' button exists and is not disabled."""
+        return self.next_button.count() > 0 and not self.next_button.is_disabled()
+
+    def past_last_page(self, timeout: int = 5_000) -> bool:
+        """True once the grid settled with no cards and no 'Next', i.e. `pageNo` is beyond the last page."""
+        self.ready.network_idle(TRENDS_URL_RE, timeout=timeout, name="trends_request_idle")
+        return self.trend_cards.count() == 0 and not self.has_next()
+
+    def go_next_page(self, timeout: int = 10_000) -> bool:
+        """Click 'Next' and wait for the URL (pageNo) to change."""
+        if not self.has_next():
+            return False
+
+        old_url = self.page.url
+        if self.capture is not None:
+            self.capture.clear()
+        before = self.ready.card_fingerprint()
+        self.next_button.click()
+
+        # Wait until URL changes (pageNo increments)
+        self.page.wait_for_function(
+            "prev => window.location.href !== prev",
+            arg=old_url,
+            timeout=timeout,
+        )
+        # ... and until the grid shows the new page instead of the old cards
+        self.ready.cards_changed(before, timeout=timeout, name="cards_after_next")
+        return True
+
+    # ---------- URL PAGINATION ----------
+    def extract_page_or_empty(self, timeout: int = 20_000) -> List[Dict[str, str]]:
+        """Like `extract_page_trends`, but an empty page (past the last one) returns []."""
+        try:
+            return self.extract_page_trends(timeout=timeout)
+        except AssertionError:
+            return []
+
+    def extract_all_trends_prefetch(
+        self,
+        max_pages: int,
+        prefetch_tabs: int = 3,
+        timeout: int = 20_000,
+        empty_timeout: int = 3_000,
+        stop_when: Optional[Callable[[List[Dict[str, str]]], bool]] = None,
+        on_page: Optional[Callable[[int, List[Dict[str, str]]], Any]] = None,
+        page_factory: Optional[Callable[[Page], "ExplodingTrendsPage"]] = None,
+    ) -> List[Dict[str, str]]:
+        """
+        Extract pages 1..max_pages by building the `pageNo` URLs directly.
+
+        Pages 2..N are loaded in a small pool of extra tabs of the same context while
+        the current page is extracted; every tab that is done moves on to the next
+        page number. Stops at the first empty page or at a page shorter than page 1.
+        Tabs are read through `page_factory(tab)` (default: a bare ExplodingTrendsPage),
+        so the driver's capture and instrumentation cover pages 2..N too.
+        """
+        make_page = page_factory or ExplodingTrendsPage
+        pending: Deque[Tuple[int, ExplodingTrendsPage]] = deque()
+        tabs = [make_page(self.page.context.new_page()) for _ in range(max(0, min(prefetch_tabs, max_pages - 1)))]
+        urls = {n: self.page_url(n) for n in range(2, max_pages + 1)}
+        next_no = 2
+
+        def load(tab: ExplodingTrendsPage, page_no: int) -> None:
+            if tab.capture is not None:
+                tab.capture.clear()  # the tab's previous page
+            # 'commit' returns as soon as navigation starts; the rest loads in the background
+            tab.page.goto(urls[page_no], wait_until="commit", timeout=timeout)
+            pending.append((page_no, tab))
+
+        try:
+            for tab in tabs:
+                load(tab, next_no)
+                next_no += 1
+
+            all_data = self.extract_page_trends(timeout=timeout)
+            full_page = len(all_data)
+            if on_page is not None:
+                on_page(1, all_data)
+            if stop_when is not None and stop_when(all_data):
+                return all_data
+
+            while pending:
+                page_no, tab = pending.popleft()
+                tab.page.wait_for_load_state("networkidle", timeout=timeout)
+                rows = tab.extract_page_or_empty(timeout=empty_timeout)
+                if not rows:
+                    break
+                all_data.extend(rows)
+                if on_page is not None:
+                    on_page(page_no, rows)
+                if len(rows) < full_page:
+                    break  # short page = last page
+                if stop_when is not None and stop_when(rows):
+                    break
+
+                if next_no <= max_pages:
+                    load(tab, next_no)
+                    next_no += 1
+        finally:
+            for tab in tabs:
+                if tab.capture is not None:
+                    tab.capture.detach()
+                tab.page.close()
+
+        return all_data
+
+    def extract_all_trends(
+        self,
+        max_pages: Optional[int] = None,
+        prefetch_tabs: int = 0,
+        stop_when: Optional[Callable[[List[Dict[str, str]]], bool]] = None,
+        between_pages: Optional[Callable[[], Any]] = None,
+        on_page: Optional[Callable[[int, List[Dict[str, str]]], Any]] = None,
+        page_factory: Optional[Callable[[Page], "ExplodingTrendsPage"]] = None,
+    ) -> List[Dict[str, str]]:
+        """
+        Extract all trend cards from all available pages.
+        `stop_when(page_rows)` returning True ends pagination after that page.
+        `between_pages()` runs before every 'Next' click (e.g. memory_guard's check;
+        not used with prefetch tabs).
+        `on_page(page_no, page_rows)` is called once each page is extracted (timings, progress).
+        `page_factory(tab)` builds the page objects of prefetch tabs (see extract_all_trends_prefetch).
+        """
+        if prefetch_tabs and max_pages:
+            return self.extract_all_trends_prefetch(
+                max_pages, prefetch_tabs=prefetch_tabs, stop_when=stop_when, on_page=on_page, page_factory=page_factory
+            )
+
+        all_data: List[Dict[str, str]] = []
+        page_count = 0
+
+        while True:
+            rows = self.extract_page_trends()
+            all_data.extend(rows)
+            page_count += 1
+            if on_page is not None:
+                on_page(page_count, rows)
+
+            if stop_when is not None and stop_when(rows):
+                break
+            if max_pages and page_count >= max_pages:
+                break
+            if between_pages is not None:
+                between_pages()
+            if not self.go_next_page():
+                break
+
         return all_data
\ No newline at end of file
@@ -0,0 +1,210 @@
+"""
+HAR record-and-replay runs: deterministic, offline regression checks of the page objects.
+
+--record logs in (or reuses the cached session), then scrapes through a context
+that records all traffic to `<dir>/session.har`. The session's storage state,
+the start URL, the run settings and the extracted rows are saved next to it.
+
+--replay runs the same driver code in a context served only from that HAR
+(`route_from_har(not_found="abort")`, anything not recorded is aborted, so there
+is no live network access). It starts from the same storage state and URL, with
+the recorded scrape_time, so an unchanged scraper gives identical rows. Those
+rows are then compared with the recording, category by category. The exit
+status is 1 when they differ, so a selector or regex change can be checked
+against a recorded run in seconds:
+
+    python har_replay.py --record --categories Sports Technology --max-pages 3
+    python har_replay.py --replay har/tickertrends_20250101_120000
+
+The HAR and the storage state hold session cookies: the run directory is
+created with 0700 permissions and must never be committed.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from playwright.sync_api import BrowserContext, sync_playwright
+
+import test_tickertrends as driver
+from routing_profile import RoutingProfile
+
+Row = Dict[str, str]
+Key = Tuple[str, str, str]
+
+HAR_ROOT = Path("har")
+HAR_NAME = "session.har"
+STATE_NAME = "storage_state.json"
+META_NAME = "meta.json"
+ROWS_NAME = "rows.json"
+
+
+def _write_private(path: Path, doc: Any) -> None:
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(doc, f, ensure_ascii=False, indent=1)
+
+
+def _read(path: Path) -> Any:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _scrape(context: BrowserContext, url: str, scrape_time: str, categories: Sequence[str]) -> List[Row]:
+    """The driver's own steps on a fresh page of `context`: open, filters, every category."""
+    rows: List[Row] = []
+    page = context.new_page()
+    page.goto(url, wait_until="domcontentloaded", timeout=30_000)
+    et = driver.exploding_trends_page(page)
+    if not et.is_open(timeout=20_000):
+        raise RuntimeError(f"Exploding Trends did not open at {url}")
+    driver.apply_filters(et)
+    driver.scrape_categories(et, scrape_time, lambda cat, cat_rows: rows.extend(cat_rows), categories=categories)
+    return rows
+
+
+# ---------- RECORD ----------
+def record(run_dir: Path, categories: Sequence[str]) -> Dict[str, Any]:
+    """Scrape `categories` live while recording the traffic into `run_dir`."""
+    run_dir.mkdir(parents=True, exist_ok=True)
+    os.chmod(run_dir, 0o700)
+    scrape_time = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S %Z")
+
+    with sync_playwright() as pw:
+        browser = pw.chromium.launch(**driver.LAUNCH_KWARGS)
+        routing = RoutingProfile() if driver.BLOCK_ASSETS else None
+        try:
+            # Log in outside the recording: the HAR only needs the scrape itself
+            login_context, et = driver.open_session(browser, routing)
+            storage_state = login_context.storage_state()
+            parts = urlsplit(et.page.url)
+            url = urlunsplit(parts._replace(query="", fragment=""))  # filters live in the query
+            login_context.close()
+
+            context = browser.new_context(
+                storage_state=storage_state, record_har_path=str(run_dir / HAR_NAME), record_har_content="embed"
+            )
+            if routing is not None:
+                routing.install(context)  # blocked requests stay out of the HAR and abort on replay as well
+            start = time.perf_counter()
+            rows = _scrape(context, url, scrape_time, categories)
+            seconds = time.perf_counter() - start
+            context.close()  # writes the HAR
+        finally:
+            browser.close()
+
+    meta = {
+        "url": url,
+        "scrape_time": scrape_time,
+        "recorded_at": time.time(),
+        "categories": list(categories),
+        "max_pages": driver.MAX_PAGES,
+        "granularity": driver.GRANULARITY,
+        "prefetch_tabs": driver.PREFETCH_TABS,
+        "seconds": round(seconds, 2),
+        "rows": len(rows),
+    }
+    _write_private(run_dir / STATE_NAME, storage_state)
+    _write_private(run_dir / META_NAME, meta)
+    _write_private(run_dir / ROWS_NAME, rows)
+    logging.info(f"✅ Recorded {len(rows)} rows in {seconds:.1f}s → {run_dir}")
+    return meta
+
+
+# ---------- REPLAY ----------
+def replay(run_dir: Path) -> Tuple[List[Row], float]:
+    """Re-run the recorded scrape from the HAR only; returns the rows and the seconds it took."""
+    meta = _read(run_dir / META_NAME)
+    if (meta["max_pages"], meta["granularity"], meta["prefetch_tabs"]) != (
+        driver.MAX_PAGES, driver.GRANULARITY, driver.PREFETCH_TABS
+    ):
+        logging.warning("⚠️ Driver settings differ from the recording — requests may be missing from the HAR")
+
+    with sync_playwright() as pw:
+        browser = pw.chromium.launch(**driver.LAUNCH_KWARGS)
+        try:
+            context = browser.new_context(storage_state=str(run_dir / STATE_NAME))
+            context.route_from_har(str(run_dir / HAR_NAME), not_found="abort")
+            start = time.perf_counter()
+            rows = _scrape(context, meta["url"], meta["scrape_time"], meta["categories"])
+            seconds = time.perf_counter() - start
+        finally:
+            browser.close()
+    logging.info(f"Replayed {len(rows)} rows in {seconds:.1f}s (recording took {meta['seconds']}s)")
+    return rows, seconds
+
+
+def _key(row: Row) -> Key:
+    return row.get("category", ""), row.get("name", ""), row.get("ticker_symbol", "")
+
+
+def compare_rows(expected: List[Row], actual: List[Row]) -> Dict[str, Any]:
+    """Per-category differences between the recorded and the replayed rows."""
+    report: Dict[str, Any] = {"identical": expected == actual, "categories": {}}
+    for cat in dict.fromkeys(r.get("category", "") for r in expected + actual):
+        exp = {_key(r): r for r in expected if r.get("category", "") == cat}
+        act = {_key(r): r for r in actual if r.get("category", "") == cat}
+        changed = [
+            {"key": list(k), "fields": sorted(f for f in exp[k] if exp[k].get(f) != act[k].get(f))}
+            for k in sorted(exp.keys() & act.keys())
+            if exp[k] != act[k]
+        ]
+        report["categories"][cat] = {
+            "expected": len(exp),
+            "actual": len(act),
+            "missing": [list(k) for k in sorted(exp.keys() - act.keys())],
+            "extra": [list(k) for k in sorted(act.keys() - exp.keys())],
+            "changed": changed,
+            "same_order": list(exp) == list(act),
+        }
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"\n{'category':<30}{'expected':>9}{'actual':>8}{'missing':>9}{'extra':>7}{'changed':>9}  order")
+    for cat, c in report["categories"].items():
+        print(
+            f"{cat:<30}{c['expected']:>9}{c['actual']:>8}{len(c['missing']):>9}{len(c['extra']):>7}"
+            f"{len(c['changed']):>9}  {'ok' if c['same_order'] else 'differs'}"
+        )
+        for key in c["missing"][:5]:
+            print(f"    - missing {key}")
+        for key in c["extra"][:5]:
+            print(f"    + extra   {key}")
+        for ch in c["changed"][:5]:
+            print(f"    ~ changed {ch['key']}: {', '.join(ch['fields'])}")
+    print("\n✅ rows identical to the recording" if report["identical"] else "\n❌ rows differ from the recording")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="Record a scrape to HAR, or replay one offline and compare the rows.")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--record", nargs="?", const="", metavar="DIR", help="record into DIR (default: har/<run>)")
+    mode.add_argument("--replay", metavar="DIR", help="replay the recording in DIR")
+    parser.add_argument("--categories", nargs="+", default=driver.CATEGORIES, help="categories to record")
+    parser.add_argument("--max-pages", type=int, default=driver.MAX_PAGES)
+    parser.add_argument("--json", default="", help="replay: also write the comparison to this file")
+    args = parser.parse_args()
+    driver.MAX_PAGES = args.max_pages
+
+    if args.record is not None:
+        run_dir = Path(args.record) if args.record else HAR_ROOT / f"tickertrends_{datetime.now():%Y%m%d_%H%M%S}"
+        record(run_dir, args.categories)
+        sys.exit(0)
+
+    run_dir = Path(args.replay)
+    if args.max_pages == parser.get_default("max_pages"):
+        driver.MAX_PAGES = _read(run_dir / META_NAME)["max_pages"]  # replay what was recorded
+    rows, _ = replay(run_dir)
+    report = compare_rows(_read(run_dir / ROWS_NAME), rows)
+    print_report(report)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    sys.exit(0 if report["identical"] else 1)
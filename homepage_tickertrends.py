@@ -1,24 +1,37 @@
-from playwright.sync_api import Page, Locator, expect
-
-
-class HomePage:
-    """Page Object for the TickerTrends Home page."""
-
-    def __init__(self, page: Page) -> None:
-        self.page = page
-        # Locator for the 'Exploding Trends' card
-        self.exploding_card: Locator = page.locator('div[title="Exploding Trends"]').first
-
-    def wait_for_exploding_card(self, timeout: int = 20_000) -> None:
-        """Waits until the Exploding Trends card is visible on the page."""
-        self.exploding_card.wait_for(state="visible", timeout=timeout)
-        expect(self.exploding_card).to_be_enabled()
-
-    def click_exploding_card(self) -> None:
-        """Clicks the Exploding Trends card."""
-        self.exploding_card.click()
-
-    def open_exploding_trends(self) -> None:
-        """Waits for and opens the Exploding Trends card."""
-        self.wait_for_exploding_card()
-        self.click_exploding_card()
+from typing import Any
+
+from playwright.sync_api import Page, Locator, expect
+
+from readiness import Readiness
+
+
+class HomePageLocators:
+    """Locators of the Home page, shared by the sync and the async page object."""
+
+    def __init__(self, page: Any) -> None:
+        self.page = page
+        # Locator for the 'Exploding Trends' card
+        self.exploding_card: Locator = page.locator('div[title="Exploding Trends"]').first
+
+
+class HomePage(HomePageLocators):
+    """Page Object for the TickerTrends Home page."""
+
+    def __init__(self, page: Page) -> None:
+        super().__init__(page)
+        self.ready = Readiness.for_page(page)
+
+    def wait_for_exploding_card(self, timeout: int = 20_000) -> None:
+        """Waits until the Exploding Trends card is visible on the page."""
+        if not self.ready.visible(self.exploding_card, timeout=timeout, name="exploding_card_visible"):
+            raise AssertionError("Exploding Trends card did not show up")
+        expect(self.exploding_card).to_be_enabled()
+
+    def click_exploding_card(self) -> None:
+        """Clicks the Exploding Trends card."""
+        self.exploding_card.click()
+
+    def open_exploding_trends(self) -> None:
+        """Waits for and opens the Exploding Trends card."""
+        self.wait_for_exploding_card()
+        self.click_exploding_card()
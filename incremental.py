@@ -0,0 +1,181 @@
+"""
+Incremental scraping against the previous run.
+
+The previous run's rows are indexed per category by (name, ticker_symbol). While a
+category is paginated, `IncrementalRun.stop_condition(cat)` stops once N pages in a
+row hold nothing new or changed; afterwards only added / removed / changed rows are
+written, together with a reference to the baseline they apply to.
+
+A baseline can be a full run (JSON list or NDJSON) or an earlier diff file, which is
+resolved against its own baseline (see `load_rows`).
+"""
+import json
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+Row = Dict[str, str]
+Key = Tuple[str, str]
+
+COMPARED_FIELDS = ("sign", "value", "ticker_percent")
+
+
+def trend_key(row: Row) -> Key:
+    return row.get("name", ""), row.get("ticker_symbol", "")
+
+
+# ---------- LOADING ----------
+def _read_text(source: str, s3_client: Any = None) -> str:
+    if source.startswith("s3://"):
+        if s3_client is None:
+            raise ValueError(f"s3_client is required to read {source}")
+        bucket, _, key = source[5:].partition("/")
+        return s3_client.get_object(Bucket=bucket, Key=key)["Body"].read().decode("utf-8")
+    return Path(source).read_text(encoding="utf-8")
+
+
+def load_rows(source: str, s3_client: Any = None) -> List[Row]:
+    """Rows of a full run (JSON list / NDJSON) or of a diff applied to its own baseline."""
+    text = _read_text(source, s3_client).strip()
+    if not text:
+        return []
+    try:
+        doc = json.loads(text)
+    except ValueError:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    if isinstance(doc, dict) and "baseline" in doc:
+        return apply_diff(load_rows(doc["baseline"], s3_client), doc)
+    return doc if isinstance(doc, list) else [doc]
+
+
+def apply_diff(baseline: List[Row], diff: Dict[str, Any]) -> List[Row]:
+    """
+    Rebuild the full row list of a diffed run. Baseline order is kept, changed rows
+    are replaced in place and added rows go after the category's last known row.
+    """
+    by_cat: Dict[str, List[Row]] = {}
+    for row in baseline:
+        by_cat.setdefault(row.get("category", ""), []).append(row)
+
+    for cat, d in diff.get("categories", {}).items():
+        removed = {trend_key(r) for r in d.get("removed", [])}
+        changed = {
+            trend_key(r): {k: v for k, v in r.items() if k != "previous"}
+            for r in d.get("changed", [])
+        }
+        rows = [changed.get(trend_key(r), r) for r in by_cat.get(cat, []) if trend_key(r) not in removed]
+        by_cat[cat] = rows + list(d.get("added", []))
+
+    return [r for rows in by_cat.values() for r in rows]
+
+
+class BaselineIndex:
+    """Previous run's rows per category, keyed by (name, ticker_symbol), with their rank."""
+
+    def __init__(self, rows: List[Row], ref: str) -> None:
+        self.ref = ref
+        self.by_category: Dict[str, Dict[Key, Tuple[int, Row]]] = {}
+        for row in rows:
+            cat_index = self.by_category.setdefault(row.get("category", ""), {})
+            cat_index.setdefault(trend_key(row), (len(cat_index), row))
+
+    @classmethod
+    def load(cls, source: str, s3_client: Any = None) -> "BaselineIndex":
+        rows = load_rows(source, s3_client)
+        logging.info(f"Baseline {source}: {len(rows)} rows")
+        return cls(rows, ref=source)
+
+    def is_unchanged(self, category: str, row: Row) -> bool:
+        """True if the row was already known with the same values."""
+        known = self.by_category.get(category, {}).get(trend_key(row))
+        return known is not None and all(known[1].get(f, "") == row.get(f, "") for f in COMPARED_FIELDS)
+
+    def diff(self, category: str, rows: List[Row], complete: bool) -> Dict[str, Any]:
+        """
+        Added / removed / changed rows of one category.
+
+        When pagination was cut off (`complete=False`) only baseline rows ranked above
+        the last baseline row seen again can count as removed; the rest were simply
+        not reached.
+        """
+        known = self.by_category.get(category, {})
+        seen = {trend_key(r) for r in rows}
+        added: List[Row] = []
+        changed: List[Row] = []
+
+        for row in rows:
+            entry = known.get(trend_key(row))
+            if entry is None:
+                added.append(row)
+            elif any(entry[1].get(f, "") != row.get(f, "") for f in COMPARED_FIELDS):
+                changed.append({**row, "previous": {f: entry[1].get(f, "") for f in COMPARED_FIELDS}})
+
+        # Unseen rows ranked above the last baseline row we did see really dropped out
+        last_seen = max((known[k][0] for k in seen if k in known), default=-1)
+        removed = [
+            row for key, (rank, row) in known.items()
+            if key not in seen and (complete or rank < last_seen)
+        ]
+        return {
+            "scraped_rows": len(rows),
+            "complete": complete,
+            "added": added,
+            "removed": removed,
+            "changed": changed,
+        }
+
+
+class IncrementalRun:
+    """
+    Early pagination cutoff + diff output. Has the same write_category / close
+    interface as trend_sink.TrendSink so the driver can use it in its place.
+    """
+
+    def __init__(self, baseline: BaselineIndex, consecutive_pages: int = 2, out_path: str = "", s3_client: Any = None) -> None:
+        self.baseline = baseline
+        self.consecutive_pages = consecutive_pages
+        self.out_path = out_path
+        self.s3_client = s3_client
+        self.cut_off: Dict[str, bool] = {}
+        self.categories: Dict[str, Dict[str, Any]] = {}
+
+    def stop_condition(self, category: str) -> Callable[[List[Row]], bool]:
+        """Callable for `extract_all_trends(stop_when=...)`: True after N fully known pages in a row."""
+        streak = 0
+        self.cut_off[category] = False
+
+        def stop(page_rows: List[Row]) -> bool:
+            nonlocal streak
+            unchanged = bool(page_rows) and all(self.baseline.is_unchanged(category, r) for r in page_rows)
+            streak = streak + 1 if unchanged else 0
+            if streak >= self.consecutive_pages:
+                self.cut_off[category] = True
+                logging.info(f"  ⏹ {category}: {streak} known pages in a row — stopping early")
+                return True
+            return False
+
+        return stop
+
+    def write_category(self, category: str, rows: List[Row]) -> None:
+        d = self.baseline.diff(category, rows, complete=not self.cut_off.get(category, False))
+        self.categories[category] = d
+        logging.info(
+            f"  Δ {category}: +{len(d['added'])} -{len(d['removed'])} ~{len(d['changed'])}"
+        )
+
+    def document(self) -> Dict[str, Any]:
+        return {"baseline": self.baseline.ref, "categories": self.categories}
+
+    def close(self) -> Dict[str, Any]:
+        doc = self.document()
+        if self.out_path:
+            body = json.dumps(doc, ensure_ascii=False)
+            if self.out_path.startswith("s3://"):
+                bucket, _, key = self.out_path[5:].partition("/")
+                self.s3_client.put_object(Bucket=bucket, Key=key, Body=body.encode("utf-8"), ContentType="application/json")
+            else:
+                Path(self.out_path).parent.mkdir(parents=True, exist_ok=True)
+                Path(self.out_path).write_text(body, encoding="utf-8")
+            logging.info(f"✅ Diff against {self.baseline.ref} written to {self.out_path}")
+        return doc
@@ -0,0 +1,179 @@
+"""
+Timing spans for every scrape step, plus opt-in Playwright tracing of slow spans.
+
+`Instrumentation.wrap(page_object)` replaces the page-object methods listed in
+`PAGE_METHODS` on that instance with timed versions; other steps (login, upload)
+use `with instr.span("name"):`. Every span records its wall time, outcome, row
+count (when the step returns a list) and retries. `write(path)` stores all spans
+and a per-step summary as JSON, and `log_summary()` prints the summary table.
+
+With `trace_slow_ms`, each outermost span given a context runs inside a
+`context.tracing` chunk that is only saved when the span took longer than that;
+otherwise tracing stays off.
+"""
+import functools
+import json
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+PAGE_METHODS = (
+    "choose_data_type",
+    "choose_view",
+    "choose_time_granularity",
+    "choose_category",
+    "swap_category",
+    "extract_page_trends",
+    "page_snapshot",
+    "go_next_page",
+    "move_to",
+)
+
+Span = Dict[str, Any]
+
+
+class Instrumentation:
+    """Collects timing spans; safe to share between the worker threads of one run."""
+
+    def __init__(self, trace_slow_ms: Optional[int] = None, trace_dir: Union[str, Path] = "traces") -> None:
+        self.trace_slow_ms = trace_slow_ms
+        self.trace_dir = Path(trace_dir)
+        self.spans: List[Span] = []
+        self.traces: List[str] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._tracing: Dict[int, Any] = {}  # id(context) -> context with tracing started
+
+    # ---------- spans ----------
+    def _stack(self) -> List[Span]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def span(self, name: str, context: Any = None, **attrs: Any) -> Iterator[Span]:
+        """Time a block; pass the Playwright `context` to make it eligible for slow-span tracing."""
+        stack = self._stack()
+        entry: Span = {"span": name, "ok": True, "rows": None, "retries": 0, **attrs}
+        if stack:
+            entry["parent"] = stack[-1]["span"]
+        # Chunks cannot nest: only the outermost span with a context is traced
+        traced = context is not None and not getattr(self._local, "chunk_open", False) and self._start_chunk(context)
+        if traced:
+            self._local.chunk_open = True
+
+        stack.append(entry)
+        start = time.perf_counter()
+        try:
+            yield entry
+        except BaseException as e:
+            entry["ok"] = False
+            entry["error"] = f"{type(e).__name__}: {e}"[:200]
+            raise
+        finally:
+            entry["seconds"] = round(time.perf_counter() - start, 3)
+            stack.pop()
+            if traced:
+                self._local.chunk_open = False
+                self._stop_chunk(context, entry)
+            with self._lock:
+                self.spans.append(entry)
+
+    def note_retry(self, attempt: int = 0, error: Optional[BaseException] = None) -> None:
+        """Count a retry on the innermost open span (usable as a retry callback)."""
+        stack = self._stack()
+        if stack:
+            stack[-1]["retries"] += 1
+
+    def wrap(self, obj: Any, methods: Sequence[str] = PAGE_METHODS, prefix: str = "") -> Any:
+        """Instrument the given methods of one page-object instance in place; returns it."""
+        prefix = prefix or type(obj).__name__
+        for method in methods:
+            fn = getattr(obj, method, None)
+            if fn is not None:
+                setattr(obj, method, self._timed(f"{prefix}.{method}", fn, obj))
+        return obj
+
+    def _timed(self, name: str, fn: Callable[..., Any], obj: Any) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def call(*args: Any, **kwargs: Any) -> Any:
+            attrs = {"arg": args[0]} if args and isinstance(args[0], str) else {}
+            page = getattr(obj, "page", None)
+            with self.span(name, context=page.context if page is not None else None, **attrs) as entry:
+                result = fn(*args, **kwargs)
+                if isinstance(result, list):
+                    entry["rows"] = len(result)
+                return result
+        return call
+
+    # ---------- tracing ----------
+    def _start_chunk(self, context: Any) -> bool:
+        if not self.trace_slow_ms:
+            return False
+        try:
+            if id(context) not in self._tracing:
+                context.tracing.start(screenshots=True, snapshots=True)
+                self._tracing[id(context)] = context
+            context.tracing.start_chunk()
+            return True
+        except Exception as e:
+            logging.debug(f"tracing unavailable: {e}")
+            return False
+
+    def _stop_chunk(self, context: Any, entry: Span) -> None:
+        try:
+            if entry["seconds"] * 1000 >= self.trace_slow_ms:
+                self.trace_dir.mkdir(parents=True, exist_ok=True)
+                slug = re.sub(r"[^A-Za-z0-9_.-]+", "-", entry["span"])
+                path = self.trace_dir / f"{len(self.traces) + 1:04d}_{slug}.zip"
+                context.tracing.stop_chunk(path=str(path))
+                entry["trace"] = str(path)
+                self.traces.append(str(path))
+            else:
+                context.tracing.stop_chunk()  # fast span → trace discarded
+        except Exception as e:
+            logging.debug(f"could not stop tracing chunk: {e}")
+
+    def reset(self) -> None:
+        """Drop recorded spans, e.g. between the jobs of a long-running process."""
+        with self._lock:
+            self.spans = []
+            self.traces = []
+
+    # ---------- report ----------
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per span name: count, total / mean / max seconds, errors, retries and rows."""
+        out: Dict[str, Dict[str, Any]] = {}
+        for s in self.spans:
+            agg = out.setdefault(s["span"], {"count": 0, "total_s": 0.0, "max_s": 0.0, "errors": 0, "retries": 0, "rows": 0})
+            agg["count"] += 1
+            agg["total_s"] += s["seconds"]
+            agg["max_s"] = max(agg["max_s"], s["seconds"])
+            agg["errors"] += 0 if s["ok"] else 1
+            agg["retries"] += s["retries"]
+            agg["rows"] += s["rows"] or 0
+        for agg in out.values():
+            agg["total_s"] = round(agg["total_s"], 3)
+            agg["mean_s"] = round(agg["total_s"] / agg["count"], 3)
+        return out
+
+    def write(self, path: Union[str, Path]) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        doc = {"summary": self.summary(), "spans": self.spans, "traces": self.traces}
+        path.write_text(json.dumps(doc, ensure_ascii=False, indent=2), encoding="utf-8")
+        logging.info(f"📊 Metrics for {len(self.spans)} spans written to {path}")
+
+    def log_summary(self) -> None:
+        rows = sorted(self.summary().items(), key=lambda kv: kv[1]["total_s"], reverse=True)
+        lines = [f"{'span':<48}{'count':>6}{'total s':>10}{'mean s':>9}{'max s':>9}{'rows':>8}{'retry':>6}{'err':>5}"]
+        for name, a in rows:
+            lines.append(
+                f"{name:<48}{a['count']:>6}{a['total_s']:>10.2f}{a['mean_s']:>9.3f}{a['max_s']:>9.3f}"
+                f"{a['rows']:>8}{a['retries']:>6}{a['errors']:>5}"
+            )
+        logging.info("Step timings:\n" + "\n".join(lines))
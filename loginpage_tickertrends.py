@@ -1,34 +1,49 @@
-from __future__ import annotations
-from playwright.sync_api import Page, Locator, expect
-
-
-class LoginPage:
-    """Page Object for the Login modal/page."""
-
-    def __init__(self, page: Page) -> None:
-        self.page = page
-
-        # Locators
-        self.continue_with_email_btn: Locator = page.get_by_role("button", name="Continue with Email")
-        self.login_modal: Locator = page.locator("div:has(button:has-text('Reset Password'))").first
-        self.email_input: Locator = self.login_modal.locator("input[type='email']")
-        self.password_input: Locator = self.login_modal.locator("input[type='password']")
-        self.login_button: Locator = self.login_modal.get_by_role("button", name="Log In")
-
-
-    def open_email_login(self) -> None:
-        """Clicks 'Continue with Email' and waits for login modal to appear."""
-        self.continue_with_email_btn.click()
-        expect(self.login_modal).to_be_visible(timeout=10_000)
-
-    def fill_username(self, username: str) -> None:
-        """Fills the email/username field inside the modal."""
-        self.email_input.fill(username)
-
-    def fill_password(self, password: str) -> None:
-        """Fills the password field inside the modal."""
-        self.password_input.fill(password)
-
-    def submit_login(self) -> None:
-        """Clicks the 'Log In' button inside the modal."""
-        self.login_button.click()
+from __future__ import annotations
+from typing import Any
+
+from playwright.sync_api import Page, Locator, expect
+
+from readiness import Readiness
+
+
+class LoginPageLocators:
+    """Locators of the Login modal, shared by the sync and the async page object."""
+
+    def __init__(self, page: Any) -> None:
+        self.page = page
+
+        # Locators
+        self.continue_with_email_btn: Locator = page.get_by_role("button", name="Continue with Email")
+        self.login_modal: Locator = page.locator("div:has(button:has-text('Reset Password'))").first
+        self.email_input: Locator = self.login_modal.locator("input[type='email']")
+        self.password_input: Locator = self.login_modal.locator("input[type='password']")
+        self.login_button: Locator = self.login_modal.get_by_role("button", name="Log In")
+
+
+class LoginPage(LoginPageLocators):
+    """Page Object for the Login modal/page."""
+
+    def __init__(self, page: Page) -> None:
+        super().__init__(page)
+        self.ready = Readiness.for_page(page)
+
+    def open_email_login(self) -> None:
+        """Clicks 'Continue with Email' and waits for login modal to appear."""
+        self.continue_with_email_btn.click()
+        expect(self.login_modal).to_be_visible(timeout=10_000)
+
+    def fill_username(self, username: str) -> None:
+        """Fills the email/username field inside the modal."""
+        self.email_input.fill(username)
+
+    def fill_password(self, password: str) -> None:
+        """Fills the password field inside the modal."""
+        self.password_input.fill(password)
+
+    def submit_login(self) -> None:
+        """Clicks the 'Log In' button inside the modal."""
+        self.login_button.click()
+
+    def wait_until_logged_in(self, timeout: int = 15_000) -> bool:
+        """Waits for the login modal to be removed after submitting; False on timeout."""
+        return self.ready.detached(self.login_modal, timeout=timeout, name="login_modal_detached")
@@ -0,0 +1,172 @@
+"""
+Memory-bounded scraping: sample RSS, recycle the page (or context) above a watermark.
+
+`rss_sample()` splits the resident memory of a run into this Python process and
+its descendants (Playwright driver + Chromium); psutil is used when installed,
+/proc otherwise. `MemoryGuard.check(et)` runs between pages and categories: once
+the total is above `watermark_mb`, the Exploding Trends page object moves to a
+fresh tab (or a fresh context from the same session) at the current URL, which
+carries the filters, the selected sector and `pageNo`, and the old tab / context
+is closed so its renderer memory is released. The scrape simply continues, and
+peak RSS stays around the watermark however many categories and pages one
+session covers.
+"""
+import gc
+import logging
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from playwright.sync_api import BrowserContext
+
+try:
+    import psutil
+except ImportError:  # optional: /proc is read directly (Linux only)
+    psutil = None
+
+MB = 1024 * 1024
+
+
+# ---------- SAMPLING ----------
+def _children() -> Dict[int, List[int]]:
+    tree: Dict[int, List[int]] = {}
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue  # process exited meanwhile
+        tree.setdefault(int(fields[1]), []).append(int(stat.parent.name))
+    return tree
+
+
+def _tree(root: int) -> List[int]:
+    """`root` and all of its descendants."""
+    if psutil is not None:
+        try:
+            return [root] + [p.pid for p in psutil.Process(root).children(recursive=True)]
+        except psutil.Error:
+            return [root]
+    tree, todo, pids = _children(), [root], []
+    while todo:
+        pid = todo.pop()
+        pids.append(pid)
+        todo.extend(tree.get(pid, []))
+    return pids
+
+
+def _rss(pid: int) -> int:
+    try:
+        if psutil is not None:
+            return psutil.Process(pid).memory_info().rss
+        return int(Path(f"/proc/{pid}/statm").read_text().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:  # process exited meanwhile
+        return 0
+
+
+def tree_rss_bytes(root: int) -> int:
+    """RSS of `root` and all of its descendants."""
+    return sum(_rss(pid) for pid in _tree(root))
+
+
+def rss_sample(pid: Optional[int] = None) -> Dict[str, float]:
+    """RSS in MB of the Python process, of its children (driver + browser) and in total."""
+    pid = pid or os.getpid()
+    python = _rss(pid)
+    total = tree_rss_bytes(pid)
+    return {"python_mb": python / MB, "browser_mb": (total - python) / MB, "total_mb": total / MB}
+
+
+# ---------- GUARD ----------
+class MemoryGuard:
+    """
+    Keeps one scrape session under `watermark_mb` by recycling its Exploding Trends page.
+
+    - mode "page": new tab in the same context (cheap; cookies and routes stay)
+    - mode "context": new context from the session's storage state, built by
+      `setup_context` the same way the driver sets up its own (routing profile ...)
+    After a recycle, at least `cooldown_checks` checks pass before the next one, so
+    a watermark below the fresh-browser baseline cannot make it recycle every page.
+    """
+
+    MODES = ("page", "context")
+
+    def __init__(
+        self,
+        watermark_mb: float = 1500,
+        mode: str = "page",
+        setup_context: Optional[Callable[[BrowserContext], None]] = None,
+        cooldown_checks: int = 3,
+    ) -> None:
+        if mode not in self.MODES:
+            raise ValueError(f"mode must be one of {self.MODES}, not {mode!r}")
+        self.watermark_mb = watermark_mb
+        self.mode = mode
+        self.setup_context = setup_context
+        self.cooldown_checks = cooldown_checks
+        self.checks = 0
+        self.recycles = 0
+        self.since_recycle = cooldown_checks
+        self.peak: Dict[str, float] = {"python_mb": 0.0, "browser_mb": 0.0, "total_mb": 0.0}
+
+    def sample(self) -> Dict[str, float]:
+        s = rss_sample()
+        for key, value in s.items():
+            self.peak[key] = max(self.peak[key], value)
+        return s
+
+    def check(self, et: Any, where: str = "") -> bool:
+        """Sample; recycle the page of `et` when above the watermark. True if it was recycled."""
+        self.checks += 1
+        self.since_recycle += 1
+        s = self.sample()
+        if s["total_mb"] <= self.watermark_mb or self.since_recycle < self.cooldown_checks:
+            return False
+        self.since_recycle = 0  # a failed recycle also waits out the cooldown before the next try
+        self.recycle(et, f"{s['total_mb']:.0f} MB > {self.watermark_mb:.0f} MB{f' at {where}' if where else ''}")
+        return True
+
+    def recycle(self, et: Any, reason: str = "") -> None:
+        """
+        Move `et` to a fresh tab / context at the same URL and close the old one.
+        If the fresh one does not open the page, it is closed, `et` stays where it
+        was and the error is raised.
+        """
+        old = et.page
+        before = rss_sample()["total_mb"]
+        if self.mode == "context":
+            context = old.context.browser.new_context(storage_state=old.context.storage_state())
+            try:
+                if self.setup_context is not None:
+                    self.setup_context(context)
+                et.move_to(context.new_page())
+            except Exception:
+                context.close()  # `et` stays on the old context
+                raise
+            old.context.close()
+        else:
+            et.move_to(old.context.new_page())
+            old.close()
+        gc.collect()
+
+        self.recycles += 1
+        self.since_recycle = 0
+        after = self.sample()["total_mb"]
+        logging.info(f"♻️ Recycled {self.mode} ({reason}): {before:.0f} → {after:.0f} MB")
+        if after > self.watermark_mb:
+            logging.warning(f"⚠️ Still above the {self.watermark_mb:.0f} MB watermark after recycling — is it set too low?")
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "watermark_mb": self.watermark_mb,
+            "mode": self.mode,
+            "checks": self.checks,
+            "recycles": self.recycles,
+            **{f"peak_{k}": round(v, 1) for k, v in self.peak.items()},
+        }
+
+    def log_summary(self) -> None:
+        p = self.peak
+        logging.info(
+            f"Memory: peak {p['total_mb']:.0f} MB (python {p['python_mb']:.0f} / browser {p['browser_mb']:.0f}), "
+            f"{self.recycles} recycles in {self.checks} checks"
+        )
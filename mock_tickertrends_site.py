@@ -0,0 +1,362 @@
+"""
+Offline stand-in for tickertrends.io, for benchmarks and offline runs.
+
+It reproduces the DOM the page objects depend on:
+- the newsletter overlay (MainPage);
+- the email login modal (LoginPage);
+- the `div[title="Exploding Trends"]` card (HomePage);
+- the data type / view / granularity dropdowns and the sectors menu with
+  "Apply Filter" (ExplodingTrendsPage);
+- `div.grid div.trend-ultra-compact` cards, paginated by `pageNo`.
+
+Cards come from /api/trends, so `TrendCapture` works against the mock too. The
+cards are generated deterministically per filter and page; the card count, page
+count and response latency can be configured. Payloads recorded with
+`TrendCapture(record_dir=...)` (page_<N>.json) can be served instead.
+
+    python mock_tickertrends_site.py --cards 24 --pages 11 --latency-ms 150
+    python mock_tickertrends_site.py --payloads recorded/ --port 8765
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from trend_payload import payload_to_trends
+
+SECTORS = [
+    "Arts & Culture","Automotive & Mobility","Business & Finance","Consumer Products",
+    "E-commerce & Retail","Education & Learning","Entertainment","Fashion & Beauty",
+    "Food & Beverage","Gaming & Virtual Worlds","Health & Wellness","Home & Living",
+    "Politics & Government","Real Estate & Housing","Science & Innovation",
+    "Social Media & Influencers","Sports","Technology","Travel & Hospitality",
+]
+DATA_TYPES = ["Search Trend", "Tiktok", "Wiki", "Reddit"]
+VIEWS = ["Chart View", "List View"]
+GRANULARITIES = ["Daily", "Weekly", "Monthly"]
+
+SESSION_COOKIE = "tt_session"
+EXPLODING_TRENDS_PATH = "/exploding-trends"
+
+_WORDS_A = ["Glow", "Matcha", "Retro", "Solar", "Cozy", "Pixel", "Quantum", "Velvet", "Nordic", "Hyper"]
+_WORDS_B = ["Serum", "Sneakers", "Drone", "Bundle", "Latte", "Bike", "Lamp", "Garden", "Console", "Jacket"]
+
+# ---------- HTML ----------
+STYLE = """
+<style>
+  body { font-family: sans-serif; margin: 0; }
+  .fixed { position: fixed; inset: 0; background: rgba(0,0,0,.4); display: flex; align-items: center; }
+  .relative { position: relative; background: #fff; padding: 2rem; }
+  .mx-auto { margin: 0 auto; }
+  .absolute { position: absolute; }
+  .top-1 { top: .25rem; } .right-1 { right: .25rem; }
+  .auth { border: 1px solid #ccc; padding: 1rem; margin: 1rem; }
+  .grid { display: grid; grid-template-columns: repeat(4, 1fr); gap: .5rem; }
+  .trend-ultra-compact { border: 1px solid #ddd; padding: .5rem; }
+  .menu { border: 1px solid #ccc; background: #fff; padding: .25rem; }
+  .menu > * { display: block; cursor: pointer; }
+</style>
+"""
+
+NEWSLETTER_HTML = """
+<div class="fixed" id="newsletter">
+  <div class="relative mx-auto">
+    <button class="absolute top-1 right-1" aria-label="Close"
+            onclick="document.getElementById('newsletter').remove()">×</button>
+    <h3>Subscribe to TickerTrends Newsletter</h3>
+    <button>Subscribe</button>
+  </div>
+</div>
+"""
+
+LANDING_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="UTF-8"><title>TickerTrends (mock)</title>""" + STYLE + """</head>
+<body>
+  <header><strong>TickerTrends</strong> <button id="open-login">Log In</button></header>
+  <main><p>Alternative data for retail investors.</p></main>
+  """ + NEWSLETTER_HTML + """
+  <script>
+    document.getElementById("open-login").addEventListener("click", () => {
+      const auth = document.createElement("div");
+      auth.className = "auth";
+      auth.innerHTML = '<button id="with-email">Continue with Email</button>';
+      document.body.appendChild(auth);
+      document.getElementById("with-email").addEventListener("click", () => {
+        auth.innerHTML = `
+          <input type="email" placeholder="Email">
+          <input type="password" placeholder="Password">
+          <button id="submit-login">Log In</button>
+          <button type="button">Reset Password</button>`;
+        document.getElementById("submit-login").addEventListener("click", async () => {
+          await fetch("/api/login", { method: "POST" });
+          auth.remove();
+          location.assign("/");
+        });
+      });
+    });
+  </script>
+</body></html>
+"""
+
+HOME_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="UTF-8"><title>TickerTrends (mock)</title>""" + STYLE + """</head>
+<body>
+  <header><strong>TickerTrends</strong></header>
+  <main>
+    <div title="Exploding Trends" class="auth" onclick="location.assign('""" + EXPLODING_TRENDS_PATH + """')">
+      <h2>Exploding Trends</h2>
+    </div>
+  </main>
+</body></html>
+"""
+
+EXPLODING_TRENDS_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="UTF-8"><title>Exploding Trends (mock)</title>""" + STYLE + """</head>
+<body>
+  <header id="toolbar"></header>
+  <main>
+    <div class="grid" id="grid"></div>
+    <button id="next">Next</button>
+  </main>
+  <script>
+    const OPTIONS = __OPTIONS__;
+    const DEFAULTS = { dataType: "Search Trend", view: "Chart View", granularity: "Monthly" };
+    let openMenu = null;
+    let loadSeq = 0;
+
+    const params = () => new URLSearchParams(location.search);
+    const get = key => params().get(key) || DEFAULTS[key] || "";
+    const sectors = () => (params().get("sectors") || "").split(",").filter(Boolean);
+    const esc = s => String(s).replace(/[&<>"]/g, c => ({ "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;" }[c]));
+
+    function setParams(changes, push) {
+      const p = params();
+      for (const [k, v] of Object.entries(changes)) {
+        if (v === "" || v === null) p.delete(k); else p.set(k, v);
+      }
+      history[push ? "pushState" : "replaceState"](null, "", `?${p}`);
+    }
+
+    function growthText(g) {
+      if (typeof g !== "number") return String(g ?? "");
+      return `${g < 0 ? "-" : "+"}${Math.abs(g)}%`;
+    }
+
+    function cardHtml(t) {
+      const top = (t.tickers || [])[0];
+      const ticker = top
+        ? `<button class="flex w-full items-center justify-between"><span>${esc(top.symbol)}</span><span>${esc(top.percent)}%</span></button>`
+        : "";
+      return `<div class="trend-ultra-compact"><h3>${esc(t.name)}</h3><div class="mb-2"><span>${esc(growthText(t.growth))}</span></div>${ticker}</div>`;
+    }
+
+    function renderToolbar() {
+      const bar = document.getElementById("toolbar");
+      const chip = (key) => {
+        const menu = openMenu === key
+          ? `<div class="menu">${OPTIONS[key].map(o => `<div data-key="${key}" data-value="${esc(o)}">${esc(o)}</div>`).join("")}</div>`
+          : "";
+        return `<span class="chip" data-chip="${key}">${esc(get(key))}</span>${menu}`;
+      };
+      const selected = sectors();
+      const sectorMenu = openMenu === "sectors"
+        ? `<div class="menu sectors-menu">${OPTIONS.sectors.map(s =>
+            `<label><input type="checkbox" value="${esc(s)}"${selected.includes(s) ? " checked" : ""}> ${esc(s)}</label>`
+          ).join("")}<button id="apply-filter">Apply Filter</button></div>`
+        : "";
+      bar.innerHTML = chip("dataType") + chip("view") + chip("granularity")
+        + `<button id="sectors">${selected.length ? `${selected.length} selected` : "Select sectors"}</button>`
+        + sectorMenu;
+    }
+
+    document.getElementById("toolbar").addEventListener("click", e => {
+      const el = e.target;
+      if (el.dataset.chip) {
+        openMenu = openMenu === el.dataset.chip ? null : el.dataset.chip;
+        renderToolbar();
+      } else if (el.dataset.key) {
+        openMenu = null;
+        setParams({ [el.dataset.key]: el.dataset.value, pageNo: "" });
+        renderToolbar();
+        loadGrid();
+      } else if (el.id === "sectors") {
+        openMenu = openMenu === "sectors" ? null : "sectors";
+        renderToolbar();
+      } else if (el.id === "apply-filter") {
+        const checked = [...document.querySelectorAll(".sectors-menu input:checked")].map(i => i.value);
+        openMenu = null;
+        setParams({ sectors: checked.join(","), pageNo: "" });
+        renderToolbar();
+        loadGrid();
+      }
+    });
+
+    async function loadGrid() {
+      const seq = ++loadSeq;
+      const p = params();
+      for (const k of Object.keys(DEFAULTS)) p.set(k, get(k));
+      const resp = await fetch(`/api/trends?${p}`);
+      const payload = resp.ok ? await resp.json() : { trends: [], totalPages: 0 };
+      if (seq !== loadSeq) return;  // a newer filter / page is already loading
+      document.getElementById("grid").innerHTML = payload.trends.map(cardHtml).join("");
+      document.getElementById("next").disabled = Number(get("pageNo") || "1") >= payload.totalPages;
+    }
+
+    document.getElementById("next").addEventListener("click", () => {
+      setParams({ pageNo: String(Number(get("pageNo") || "1") + 1) }, true);
+      loadGrid();
+    });
+    window.addEventListener("popstate", loadGrid);
+
+    renderToolbar();
+    loadGrid();
+  </script>
+</body></html>
+"""
+
+
+# ---------- DATA ----------
+class MockSite:
+    """Configuration and card data of the stand-in site."""
+
+    def __init__(
+        self,
+        cards_per_page: int = 24,
+        pages: int = 5,
+        latency_ms: int = 150,
+        sectors: Sequence[str] = SECTORS,
+        payload_dir: Optional[str] = None,
+        seed: int = 0,
+    ) -> None:
+        self.cards_per_page = cards_per_page
+        self.pages = pages
+        self.latency_ms = latency_ms
+        self.sectors = list(sectors)
+        self.payload_dir = Path(payload_dir) if payload_dir else None
+        self.seed = seed
+
+    def options_json(self) -> str:
+        return json.dumps({
+            "dataType": DATA_TYPES,
+            "view": VIEWS,
+            "granularity": GRANULARITIES,
+            "sectors": self.sectors,
+        })
+
+    def _generated_items(self, filters: str, page_no: int) -> List[Dict[str, Any]]:
+        rng = random.Random(zlib.crc32(f"{self.seed}|{filters}|{page_no}".encode("utf-8")))
+        items = []
+        for i in range(self.cards_per_page):
+            item: Dict[str, Any] = {
+                "name": f"{rng.choice(_WORDS_A)} {rng.choice(_WORDS_B)} {page_no:02d}{i:02d}",
+                "growth": rng.choice([1, 1, 1, -1]) * rng.randint(5, 9000),
+                "tickers": [],
+            }
+            if i % 7 != 6:  # some cards have no associated ticker
+                symbol = "".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(rng.randint(2, 4)))
+                item["tickers"] = [{"symbol": symbol, "percent": rng.randint(10, 99)}]
+            items.append(item)
+        return items
+
+    def _recorded_items(self, page_no: int) -> List[Dict[str, Any]]:
+        path = self.payload_dir / f"page_{page_no}.json"
+        if not path.exists():
+            return []
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        return [{
+            "name": t["name"],
+            "growth": t["raw_growth"],
+            "tickers": [{"symbol": t["ticker_symbol"], "percent": t["ticker_percent"]}] if t["ticker_symbol"] else [],
+        } for t in payload_to_trends(payload)]
+
+    def trends_payload(self, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        """The /api/trends response for one filter combination and page."""
+        page_no = int((query.get("pageNo") or ["1"])[0] or 1)
+        if self.payload_dir is not None:
+            total = len(list(self.payload_dir.glob("page_*.json")))
+            items = self._recorded_items(page_no)
+        else:
+            filters = "|".join((query.get(k) or [""])[0] for k in ("dataType", "granularity", "sectors"))
+            total = self.pages
+            items = self._generated_items(filters, page_no) if 1 <= page_no <= total else []
+        return {"pageNo": page_no, "totalPages": total, "trends": items}
+
+
+# ---------- SERVER ----------
+class MockSiteHandler(BaseHTTPRequestHandler):
+    """Serves the landing / home / Exploding Trends pages and the trends API."""
+
+    site: MockSite = MockSite()
+
+    def log_message(self, format: str, *args: Any) -> None:  # keep benchmark output quiet
+        pass
+
+    def _send(self, status: int, body: str, content_type: str, headers: Optional[Dict[str, str]] = None) -> None:
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _logged_in(self) -> bool:
+        return f"{SESSION_COOKIE}=" in self.headers.get("Cookie", "")
+
+    def do_POST(self) -> None:
+        if urlparse(self.path).path == "/api/login":
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            token = f"mock-{time.time_ns()}"
+            self._send(200, '{"ok": true}', "application/json", {"Set-Cookie": f"{SESSION_COOKIE}={token}; Path=/"})
+        else:
+            self._send(404, "", "text/plain")
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+
+        if url.path == "/api/trends":
+            time.sleep(self.site.latency_ms / 1000)
+            self._send(200, json.dumps(self.site.trends_payload(parse_qs(url.query))), "application/json")
+        elif url.path == EXPLODING_TRENDS_PATH:
+            if not self._logged_in():
+                self._send(302, "", "text/plain", {"Location": "/"})
+            else:
+                page = EXPLODING_TRENDS_PAGE.replace("__OPTIONS__", self.site.options_json())
+                self._send(200, page, "text/html")
+        elif url.path == "/":
+            self._send(200, HOME_PAGE if self._logged_in() else LANDING_PAGE, "text/html")
+        else:
+            self._send(404, "", "text/plain")
+
+
+def serve(site: Optional[MockSite] = None, port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Start the stand-in in a daemon thread; returns the server and its base URL."""
+    handler = type("Handler", (MockSiteHandler,), {"site": site or MockSite()})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cards", type=int, default=24, help="cards per page")
+    parser.add_argument("--pages", type=int, default=5, help="pages per filter combination")
+    parser.add_argument("--latency-ms", type=int, default=150, help="delay of every /api/trends response")
+    parser.add_argument("--payloads", default=None, help="serve recorded page_<N>.json files instead")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    site = MockSite(cards_per_page=args.cards, pages=args.pages, latency_ms=args.latency_ms, payload_dir=args.payloads)
+    server, base_url = serve(site, args.port)
+    print(f"Mock TickerTrends serving at {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
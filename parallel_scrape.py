@@ -0,0 +1,80 @@
+import logging
+import queue
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from playwright.sync_api import BrowserContext, Page, sync_playwright
+
+from exploding_trends_page import ExplodingTrendsPage
+
+Row = Dict[str, str]
+
+
+def scrape_categories_parallel(
+    storage_state: Dict[str, Any],
+    categories: Sequence[str],
+    open_page: Callable[[Page], ExplodingTrendsPage],
+    scrape_category: Callable[[ExplodingTrendsPage, str], List[Row]],
+    workers: int = 4,
+    launch_kwargs: Optional[Dict[str, Any]] = None,
+    setup_context: Optional[Callable[[BrowserContext], Any]] = None,
+) -> Dict[str, List[Row]]:
+    """
+    Scrape categories with several browser contexts that share one login.
+
+    The sync Playwright API is bound to the thread that started it, so every worker
+    thread runs its own `sync_playwright()` + browser and opens a context from the
+    saved `storage_state`. Categories are pulled from a shared queue; results are
+    keyed by category so the caller can merge them back in the original order.
+    `setup_context` runs on every new context (e.g. to install a routing profile).
+    A worker keeps its page after a failed category, so `scrape_category` must
+    unselect its category even when it raises.
+    """
+    todo: "queue.Queue[str]" = queue.Queue()
+    for cat in categories:
+        todo.put(cat)
+
+    results: Dict[str, List[Row]] = {}
+    lock = threading.Lock()
+
+    def worker(n: int) -> None:
+        with sync_playwright() as pw:
+            browser = pw.chromium.launch(**(launch_kwargs or {}))
+            try:
+                context = browser.new_context(storage_state=storage_state)
+                if setup_context is not None:
+                    setup_context(context)
+                et = open_page(context.new_page())
+
+                while True:
+                    try:
+                        cat = todo.get_nowait()
+                    except queue.Empty:
+                        return
+
+                    logging.info(f"[worker {n}] Scraping category: {cat}")
+                    try:
+                        rows = scrape_category(et, cat)
+                    except Exception as e:
+                        logging.warning(f"[worker {n}] ⚠️ Skipped {cat} due to error: {e}")
+                        continue
+
+                    with lock:
+                        results[cat] = rows
+                    logging.info(f"[worker {n}]  → Collected {len(rows)} rows for {cat}")
+            except Exception as e:
+                # A worker that cannot even open the page leaves its share to the others
+                logging.error(f"[worker {n}] ❌ Worker stopped: {e}")
+            finally:
+                browser.close()
+
+    threads = [
+        threading.Thread(target=worker, args=(n,), name=f"tickertrends-worker-{n}")
+        for n in range(max(1, min(workers, len(categories))))
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    return results
@@ -0,0 +1,191 @@
+import logging
+import re
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, Optional, Pattern, Union
+
+from playwright.sync_api import Locator, Page, Request, TimeoutError as PlaywrightTimeoutError
+
+# Text of the first trend card; an empty string when the grid is empty
+FIRST_CARD_TEXT_JS = """
+sel => {
+    const el = document.querySelector(sel);
+    return el ? (el.innerText || "").trim() : "";
+}
+"""
+
+# True once the first card exists and its text differs from the previous fingerprint
+CARDS_CHANGED_JS = """
+([sel, prev]) => {
+    const el = document.querySelector(sel);
+    const text = el ? (el.innerText || "").trim() : "";
+    return text !== "" && text !== prev;
+}
+"""
+
+TREND_CARD_SELECTOR = "div.grid div.trend-ultra-compact"
+
+
+class Readiness:
+    """
+    Event-driven waits shared by the page objects instead of fixed sleeps.
+
+    Every wait has a timeout, never raises on timeout (it returns False so the
+    caller decides), and is recorded with how long it actually took: the last
+    `MAX_TIMINGS` waits in `timings`, counts and seconds of all of them per wait
+    name in `totals`. Use `Readiness.for_page(page)` so all page objects of a tab
+    share one instance; it only holds a weak reference to the tab, so closed
+    (recycled) tabs and their helpers are collected.
+    """
+
+    MAX_TIMINGS = 1_000
+
+    _instances: "weakref.WeakKeyDictionary[Page, Readiness]" = weakref.WeakKeyDictionary()
+
+    def __init__(self, page: Page) -> None:
+        self._page = weakref.ref(page)
+        self.timings: Deque[Dict[str, object]] = deque(maxlen=self.MAX_TIMINGS)
+        self.totals: Dict[str, Dict[str, float]] = {}
+        self._in_flight: Dict[Request, str] = {}
+
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_request_done)
+        page.on("requestfailed", self._on_request_done)
+
+    @classmethod
+    def for_page(cls, page: Page) -> "Readiness":
+        """The shared helper for this tab (created on first use)."""
+        ready = cls._instances.get(page)
+        if ready is None:
+            ready = cls._instances[page] = cls(page)
+        return ready
+
+    @property
+    def page(self) -> Page:
+        page = self._page()
+        if page is None:
+            raise RuntimeError("the tab of this Readiness helper is gone")
+        return page
+
+    # ---------- bookkeeping ----------
+    def _on_request(self, request: Request) -> None:
+        if request.resource_type in ("xhr", "fetch"):
+            self._in_flight[request] = request.url
+
+    def _on_request_done(self, request: Request) -> None:
+        self._in_flight.pop(request, None)
+
+    @contextmanager
+    def _timed(self, name: str) -> Iterator[Dict[str, object]]:
+        entry: Dict[str, object] = {"wait": name, "ok": True}
+        start = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry["seconds"] = round(time.perf_counter() - start, 3)
+            self.timings.append(entry)
+            total = self.totals.setdefault(name, {"waits": 0, "seconds": 0.0, "timeouts": 0})
+            total["waits"] += 1
+            total["seconds"] += entry["seconds"]
+            total["timeouts"] += not entry["ok"]
+            logging.debug(f"wait {name}: {entry['seconds']}s ok={entry['ok']}")
+
+    def wait_count(self) -> int:
+        """Number of all recorded waits."""
+        return int(sum(t["waits"] for t in self.totals.values()))
+
+    def total_seconds(self) -> float:
+        """Time spent in all recorded waits."""
+        return sum(t["seconds"] for t in self.totals.values())
+
+    # ---------- signals ----------
+    def visible(self, locator: Locator, timeout: int = 10_000, name: str = "visible") -> bool:
+        """Wait until the locator is visible."""
+        return self._wait_state(locator, "visible", timeout, name)
+
+    def hidden(self, locator: Locator, timeout: int = 5_000, name: str = "hidden") -> bool:
+        """Wait until the locator is hidden (or not in the DOM at all)."""
+        return self._wait_state(locator, "hidden", timeout, name)
+
+    def detached(self, locator: Locator, timeout: int = 10_000, name: str = "detached") -> bool:
+        """Wait until the locator is removed from the DOM."""
+        return self._wait_state(locator, "detached", timeout, name)
+
+    def _wait_state(self, locator: Locator, state: str, timeout: int, name: str) -> bool:
+        with self._timed(name) as entry:
+            try:
+                locator.wait_for(state=state, timeout=timeout)
+            except PlaywrightTimeoutError:
+                entry["ok"] = False
+        return bool(entry["ok"])
+
+    def card_fingerprint(self, selector: str = TREND_CARD_SELECTOR) -> str:
+        """Text of the first trend card, used to notice that the grid was re-rendered."""
+        return self.page.evaluate(FIRST_CARD_TEXT_JS, selector)
+
+    def cards_changed(
+        self,
+        previous: str,
+        timeout: int = 10_000,
+        selector: str = TREND_CARD_SELECTOR,
+        name: str = "cards_changed",
+    ) -> bool:
+        """Wait until the first card exists and no longer matches `previous`."""
+        with self._timed(name) as entry:
+            try:
+                self.page.wait_for_function(CARDS_CHANGED_JS, arg=[selector, previous], timeout=timeout)
+            except PlaywrightTimeoutError:
+                entry["ok"] = False
+        return bool(entry["ok"])
+
+    def network_idle(
+        self,
+        url_pattern: Optional[Union[str, Pattern[str]]] = None,
+        idle_ms: int = 250,
+        timeout: int = 10_000,
+        name: str = "network_idle",
+    ) -> bool:
+        """
+        Wait until no XHR/fetch request (matching `url_pattern`, if given) has been
+        in flight for `idle_ms`. Polling happens through Playwright so events keep flowing.
+        """
+        with self._timed(name) as entry:
+            for _ in self._idle_polls(url_pattern, idle_ms, timeout, entry):
+                self.page.wait_for_timeout(50)  # yields to the event loop, not a fixed sleep
+        return bool(entry["ok"])
+
+    async def network_idle_async(
+        self,
+        url_pattern: Optional[Union[str, Pattern[str]]] = None,
+        idle_ms: int = 250,
+        timeout: int = 10_000,
+        name: str = "network_idle",
+    ) -> bool:
+        """`network_idle` for a playwright.async_api page."""
+        with self._timed(name) as entry:
+            for _ in self._idle_polls(url_pattern, idle_ms, timeout, entry):
+                await self.page.wait_for_timeout(50)
+        return bool(entry["ok"])
+
+    def _idle_polls(
+        self, url_pattern: Optional[Union[str, Pattern[str]]], idle_ms: int, timeout: int, entry: Dict[str, object]
+    ) -> Iterator[None]:
+        """Yields each time the caller should let Playwright run for a moment; ends once idle or timed out."""
+        pattern = re.compile(url_pattern) if isinstance(url_pattern, str) else url_pattern
+        deadline = time.monotonic() + timeout / 1000
+        quiet_since: Optional[float] = None
+        while True:
+            busy = any(pattern is None or pattern.search(url) for url in self._in_flight.values())
+            now = time.monotonic()
+            if busy:
+                quiet_since = None
+            elif quiet_since is None:
+                quiet_since = now
+            elif (now - quiet_since) * 1000 >= idle_ms:
+                return
+            if now >= deadline:
+                entry["ok"] = False
+                return
+            yield
@@ -0,0 +1,143 @@
+import logging
+import re
+from collections import Counter
+from typing import Dict, Iterable, Optional, Pattern, Sequence
+from urllib.parse import urlsplit
+
+from playwright.sync_api import BrowserContext, Request, Route
+
+# We only read text out of the cards, so none of these are needed
+BLOCKED_RESOURCE_TYPES = ("image", "font", "media")
+
+# Analytics / ads / session-recording hosts (subdomains match too)
+BLOCKED_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+    "facebook.com",
+    "connect.facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+    "segment.io",
+    "segment.com",
+    "mixpanel.com",
+    "amplitude.com",
+    "intercom.io",
+    "sentry.io",
+    "posthog.com",
+    "tiktok.com",
+    "twitter.com",
+    "linkedin.com",
+)
+
+# Never domain-blocked: the site itself (login + trends XHR) and the auth backends it talks to
+ALLOWED_URL_PATTERNS = (
+    r"^https?://([\w-]+\.)*tickertrends\.io/",
+    r"^https?://(identitytoolkit|securetoken)\.googleapis\.com/",
+    r"^https?://127\.0\.0\.1(:\d+)?/",
+    r"^https?://localhost(:\d+)?/",
+)
+
+
+class RoutingProfile:
+    """
+    Aborts requests the scraper never needs and counts what it blocked.
+
+    Install once per context with `profile.install(context)`. Blocked resource types
+    are aborted everywhere; the allowlist then protects the site's own documents,
+    scripts and XHRs from the domain blocklist.
+
+    The stats count blocked requests by resource type and domain. With
+    `measure_bytes=True` the bytes of every allowed response are summed as well,
+    at the cost of one extra driver round-trip per request (`request.sizes()`).
+    """
+
+    def __init__(
+        self,
+        blocked_resource_types: Iterable[str] = BLOCKED_RESOURCE_TYPES,
+        blocked_domains: Iterable[str] = BLOCKED_DOMAINS,
+        allowed_url_patterns: Sequence[str] = ALLOWED_URL_PATTERNS,
+        measure_bytes: bool = False,
+    ) -> None:
+        self.blocked_resource_types = set(blocked_resource_types)
+        self.blocked_domains = tuple(d.lower().lstrip(".") for d in blocked_domains)
+        self.allowed: Sequence[Pattern[str]] = [re.compile(p, re.I) for p in allowed_url_patterns]
+        self.measure_bytes = measure_bytes
+
+        # ----- Stats -----
+        self.blocked_by_type: Counter = Counter()
+        self.blocked_by_domain: Counter = Counter()
+        self.allowed_requests = 0
+        self.transferred_bytes = 0
+
+    # ---------- DECISION ----------
+    def _domain_blocked(self, host: str) -> bool:
+        host = host.lower()
+        return any(host == d or host.endswith("." + d) for d in self.blocked_domains)
+
+    def block_reason(self, url: str, resource_type: str) -> Optional[str]:
+        """Why a request would be aborted ('type:image', 'domain:hotjar.com'), or None."""
+        if resource_type in self.blocked_resource_types:
+            return f"type:{resource_type}"
+        if any(p.search(url) for p in self.allowed):
+            return None
+        host = urlsplit(url).hostname or ""
+        if self._domain_blocked(host):
+            return f"domain:{host}"
+        return None
+
+    # ---------- PLAYWRIGHT ----------
+    def install(self, context: BrowserContext) -> "RoutingProfile":
+        """Route every request of the context through this profile."""
+        context.route("**/*", self._handle)
+        if self.measure_bytes:
+            context.on("requestfinished", self._on_finished)
+        return self
+
+    def _handle(self, route: Route) -> None:
+        request = route.request
+        reason = self.block_reason(request.url, request.resource_type)
+        if reason is None:
+            self.allowed_requests += 1
+            route.continue_()
+            return
+
+        self.blocked_by_type[request.resource_type] += 1
+        host = urlsplit(request.url).hostname or ""
+        if reason.startswith("domain:"):
+            self.blocked_by_domain[host] += 1
+        route.abort("blockedbyclient")
+
+    def _on_finished(self, request: Request) -> None:
+        # What came over the wire, to compare runs with/without the profile
+        # (bytes of blocked requests are unknowable without downloading them)
+        try:
+            sizes = request.sizes()
+            self.transferred_bytes += sizes["responseHeadersSize"] + sizes["responseBodySize"]
+        except Exception:
+            pass
+
+    # ---------- STATS ----------
+    @property
+    def blocked_requests(self) -> int:
+        return sum(self.blocked_by_type.values())
+
+    def stats(self) -> Dict[str, object]:
+        """Counters as a plain dict (for logs / metrics files)."""
+        return {
+            "blocked_requests": self.blocked_requests,
+            "blocked_by_type": dict(self.blocked_by_type),
+            "blocked_by_domain": dict(self.blocked_by_domain.most_common(10)),
+            "allowed_requests": self.allowed_requests,
+            "transferred_bytes": self.transferred_bytes if self.measure_bytes else None,
+        }
+
+    def log_stats(self) -> None:
+        s = self.stats()
+        transferred = f" ({s['transferred_bytes'] / 1_048_576:.1f} MiB transferred)" if self.measure_bytes else ""
+        logging.info(
+            f"Routing: blocked {s['blocked_requests']} requests by type {s['blocked_by_type']}, "
+            f"by domain {s['blocked_by_domain']}; allowed {s['allowed_requests']}{transferred}"
+        )
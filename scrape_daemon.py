@@ -0,0 +1,296 @@
+"""
+Long-running scrape service: a warm, logged-in browser and a cron-like scheduler.
+
+The browser, the authenticated context and the Exploding Trends page (filters
+already set) stay alive between jobs, so a job starts directly with the first
+category. The browser is recycled (closed and re-opened with a fresh session)
+after `max_jobs` jobs, when the process tree uses more than `max_rss_mb`, or after
+a failed job. GET /health on the status port returns the service state as JSON.
+
+    python scrape_daemon.py --cron "0 */6 * * *" --max-jobs 20 --max-rss-mb 1500 --port 8787
+"""
+import argparse
+import json
+import logging
+import os
+import signal
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Set
+
+import boto3
+from playwright.sync_api import Browser, Playwright, sync_playwright
+
+from exploding_trends_page import ExplodingTrendsPage
+from memory_guard import tree_rss_bytes
+from routing_profile import RoutingProfile
+from test_tickertrends import (
+    BLOCK_ASSETS,
+    LAUNCH_KWARGS,
+    METRICS,
+    finish_sinks,
+    make_sinks,
+    open_session,
+    scrape_categories,
+    write_to_sinks,
+)
+
+
+# ---------- SCHEDULE ----------
+class CronSchedule:
+    """
+    Five-field cron expression (minute hour day-of-month month day-of-week) with
+    `*`, `*/n`, `a-b`, `a-b/n`, `a/n` (a to the end of the range) and comma lists.
+    Day-of-week 0 (or 7) is Sunday. As in cron, day-of-month and day-of-week are
+    OR-ed only when neither field starts with `*`.
+    """
+
+    RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 6))
+
+    def __init__(self, expr: str) -> None:
+        fields = expr.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron expression needs 5 fields: {expr!r}")
+        self.expr = expr
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            self._parse(f, lo, hi) for f, (lo, hi) in zip(fields, self.RANGES)
+        )
+        self.any_day = fields[2].startswith("*")  # '*/1' restricts nothing either
+        self.any_weekday = fields[4].startswith("*")
+
+    @staticmethod
+    def _parse(field: str, lo: int, hi: int) -> Set[int]:
+        values: Set[int] = set()
+        for part in field.split(","):
+            rng, _, step = part.partition("/")
+            if rng == "*":
+                start, end = lo, hi
+            elif "-" in rng:
+                start, end = (int(x) for x in rng.split("-"))
+            elif step:
+                start, end = int(rng), hi  # '5/10' = 5-hi/10
+            else:
+                start = end = int(rng)
+            if step and (not step.isdigit() or int(step) < 1):
+                raise ValueError(f"cron field {field!r} has an invalid step {step!r}")
+            values.update(range(start, end + 1, int(step or 1)))
+        if hi == 6 and 7 in values:  # 7 is Sunday too
+            values = (values - {7}) | {0}
+        if not values or min(values) < lo or max(values) > hi:
+            raise ValueError(f"cron field {field!r} outside {lo}-{hi}")
+        return values
+
+    def _day_matches(self, t: datetime) -> bool:
+        dom = t.day in self.days
+        dow = (t.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return dom and dow
+        return dom or dow  # classic cron: either field matches
+
+    def next_after(self, t: datetime) -> datetime:
+        """First matching minute strictly after `t`."""
+        t = t.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = t + timedelta(days=366 * 4)
+        while t < limit:
+            if t.month not in self.months or not self._day_matches(t):
+                t = (t + timedelta(days=1)).replace(hour=0, minute=0)
+            elif t.hour not in self.hours:
+                t = (t + timedelta(hours=1)).replace(minute=0)
+            elif t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+            else:
+                return t
+        raise ValueError(f"cron expression never matches: {self.expr!r}")
+
+
+# ---------- WARM BROWSER ----------
+class WarmBrowser:
+    """One browser + logged-in Exploding Trends page, re-created on `recycle()`."""
+
+    def __init__(self, playwright: Playwright, max_jobs: int = 20, max_rss_mb: int = 1500) -> None:
+        self.playwright = playwright
+        self.max_jobs = max_jobs
+        self.max_rss_mb = max_rss_mb
+        self.routing = RoutingProfile() if BLOCK_ASSETS else None
+        self.browser: Optional[Browser] = None
+        self.et: Optional[ExplodingTrendsPage] = None
+        self.started_at: Optional[float] = None
+        self.jobs = 0
+        self.recycles = 0
+
+    def page(self) -> ExplodingTrendsPage:
+        """The warm page, launching the browser and logging in (or reusing the cached session) if needed."""
+        if not self._alive():
+            self.close()
+            start = time.perf_counter()
+            self.browser = self.playwright.chromium.launch(**LAUNCH_KWARGS)
+            _, self.et = open_session(self.browser, self.routing)
+            self.started_at = time.time()
+            self.jobs = 0
+            logging.info(f"🔥 Browser warmed up in {time.perf_counter() - start:.1f}s")
+        return self.et
+
+    def _alive(self) -> bool:
+        if self.et is None:
+            return False
+        try:
+            return self.et.is_open(timeout=5_000)
+        except Exception:  # page or browser crashed
+            return False
+
+    def rss_mb(self) -> float:
+        return tree_rss_bytes(os.getpid()) / 1024 / 1024
+
+    def recycle_reason(self) -> str:
+        if self.jobs >= self.max_jobs:
+            return f"{self.jobs} jobs"
+        rss = self.rss_mb()
+        if rss > self.max_rss_mb:
+            return f"RSS {rss:.0f} MB > {self.max_rss_mb} MB"
+        return ""
+
+    def recycle(self, reason: str) -> None:
+        logging.info(f"♻️ Recycling browser ({reason})")
+        self.close()
+        self.recycles += 1
+
+    def close(self) -> None:
+        if self.browser is not None:
+            try:
+                self.browser.close()
+            except Exception as e:
+                logging.warning(f"Browser did not close cleanly: {e}")
+        self.browser = None
+        self.et = None
+
+
+# ---------- DAEMON ----------
+class ScrapeDaemon:
+    """Runs scrape jobs on the warm browser at every tick of the schedule."""
+
+    def __init__(self, schedule: CronSchedule, warm: WarmBrowser, bucket_name: str = "") -> None:
+        self.schedule = schedule
+        self.warm = warm
+        self.bucket_name = bucket_name
+        self.s3_client = boto3.client("s3", region_name="eu-north-1") if bucket_name else None
+        self.stop_event = threading.Event()
+        self.started_at = time.time()
+        self.lock = threading.Lock()
+        self.state: Dict[str, Any] = {"status": "starting", "jobs_run": 0, "last_job": None, "next_run": None}
+
+    def _update(self, **changes: Any) -> None:
+        with self.lock:
+            self.state.update(changes)
+
+    def status(self) -> Dict[str, Any]:
+        with self.lock:
+            state = dict(self.state)
+        state.update({
+            "uptime_s": round(time.time() - self.started_at),
+            "browser_warm": self.warm.et is not None,
+            "browser_started_at": self.warm.started_at,
+            "jobs_since_recycle": self.warm.jobs,
+            "recycles": self.warm.recycles,
+            "rss_mb": round(self.warm.rss_mb(), 1),
+        })
+        return state
+
+    def run_job(self) -> Dict[str, Any]:
+        run_name = f"tickertrends_daily_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        scrape_time = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S %Z")
+        sinks, incremental = make_sinks(self.bucket_name, run_name, self.s3_client)
+        job: Dict[str, Any] = {"run": run_name, "started_at": time.time(), "ok": False, "rows": 0}
+        self._update(status="running", current_job=run_name)
+
+        start = time.perf_counter()
+        try:
+            et = self.warm.page()
+            job["rows"] = scrape_categories(
+                et, scrape_time, lambda cat, rows: write_to_sinks(sinks, cat, rows), incremental
+            )
+            job["ok"] = job["rows"] > 0
+        except Exception as e:
+            job["error"] = f"{type(e).__name__}: {e}"
+            logging.exception(f"❌ Job {run_name} failed")
+        finally:
+            finish_sinks(sinks, run_name)
+            METRICS.reset()  # the daemon outlives many runs
+            self.warm.jobs += 1
+            job["seconds"] = round(time.perf_counter() - start, 1)
+
+        reason = "failed job" if not job["ok"] else self.warm.recycle_reason()
+        if reason:
+            self.warm.recycle(reason)
+        with self.lock:
+            self.state["jobs_run"] += 1
+        self._update(status="idle", current_job=None, last_job=job)
+        logging.info(f"Job {run_name}: {job['rows']} rows in {job['seconds']}s (ok={job['ok']})")
+        return job
+
+    def run_forever(self, run_now: bool = False) -> None:
+        if run_now:
+            self.run_job()
+        else:
+            self.warm.page()  # warm up before the first tick
+            self._update(status="idle")
+        while not self.stop_event.is_set():
+            next_run = self.schedule.next_after(datetime.now())
+            self._update(next_run=next_run.isoformat(timespec="minutes"))
+            logging.info(f"⏰ Next job at {next_run:%Y-%m-%d %H:%M}")
+            if self.stop_event.wait(max(0.0, (next_run - datetime.now()).total_seconds())):
+                break
+            self.run_job()
+        self.warm.close()
+
+
+def serve_health(daemon: ScrapeDaemon, port: int) -> ThreadingHTTPServer:
+    """GET /health → JSON status (503 when the last job failed)."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] not in ("/health", "/status"):
+                self.send_response(404)
+                self.end_headers()
+                return
+            status = daemon.status()
+            last = status.get("last_job") or {}
+            body = json.dumps(status, default=str).encode("utf-8")
+            self.send_response(503 if last and not last.get("ok") else 200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logging.info(f"Health endpoint on http://127.0.0.1:{port}/health")
+    return server
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="Keep a warm browser and scrape on a schedule.")
+    parser.add_argument("--cron", default="0 */6 * * *", help="five-field cron expression (local time)")
+    parser.add_argument("--max-jobs", type=int, default=20, help="recycle the browser after this many jobs")
+    parser.add_argument("--max-rss-mb", type=int, default=1500, help="recycle above this process-tree RSS")
+    parser.add_argument("--port", type=int, default=8787, help="health endpoint port")
+    parser.add_argument("--bucket", default="", help="S3 bucket (default: files under ./output)")
+    parser.add_argument("--run-now", action="store_true", help="run one job right away")
+    args = parser.parse_args()
+
+    with sync_playwright() as pw:
+        daemon = ScrapeDaemon(CronSchedule(args.cron), WarmBrowser(pw, args.max_jobs, args.max_rss_mb), args.bucket)
+        health = serve_health(daemon, args.port)
+        signal.signal(signal.SIGTERM, lambda *_: daemon.stop_event.set())
+        try:
+            daemon.run_forever(run_now=args.run_now)
+        except KeyboardInterrupt:
+            daemon.warm.close()
+        finally:
+            health.shutdown()
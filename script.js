@@ -1,88 +1,108 @@
-$(document).ready(async function () {
-  const DATA_URL = "data/tickertrends_daily_20251029_233830.json";
-
-  // Set your preferred default category here (exact string match),
-  // or pass via URL: ?category=Sports
-  const DEFAULT_CATEGORY = null;
-
-  const params = new URLSearchParams(window.location.search);
-  const categoryFromUrl = params.get("category");
-
-  try {
-    const resp = await fetch(DATA_URL, { cache: "no-store" });
-    if (!resp.ok) throw new Error(`HTTP ${resp.status}`);
-    const raw = await resp.json();
-
-    // Collect unique categories and sort
-    const categories = [...new Set(raw.map(r => r.category).filter(Boolean))].sort();
-
-    // Populate the select WITHOUT "All"
-    const $sel = $("#categoryFilter");
-    categories.forEach(c => $sel.append(`<option value="${c}">${c}</option>`));
-
-    // Prepare table rows (Category is hidden column 0)
-    const rows = raw.map(r => {
-      const growthNum = Number((r.value ?? "").toString().replace(/,/g, ""));
-      const pctNum = Number((r.ticker_percent ?? "").toString().replace(/%/g, "")) || 0;
-      return {
-        category: r.category || "",
-        keyword: r.name || "",
-        growth_display: r.raw_growth || "",
-        growth_sort: Number.isFinite(growthNum) ? growthNum : 0,
-        ticker_symbol: r.ticker_symbol || "",
-        ticker_pct_num: pctNum
-      };
-    });
-
-    const table = $('#trendsTable').DataTable({
-      data: rows,
-      columns: [
-        { data: 'category', title: "Category", visible: false }, // 0 (hidden)
-        { data: 'keyword',  title: "Keyword" },                  // 1
-        {
-          data: 'growth_display', title: "Growth",               // 2
-          render: (d, type, row) => {
-            if (type === 'sort' || type === 'type') return row.growth_sort;
-            const n = row.growth_sort || 0;
-            const cls = n >= 50 ? 'bg-success' : n >= 20 ? 'bg-warning' : 'bg-secondary';
-            return `<span class="badge ${cls}">${d ?? ''}</span>`;
-          }
-        },
-        { data: 'ticker_symbol', title: "Ticker" },              // 3
-        {
-          data: 'ticker_pct_num', title: "Ticker %",
-          render: (d, type) => (type === 'sort' || type === 'type') ? d : `${d}%`
-        }                                                        // 4
-      ],
-      order: [[2, 'desc']],   // sort by Growth numeric
-      pageLength: 25,
-      responsive: { details: { type: 'inline' } },
-      columnDefs: [
-        { responsivePriority: 1, targets: 1 },
-        { responsivePriority: 2, targets: 2 }
-      ],
-      dom:
-        "<'row'<'col-md-6'B><'col-md-6'f>>" +
-        "<'row'<'col-12'tr>>" +
-        "<'row'<'col-md-5'i><'col-md-7'p>>",
-      buttons: [{ extend: 'csvHtml5', title: 'tiktok_viral_keywords' }]
-    });
-
-    // Choose initial category (URL param > DEFAULT_CATEGORY > first in list)
-    let initial = categoryFromUrl || DEFAULT_CATEGORY || categories[0] || "";
-    if (initial && categories.includes(initial)) {
-      $sel.val(initial);
-      table.column(0).search(initial).draw();
-    }
-
-    // Enforce always-one-category filter (no "All")
-    $sel.on('change', function () {
-      const val = this.value; // always a real category
-      table.column(0).search(val).draw();
-    });
-
-  } catch (e) {
-    console.error("Error loading JSON:", e);
-    $('body').append(`<p class="text-danger text-center mt-3">Failed to load data.</p>`);
-  }
-});
+$(document).ready(async function () {
+  // Written by dashboard_publish.py: categories of the newest run + one shard per category
+  const MANIFEST_URL = "dashboard/manifest.json";
+  const BASE_URL = MANIFEST_URL.slice(0, MANIFEST_URL.lastIndexOf("/") + 1);
+
+  // Set your preferred default category here (exact string match),
+  // or pass via URL: ?category=Sports
+  const DEFAULT_CATEGORY = null;
+
+  const params = new URLSearchParams(window.location.search);
+  const categoryFromUrl = params.get("category");
+
+  // Shards already loaded, by category (switching back is instant)
+  const shards = new Map();
+
+  async function fetchJson(url, cache) {
+    const resp = await fetch(url, { cache });
+    if (!resp.ok) throw new Error(`HTTP ${resp.status} for ${url}`);
+    return resp.json();
+  }
+
+  // S3 does not negotiate encodings: ask for the brotli twin where browsers accept br
+  // (secure contexts only), else for the gzip-encoded shard
+  async function fetchShard(entry) {
+    if (entry.br && window.isSecureContext) {
+      try {
+        return await fetchJson(BASE_URL + entry.br, "default");
+      } catch (e) {
+        console.warn("Brotli shard failed, falling back to gzip:", e);
+      }
+    }
+    return fetchJson(BASE_URL + entry.path, "default");
+  }
+
+  try {
+    const manifest = await fetchJson(MANIFEST_URL, "no-store");
+    const byName = new Map(manifest.categories.map(c => [c.name, c]));
+    const categories = manifest.categories.map(c => c.name);  // already sorted
+
+    // Populate the select WITHOUT "All"
+    const $sel = $("#categoryFilter");
+    manifest.categories.forEach(c => $sel.append(`<option value="${c.name}">${c.name} (${c.rows})</option>`));
+
+    // Shard rows are arrays, pre-sorted by signed growth (declines are negative):
+    // [keyword, growth_display, growth, ticker, ticker_pct]
+    const table = $('#trendsTable').DataTable({
+      data: [],
+      columns: [
+        { data: 0, title: "Keyword" },                           // 0
+        {
+          data: 1, title: "Growth",                              // 1
+          render: (d, type, row) => {
+            if (type === 'sort' || type === 'type') return row[2];
+            const n = row[2] || 0;
+            const cls = n >= 50 ? 'bg-success' : n >= 20 ? 'bg-warning' : 'bg-secondary';
+            return `<span class="badge ${cls}">${d ?? ''}</span>`;
+          }
+        },
+        { data: 3, title: "Ticker" },                            // 2
+        {
+          data: 4, title: "Ticker %",
+          render: (d, type) => (type === 'sort' || type === 'type') ? d : `${d}%`
+        }                                                        // 3
+      ],
+      order: [[1, 'desc']],   // sort by Growth numeric
+      pageLength: 25,
+      deferRender: true,
+      responsive: { details: { type: 'inline' } },
+      columnDefs: [
+        { responsivePriority: 1, targets: 0 },
+        { responsivePriority: 2, targets: 1 }
+      ],
+      dom:
+        "<'row'<'col-md-6'B><'col-md-6'f>>" +
+        "<'row'<'col-12'tr>>" +
+        "<'row'<'col-md-5'i><'col-md-7'p>>",
+      buttons: [{ extend: 'csvHtml5', title: 'tiktok_viral_keywords' }]
+    });
+
+    async function showCategory(name) {
+      const entry = byName.get(name);
+      if (!entry) return;
+      if (!shards.has(name)) {
+        // Run paths are immutable, so the browser cache can be used as is
+        shards.set(name, (await fetchShard(entry)).rows);
+      }
+      if ($sel.val() !== name) return;  // user already picked another category
+      table.clear().rows.add(shards.get(name)).draw();
+    }
+
+    // Choose initial category (URL param > DEFAULT_CATEGORY > first in list)
+    let initial = categoryFromUrl || DEFAULT_CATEGORY || categories[0] || "";
+    if (!categories.includes(initial)) initial = categories[0] || "";
+    if (initial) {
+      $sel.val(initial);
+      await showCategory(initial);
+    }
+
+    // Enforce always-one-category filter (no "All"); only that shard is loaded
+    $sel.on('change', function () {
+      showCategory(this.value).catch(e => console.error("Error loading shard:", e));
+    });
+
+  } catch (e) {
+    console.error("Error loading JSON:", e);
+    $('body').append(`<p class="text-danger text-center mt-3">Failed to load data.</p>`);
+  }
+});
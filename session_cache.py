@@ -0,0 +1,58 @@
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from playwright.sync_api import BrowserContext
+
+DEFAULT_PATH = Path(".tickertrends_session.json")
+DEFAULT_TTL_SECONDS = 6 * 3600
+
+
+class SessionCache:
+    """
+    Authenticated `storage_state` on disk, with a TTL.
+
+    Besides the cookies/localStorage it remembers the Exploding Trends URL, so a warm
+    run can open that page directly. The file holds session cookies: it is written
+    with 0600 permissions and should never be committed.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_PATH, ttl_seconds: int = DEFAULT_TTL_SECONDS) -> None:
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """{'storage_state', 'url', 'saved_at'} if a fresh entry exists, else None."""
+        try:
+            entry = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+        age = time.time() - float(entry.get("saved_at", 0))
+        if age > self.ttl_seconds or not entry.get("storage_state"):
+            logging.info(f"Session cache expired ({age / 60:.0f} min old)")
+            return None
+        return entry
+
+    def save(self, context: BrowserContext, url: str) -> None:
+        """Store the context's current storage_state and the page URL to resume at."""
+        self.save_state(context.storage_state(), url)
+
+    def save_state(self, storage_state: Dict[str, Any], url: str) -> None:
+        """Same as `save` for an already fetched storage_state (e.g. from the async API)."""
+        entry = {"saved_at": time.time(), "url": url, "storage_state": storage_state}
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp, self.path)
+
+    def invalidate(self) -> None:
+        """Forget the cached session (e.g. after it was rejected by the site)."""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
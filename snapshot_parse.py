@@ -0,0 +1,289 @@
+"""
+Off-browser parsing of trend-grid snapshots in a process pool.
+
+In snapshot mode the browser only takes each page's card HTML
+(`ExplodingTrendsPage.page_snapshot`, one call) and clicks on. Parsing happens
+in worker processes with the same selectors as `CARD_TEXTS_JS`
+(`h3`, `div.mb-2 > span`, `button.flex.w-full.items-center.justify-between span`)
+and the same `parse_card` rules, so pages and categories are parsed on the
+other cores while the browser keeps going.
+
+The parser is selectolax when installed, else lxml, else the standard library's
+html.parser. Text is whitespace-normalized like innerText (CSS text-transform is
+not applied). With `keep_dir`, raw snapshots are saved as
+`<keep_dir>/<category slug>/pNN.html` plus an `index.json`, so the parse can be
+re-run later without scraping:
+
+    python snapshot_parse.py output/snapshots/tickertrends_daily_20250101_120000 --json rows.json
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from html.parser import HTMLParser as _StdlibParser
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple, Union
+
+from trend_values import parse_card, slug
+
+try:
+    from selectolax.parser import HTMLParser as SelectolaxParser
+except ImportError:  # optional: fastest parser
+    SelectolaxParser = None
+
+try:
+    import lxml.html
+except ImportError:  # optional
+    lxml = None
+
+Trend = Dict[str, str]
+RawCard = Dict[str, str]
+
+CARD_CLASS = "trend-ultra-compact"
+GROWTH_PARENT_CLASS = "mb-2"
+TICKER_BUTTON_CLASSES = ("flex", "w-full", "items-center", "justify-between")
+
+
+def _text(s: str) -> str:
+    return " ".join(s.split())
+
+
+def _raw(name: str, growth: str, spans: List[str]) -> RawCard:
+    has_ticker = len(spans) >= 2
+    return {
+        "name": _text(name),
+        "raw_growth": _text(growth),
+        "ticker_symbol": _text(spans[0]) if has_ticker else "",
+        "pct_txt": _text(spans[1]) if has_ticker else "",
+    }
+
+
+# ---------- PARSERS ----------
+def _cards_selectolax(html: str) -> List[RawCard]:
+    def text(node: Any) -> str:
+        return node.text() if node is not None else ""
+
+    out = []
+    for card in SelectolaxParser(html).css(f"div.{CARD_CLASS}"):
+        btn = card.css_first("button." + ".".join(TICKER_BUTTON_CLASSES))
+        spans = [s.text() for s in btn.css("span")] if btn is not None else []
+        out.append(_raw(text(card.css_first("h3")), text(card.css_first(f"div.{GROWTH_PARENT_CLASS} > span")), spans))
+    return out
+
+
+def _has_class_xpath(*names: str) -> str:
+    return " and ".join(f"contains(concat(' ', normalize-space(@class), ' '), ' {n} ')" for n in names)
+
+
+def _cards_lxml(html: str) -> List[RawCard]:
+    def first_text(nodes: List[Any]) -> str:
+        return nodes[0].text_content() if nodes else ""
+
+    out = []
+    root = lxml.html.fromstring(f"<div>{html}</div>")
+    for card in root.xpath(f".//div[{_has_class_xpath(CARD_CLASS)}]"):
+        btn = card.xpath(f".//button[{_has_class_xpath(*TICKER_BUTTON_CLASSES)}]")
+        spans = [s.text_content() for s in btn[0].xpath(".//span")] if btn else []
+        out.append(_raw(
+            first_text(card.xpath(".//h3")),
+            first_text(card.xpath(f".//div[{_has_class_xpath(GROWTH_PARENT_CLASS)}]/span")),
+            spans,
+        ))
+    return out
+
+
+class _Node:
+    __slots__ = ("tag", "classes", "parent", "children")
+
+    def __init__(self, tag: str, classes: Sequence[str], parent: Optional["_Node"]) -> None:
+        self.tag = tag
+        self.classes = set(classes)
+        self.parent = parent
+        self.children: List[Union["_Node", str]] = []
+
+    def descendants(self) -> Any:
+        for child in self.children:
+            if isinstance(child, _Node):
+                yield child
+                yield from child.descendants()
+
+    def first(self, match: Callable[["_Node"], bool]) -> Optional["_Node"]:
+        return next((n for n in self.descendants() if match(n)), None)
+
+    def text(self) -> str:
+        return "".join(c if isinstance(c, str) else c.text() for c in self.children)
+
+
+class _TreeBuilder(_StdlibParser):
+    VOID = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.root = self.current = _Node("#root", (), None)
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        node = _Node(tag, (dict(attrs).get("class") or "").split(), self.current)
+        self.current.children.append(node)
+        if tag not in self.VOID:
+            self.current = node
+
+    def handle_endtag(self, tag: str) -> None:
+        node = self.current
+        while node.parent is not None and node.tag != tag:
+            node = node.parent
+        if node.parent is not None:  # unmatched end tags are ignored
+            self.current = node.parent
+
+    def handle_data(self, data: str) -> None:
+        self.current.children.append(data)
+
+
+def _cards_stdlib(html: str) -> List[RawCard]:
+    def text(node: Optional[_Node]) -> str:
+        return node.text() if node is not None else ""
+
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    out = []
+    for card in builder.root.descendants():
+        if card.tag != "div" or CARD_CLASS not in card.classes:
+            continue
+        btn = card.first(lambda n: n.tag == "button" and n.classes.issuperset(TICKER_BUTTON_CLASSES))
+        spans = [s.text() for s in btn.descendants() if s.tag == "span"] if btn is not None else []
+        growth = card.first(
+            lambda n: n.tag == "span" and n.parent.tag == "div" and GROWTH_PARENT_CLASS in n.parent.classes
+        )
+        out.append(_raw(text(card.first(lambda n: n.tag == "h3")), text(growth), spans))
+    return out
+
+
+if SelectolaxParser is not None:
+    BACKEND, _cards = "selectolax", _cards_selectolax
+elif lxml is not None:
+    BACKEND, _cards = "lxml", _cards_lxml
+else:
+    BACKEND, _cards = "html.parser", _cards_stdlib
+
+
+def parse_snapshot(html: str) -> List[Trend]:
+    """Trend dicts of one page snapshot, exactly as `extract_page_trends` returns them."""
+    return [parse_card(**raw) for raw in _cards(html)]
+
+
+# ---------- POOL ----------
+class SnapshotPool:
+    """
+    Process pool parsing page snapshots while the browser moves on.
+
+    Results are handed back in the calling thread and in category order, so the
+    sinks never see another thread. Workers are spawned (not forked): the parent
+    runs Playwright's threads.
+    """
+
+    def __init__(self, workers: Optional[int] = None, keep_dir: Optional[Union[str, Path]] = None) -> None:
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.keep_dir = Path(keep_dir) if keep_dir else None
+        self.executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        self.index: Dict[str, List[str]] = {}
+
+    def submit(self, category: str, page_no: int, html: str) -> "Future[List[Trend]]":
+        if self.keep_dir is not None:
+            rel = f"{slug(category)}/p{page_no:02d}.html"
+            path = self.keep_dir / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(html, encoding="utf-8")
+            self.index.setdefault(category, []).append(rel)
+        return self.executor.submit(parse_snapshot, html)
+
+    def scrape(
+        self,
+        et: Any,
+        categories: Sequence[str],
+        max_pages: Optional[int],
+        on_category: Callable[[str, List[Trend]], Any],
+        guard: Optional[Any] = None,
+    ) -> None:
+        """
+        Snapshot every page of every category on `et`; `on_category(cat, trends)` is
+        called once a category's pages are parsed (earlier categories first). With a
+        memory_guard.MemoryGuard, memory is checked after every category, as in the
+        driver's page-by-page mode.
+        """
+        pending: Deque[Tuple[str, List[Future]]] = deque()
+
+        def deliver(block: bool) -> None:
+            while pending and (block or all(f.done() for f in pending[0][1])):
+                cat, futures = pending.popleft()
+                try:
+                    on_category(cat, [t for f in futures for t in f.result()])
+                except Exception as e:
+                    logging.warning(f"  ⚠️ Skipped {cat} due to error: {e}")
+
+        for cat in categories:
+            logging.info(f"Snapshotting category: {cat}")
+            futures: List[Future] = []
+            try:
+                et.choose_category(cat)
+                try:
+                    et.snapshot_all_pages(lambda page_no, html: futures.append(self.submit(cat, page_no, html)), max_pages)
+                finally:
+                    et.choose_category(cat)  # unselect
+                pending.append((cat, futures))
+            except Exception as e:
+                logging.warning(f"  ⚠️ Skipped {cat} due to error: {e}")
+            if guard is not None:
+                try:
+                    guard.check(et, cat)
+                except Exception as e:
+                    logging.warning(f"  ⚠️ Recycling the tab failed, going on with the current one: {e}")
+            deliver(block=False)
+        deliver(block=True)
+
+    def close(self) -> None:
+        self.executor.shutdown()
+        if self.keep_dir is not None and self.index:
+            index_path = self.keep_dir / "index.json"
+            previous = json.loads(index_path.read_text(encoding="utf-8")) if index_path.exists() else {}
+            previous.update(self.index)
+            index_path.write_text(json.dumps(previous, ensure_ascii=False, indent=1), encoding="utf-8")
+
+    def __enter__(self) -> "SnapshotPool":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def reparse(snapshot_dir: Union[str, Path], workers: Optional[int] = None) -> Dict[str, List[Trend]]:
+    """Parse kept snapshots again (e.g. after a parse_card fix): category → trends, pages in order."""
+    snapshot_dir = Path(snapshot_dir)
+    index: Dict[str, List[str]] = json.loads((snapshot_dir / "index.json").read_text(encoding="utf-8"))
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures = {
+            cat: [executor.submit(parse_snapshot, (snapshot_dir / rel).read_text(encoding="utf-8")) for rel in files]
+            for cat, files in index.items()
+        }
+        return {cat: [t for f in fs for t in f.result()] for cat, fs in futures.items()}
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="Re-parse kept trend-grid snapshots without scraping.")
+    parser.add_argument("snapshot_dir")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--json", default="", help="write {category: trends} to this file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = reparse(args.snapshot_dir, args.workers)
+    for cat, trends in result.items():
+        logging.info(f"  {cat}: {len(trends)} trends")
+    logging.info(f"✅ Parsed {sum(map(len, result.values()))} trends with {BACKEND} in {time.perf_counter() - start:.2f}s")
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
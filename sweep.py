@@ -0,0 +1,171 @@
+"""
+Sweep mode: scrape any data type × granularity × category matrix in one session.
+
+The plan is ordered to keep UI transitions low:
+- the data type / granularity already shown (`current_data_type`,
+  `current_granularity`) comes first;
+- granularities snake between data types (Daily→Monthly, then Monthly→Daily), so
+  a data type switch does not also need a granularity switch;
+- categories snake between combinations and the last sector stays selected across
+  a filter change, so the next combination starts without a sector transition;
+- moving to the next sector is one `swap_category` (uncheck old, check new, apply
+  once) instead of a select and an unselect cycle.
+
+    python sweep.py --data-types Tiktok Wiki --granularities Daily Weekly
+"""
+import argparse
+import logging
+import re
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import boto3
+from playwright.sync_api import sync_playwright
+
+from exploding_trends_page import ExplodingTrendsPage
+from routing_profile import RoutingProfile
+from test_tickertrends import (
+    BLOCK_ASSETS,
+    CATEGORIES,
+    GRANULARITY,
+    LAUNCH_KWARGS,
+    MAX_PAGES,
+    PREFETCH_TABS,
+    exploding_trends_page,
+    open_session,
+    trend_rows,
+)
+from trend_sink import TrendSink
+
+Row = Dict[str, str]
+
+
+class SweepStep(NamedTuple):
+    data_type: str
+    granularity: str
+    category: str
+
+
+def _current_first(values: Sequence[str], current: str) -> List[str]:
+    return sorted(values, key=lambda v: v.lower() != current.lower())  # stable: keeps the given order otherwise
+
+
+def plan_sweep(
+    data_types: Sequence[str],
+    granularities: Sequence[str],
+    categories: Sequence[str],
+    start_data_type: str = "Search Trend",
+    start_granularity: str = "Monthly",
+) -> List[SweepStep]:
+    """All combinations, ordered to minimize dropdown and sector-menu transitions."""
+    steps: List[SweepStep] = []
+    grans = _current_first(granularities, start_granularity)
+    combo = 0
+    for i, data_type in enumerate(_current_first(data_types, start_data_type)):
+        for granularity in (grans if i % 2 == 0 else grans[::-1]):
+            cats = list(categories) if combo % 2 == 0 else list(categories)[::-1]
+            steps.extend(SweepStep(data_type, granularity, cat) for cat in cats)
+            combo += 1
+    return steps
+
+
+def count_transitions(steps: Sequence[SweepStep], start_data_type: str, start_granularity: str) -> Dict[str, int]:
+    """UI transitions `run_sweep` needs for a plan (sector menu opens include the final unselect)."""
+    counts = {"data_type": 0, "granularity": 0, "sector_menu": 0}
+    data_type, granularity, selected = start_data_type.lower(), start_granularity.lower(), None
+    for step in steps:
+        counts["data_type"] += step.data_type.lower() != data_type
+        counts["granularity"] += step.granularity.lower() != granularity
+        counts["sector_menu"] += step.category != selected
+        data_type, granularity, selected = step.data_type.lower(), step.granularity.lower(), step.category
+    counts["sector_menu"] += selected is not None
+    return counts
+
+
+def _sector_selected(et: ExplodingTrendsPage) -> bool:
+    return bool(re.search(r"\d+\s+selected", et.category_button.inner_text(), re.I))
+
+
+def _reset_sectors(et: ExplodingTrendsPage) -> None:
+    """After a failed step the selection is unknown (the swap may have stopped half-way): clear it."""
+    try:
+        if _sector_selected(et):
+            et.clear_categories()
+    except Exception as e:
+        logging.warning(f"  ⚠️ Could not reset the sectors: {e}")
+
+
+def run_sweep(
+    et: ExplodingTrendsPage,
+    steps: Sequence[SweepStep],
+    on_rows: Callable[[SweepStep, List[Row]], None],
+    max_pages: Optional[int] = None,
+    prefetch_tabs: int = 0,
+) -> None:
+    """Walk the plan on one page; `on_rows(step, trends)` gets every finished step."""
+    selected: Optional[str] = None
+    try:
+        for step in steps:
+            try:
+                if (step.data_type.lower(), step.granularity.lower()) != (
+                    et.current_data_type.lower(), et.current_granularity.lower()
+                ):
+                    et.choose_data_type(step.data_type)  # both skip when already set
+                    et.choose_time_granularity(step.granularity)
+                    if selected is not None and not _sector_selected(et):
+                        selected = None  # the filter change reset the sectors
+                et.swap_category(selected, step.category)
+                selected = step.category
+                trends = et.extract_all_trends(
+                    max_pages=max_pages, prefetch_tabs=prefetch_tabs, page_factory=exploding_trends_page
+                )
+                on_rows(step, trends)
+                logging.info(f"  → {len(trends)} rows for {step.data_type} / {step.granularity} / {step.category}")
+            except Exception as e:
+                logging.warning(f"  ⚠️ Skipped {step} due to error: {e}")
+                _reset_sectors(et)
+                selected = None
+    finally:
+        if selected is not None:
+            et.choose_category(selected)  # unselect
+
+
+# ---------- CLI ----------
+def main(data_types: List[str], granularities: List[str], categories: List[str], bucket_name: str = "") -> None:
+    run_name = f"tickertrends_sweep_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    s3_client = boto3.client("s3", region_name="eu-north-1") if bucket_name else None
+    sink = TrendSink(name=run_name, bucket_name=bucket_name, prefix="data/", s3_client=s3_client)
+    scrape_time = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S %Z")
+
+    def on_rows(step: SweepStep, trends: List[Row]) -> None:
+        rows = trend_rows(trends, scrape_time, step.category, granularity=step.granularity)
+        for row in rows:
+            row["data_type"] = step.data_type
+        sink.write_category(f"{step.data_type} / {step.granularity} / {step.category}", rows)
+
+    try:
+        with sync_playwright() as pw:
+            browser = pw.chromium.launch(**LAUNCH_KWARGS)
+            try:
+                _, et = open_session(browser, RoutingProfile() if BLOCK_ASSETS else None)
+                steps = plan_sweep(data_types, granularities, categories, et.current_data_type, et.current_granularity)
+                cost = count_transitions(steps, et.current_data_type, et.current_granularity)
+                logging.info(f"Sweep: {len(steps)} steps, transitions {cost}")
+                run_sweep(et, steps, on_rows, max_pages=MAX_PAGES, prefetch_tabs=PREFETCH_TABS)
+            finally:
+                browser.close()
+    finally:
+        sink.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="Scrape a data type × granularity × category matrix in one session.")
+    parser.add_argument("--data-types", nargs="+", default=["Tiktok"])
+    parser.add_argument("--granularities", nargs="+", default=[GRANULARITY])
+    parser.add_argument("--categories", nargs="+", default=CATEGORIES)
+    parser.add_argument("--bucket", default="", help="S3 bucket (default: files under ./output)")
+    args = parser.parse_args()
+
+    main(args.data_types, args.granularities, args.categories, args.bucket)
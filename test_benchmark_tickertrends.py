@@ -0,0 +1,96 @@
+"""
+pytest-benchmark runs against the offline mock site (no network needed):
+
+    pip install pytest pytest-benchmark
+    python -m pytest test_benchmark_tickertrends.py --benchmark-only
+    python -m pytest test_benchmark_tickertrends.py --benchmark-autosave    # compare later with --benchmark-compare
+
+The end-to-end scrape needs Playwright and its Chromium (`playwright install chromium`)
+and is skipped without them; the parsing benchmarks only need Python.
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from mock_tickertrends_site import SECTORS, MockSite, serve
+from trend_payload import payload_to_trends
+from trend_records import dedupe_records, records_from_trends
+
+CARDS, PAGES, CATEGORIES = 24, 3, 2
+
+
+@pytest.fixture(scope="module")
+def chromium():
+    sync_api = pytest.importorskip("playwright.sync_api")
+    try:
+        with sync_api.sync_playwright() as pw:
+            pw.chromium.launch().close()
+    except sync_api.Error as e:
+        pytest.skip(f"Chromium not available: {e}")
+
+
+@pytest.fixture(scope="module")
+def mock_site():
+    server, base_url = serve(MockSite(cards_per_page=CARDS, pages=PAGES, latency_ms=20))
+    yield base_url
+    server.shutdown()
+
+
+@pytest.mark.parametrize("prefetch_tabs", [0, 2])
+def test_scrape_mock_site(benchmark, chromium, mock_site, prefetch_tabs):
+    from benchmark_tickertrends import run_benchmark
+
+    result = benchmark.pedantic(
+        run_benchmark,
+        args=(mock_site, SECTORS[:CATEGORIES], PAGES),
+        kwargs={"prefetch_tabs": prefetch_tabs},
+        rounds=3,
+        iterations=1,
+    )
+    assert result["rows"] == CATEGORIES * PAGES * CARDS
+    assert result["page_seconds"]["count"] == CATEGORIES * PAGES
+    benchmark.extra_info.update(
+        page_p50=result["page_seconds"]["p50"],
+        category_p50=result["category_seconds"]["p50"],
+        peak_rss_mb=round(result["peak_rss_mb"]),
+    )
+
+
+def _category_items(pages: int = 11, cards: int = 24):
+    site = MockSite(cards_per_page=cards, pages=pages)
+    return [site.trends_payload({"sectors": ["Sports"], "pageNo": [str(n)]})["trends"] for n in range(1, pages + 1)]
+
+
+def test_payload_parsing(benchmark):
+    site = MockSite(cards_per_page=24, pages=1)
+    payload = site.trends_payload({"sectors": ["Sports"]})
+    trends = benchmark(payload_to_trends, payload)
+    assert len(trends) == 24
+
+
+def test_category_rows(benchmark):
+    pages = _category_items()
+    items = [item for page in pages for item in page]
+    # Page 1 shows up again at the end, as when the ranking shifts while paginating
+    trends = [t for page in pages + pages[:1] for t in payload_to_trends({"trends": page})]
+
+    def rows():
+        return [r.as_row("2025-01-01 00:00:00 UTC", "Daily") for r in dedupe_records(records_from_trends("Sports", trends))]
+
+    result = benchmark(rows)
+
+    assert len(result) == len(items)  # exactly the repeated page dropped
+    for row, item in zip(result, items):
+        growth = item["growth"]
+        ticker = item["tickers"][0] if item["tickers"] else {}
+        assert row == {
+            "scrape_time": "2025-01-01 00:00:00 UTC",
+            "granularity": "Daily",
+            "category": "Sports",
+            "name": item["name"],
+            "sign": "-" if growth < 0 else "+",
+            "value": str(abs(growth)),
+            "raw_growth": f"{'-' if growth < 0 else '+'}{abs(growth)}%",
+            "ticker_symbol": ticker.get("symbol", ""),
+            "ticker_percent": str(ticker["percent"]) if ticker else "",
+        }
@@ -0,0 +1,68 @@
+"""
+CronSchedule semantics, no browser needed:
+
+    python -m pytest test_scrape_daemon.py
+"""
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("boto3")
+pytest.importorskip("playwright")
+
+from scrape_daemon import CronSchedule
+
+
+def _runs(expr, start, n):
+    out, t = [], start
+    for _ in range(n):
+        t = CronSchedule(expr).next_after(t)
+        out.append(t)
+    return out
+
+
+def test_star_step():
+    cron = CronSchedule("*/15 */6 * * *")
+    assert cron.minutes == {0, 15, 30, 45}
+    assert cron.hours == {0, 6, 12, 18}
+    assert cron.any_day and cron.any_weekday  # '*/n' restricts no day
+
+
+def test_range_step_and_open_step():
+    assert CronSchedule("10-30/10 * * * *").minutes == {10, 20, 30}
+    assert CronSchedule("5/20 * * * *").minutes == {5, 25, 45}  # a/n runs to the end of the range
+    assert CronSchedule("0 1,3-5 * * *").hours == {1, 3, 4, 5}
+
+
+def test_weekday_seven_is_sunday():
+    assert CronSchedule("0 0 * * 7").weekdays == {0}
+    assert CronSchedule("0 0 * * 5-7").weekdays == {0, 5, 6}
+    sunday = CronSchedule("0 9 * * 7").next_after(datetime(2025, 1, 1, 12, 0))  # a Wednesday
+    assert sunday == datetime(2025, 1, 5, 9, 0)
+
+
+def test_day_of_month_and_weekday_are_ored():
+    # 13th of the month or any Friday
+    runs = _runs("0 0 13 * 5", datetime(2025, 6, 1), 4)
+    assert runs == [datetime(2025, 6, 6), datetime(2025, 6, 13), datetime(2025, 6, 20), datetime(2025, 6, 27)]
+    runs = _runs("0 0 13 * 5", datetime(2025, 7, 5), 2)
+    assert runs == [datetime(2025, 7, 11), datetime(2025, 7, 13)]
+
+
+def test_star_day_field_means_and():
+    # '*/1' in day-of-month is unrestricted, so only Mondays match
+    runs = _runs("0 0 */1 * 1", datetime(2025, 6, 1), 2)
+    assert runs == [datetime(2025, 6, 2), datetime(2025, 6, 9)]
+
+
+def test_next_after_crosses_month_and_year():
+    assert CronSchedule("30 23 31 * *").next_after(datetime(2025, 4, 1)) == datetime(2025, 5, 31, 23, 30)
+    assert CronSchedule("0 0 1 * *").next_after(datetime(2025, 12, 31, 23, 59)) == datetime(2026, 1, 1)
+    assert CronSchedule("0 */6 * * *").next_after(datetime(2025, 1, 31, 18, 0)) == datetime(2025, 2, 1)
+    assert CronSchedule("0 0 29 2 *").next_after(datetime(2025, 3, 1)) == datetime(2028, 2, 29)
+
+
+@pytest.mark.parametrize("expr", ["*/0 * * * *", "0 0-6/x * * *", "60 * * * *", "0 0 * * 8", "* * * *"])
+def test_invalid_expressions(expr):
+    with pytest.raises(ValueError, match="cron"):
+        CronSchedule(expr)
@@ -0,0 +1,45 @@
+"""
+Sweep planning, no browser needed:
+
+    python -m pytest test_sweep.py
+"""
+import itertools
+
+import pytest
+
+pytest.importorskip("boto3")
+pytest.importorskip("playwright")
+
+from sweep import SweepStep, count_transitions, plan_sweep
+
+DATA_TYPES = ["Tiktok", "Wiki"]
+GRANULARITIES = ["Daily", "Weekly"]
+CATEGORIES = ["Sports", "Health", "Technology"]
+
+
+def test_plan_covers_every_combination_once():
+    steps = plan_sweep(DATA_TYPES, GRANULARITIES, CATEGORIES, "Tiktok", "Daily")
+    assert sorted(steps) == sorted(SweepStep(*c) for c in itertools.product(DATA_TYPES, GRANULARITIES, CATEGORIES))
+
+
+def test_plan_snakes_from_the_current_filters():
+    steps = plan_sweep(DATA_TYPES, GRANULARITIES, CATEGORIES, "wiki", "weekly")  # matched case-insensitively
+    assert [(s.data_type, s.granularity) for s in steps[::3]] == [
+        ("Wiki", "Weekly"), ("Wiki", "Daily"), ("Tiktok", "Daily"), ("Tiktok", "Weekly"),
+    ]
+    assert [s.category for s in steps[:6]] == ["Sports", "Health", "Technology", "Technology", "Health", "Sports"]
+    # every combination starts with the sector the previous one ended on
+    assert all(steps[i].category == steps[i - 1].category for i in range(3, len(steps), 3))
+
+
+def test_count_transitions():
+    steps = plan_sweep(DATA_TYPES, GRANULARITIES, CATEGORIES, "Tiktok", "Daily")
+    # sectors: 3 + 2 + 2 + 2 swaps, plus the final unselect
+    assert count_transitions(steps, "Tiktok", "Daily") == {"data_type": 1, "granularity": 2, "sector_menu": 10}
+
+    naive = [SweepStep(*c) for c in itertools.product(DATA_TYPES, GRANULARITIES, CATEGORIES)]
+    assert count_transitions(naive, "Tiktok", "Daily") == {"data_type": 1, "granularity": 3, "sector_menu": 13}
+
+
+def test_count_transitions_of_an_empty_plan():
+    assert count_transitions([], "Tiktok", "Daily") == {"data_type": 0, "granularity": 0, "sector_menu": 0}
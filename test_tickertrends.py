@@ -1,164 +1,422 @@
-# Scraping & Saving TickerTrends Data (JSON only)
-import json
-import logging
-from datetime import datetime, timezone
-from pathlib import Path
-from playwright.sync_api import Playwright, sync_playwright
-
-from mainpage_tickertrends import MainPage
-from loginpage_tickertrends import LoginPage
-from homepage_tickertrends import HomePage
-from exploding_trends_page import ExplodingTrendsPage
-
-
-
-# Use this code snippet in your app.
-# If you need more information about configurations
-# or implementing the sample code, visit the AWS docs:
-# https://aws.amazon.com/developer/language/python/
-
-import boto3
-from botocore.exceptions import ClientError
-import io
-
-def get_secret():
-
-    secret_name = "tickertrends_login"
-    region_name = "eu-north-1"
-
-    # Create a Secrets Manager client
-    session = boto3.session.Session()
-    client = session.client(
-        service_name='secretsmanager',
-        region_name=region_name
-    )
-
-    try:
-        get_secret_value_response = client.get_secret_value(
-            SecretId=secret_name
-        )
-    except ClientError as e:
-        # For a list of exceptions thrown, see
-        # https://docs.aws.amazon.com/secretsmanager/latest/apireference/API_GetSecretValue.html
-        raise e
-
-    secret = get_secret_value_response['SecretString']
-    return json.loads(secret)
-    # Your code goes here.
-
-
-
-CATEGORIES = [
-    "Arts & Culture","Automotive & Mobility","Business & Finance","Consumer Products",
-    "E-commerce & Retail","Education & Learning","Entertainment","Fashion & Beauty",
-    "Food & Beverage","Gaming & Virtual Worlds","Health & Wellness","Home & Living",
-    "Politics & Government","Real Estate & Housing","Science & Innovation",
-    "Social Media & Influencers","Sports","Technology","Travel & Hospitality",
-]
-
-MAX_PAGES = 11  # cap per category because of a personal account!
-GRANULARITY = "Daily"  # only daily
-
-
-# ---------- SCRAPING ----------
-def scrape_tickertrends_daily(playwright: Playwright):
-    """Scrapes TickerTrends 'Daily' granularity for all categories and returns a list of dicts."""
-    browser = playwright.chromium.launch(headless=True)
-    context = browser.new_context()
-    page = context.new_page()
-
-    scrape_time = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S %Z")
-
-    # --- Login & navigation ---
-    page.goto("https://tickertrends.io/", wait_until="domcontentloaded", timeout=30_000)
-    MainPage(page).prepare_and_open_login()
-
-    login_page = LoginPage(page)
-    login_page.open_email_login()
-    tickertrends_credentials = get_secret()
-    login_page.fill_username(tickertrends_credentials["tickertrends_email"])
-    login_page.fill_password(tickertrends_credentials["tickertrends_password"])
-    login_page.submit_login()
-
-    page.wait_for_timeout(5_000)
-    HomePage(page).open_exploding_trends()
-
-    et = ExplodingTrendsPage(page)
-    et.open_type_menu()
-    et.select_source("Tiktok")
-    et.choose_list_view()
-    et.choose_time_granularity(GRANULARITY)
-
-    all_rows = []
-
-    for cat in CATEGORIES:
-        logging.info(f"Scraping category: {cat}")
-        try:
-            et.choose_category(cat)
-            page.wait_for_timeout(300)
-            trends = et.extract_all_trends(max_pages=MAX_PAGES)
-            et.choose_category(cat)  # unselect
-
-            for t in trends:
-                all_rows.append({
-                    "scrape_time": scrape_time,
-                    "granularity": GRANULARITY,
-                    "category": cat,
-                    "name": t.get("name", ""),
-                    "sign": t.get("sign", ""),
-                    "value": t.get("value", ""),
-                    "raw_growth": t.get("raw_growth", ""),
-                    "ticker_symbol": t.get("ticker_symbol", ""),
-                    "ticker_percent": t.get("ticker_percent", "")
-                })
-            logging.info(f"  → Collected {len(trends)} rows for {cat}")
-        except Exception as e:
-            logging.warning(f"  ⚠️ Skipped {cat} due to error: {e}")
-
-    browser.close()
-    return all_rows
-
-
-# ---------- MAIN ----------
-def main(bucket_name: str):
-    """Runs the scrape and saves a JSON file."""
-    logger = logging.getLogger(__name__)
-
-    with sync_playwright() as pw:
-        data = scrape_tickertrends_daily(pw)
-
-    if not data:
-        logger.warning("No data collected — nothing to save.")
-        return
-
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"tickertrends_daily_{timestamp}.json"
-
-    s3_prefix = "data/"
-
-    s3_client = boto3.client("s3", region_name="eu-north-1")
-
-    # convert data to JSON bytes
-    json_bytes = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
-
-    # upload
-    try:
-        s3_client.put_object(
-            Bucket=bucket_name,
-            Key=f"{s3_prefix}{filename}",
-            Body=json_bytes,
-            ContentType="application/json"
-        )
-        logger.info(f"✅ Uploaded {len(data)} records to s3://{bucket_name}/{s3_prefix}{filename}")
-    except Exception as e:
-        logger.error(f"❌ Failed to upload to S3: {e}")
-
-
-# ---------- ENTRY POINT ----------
-if __name__ == "__main__":
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
-
+# Scraping & Saving TickerTrends Data (JSON only)
+import json
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from playwright.sync_api import Browser, BrowserContext, Page, Playwright, sync_playwright
+
+from mainpage_tickertrends import MainPage
+from loginpage_tickertrends import LoginPage
+from homepage_tickertrends import HomePage
+from exploding_trends_page import ExplodingTrendsPage
+from trend_capture import TrendCapture
+from readiness import Readiness
+from routing_profile import RoutingProfile
+from session_cache import SessionCache
+from trend_sink import TrendSink
+from columnar_output import ParquetWriter
+from dashboard_publish import DashboardPublisher
+from trend_records import dedupe_records, records_from_trends
+from incremental import BaselineIndex, IncrementalRun
+from checkpoint import CheckpointJournal, scrape_category_resumable
+from instrumentation import Instrumentation
+from memory_guard import MemoryGuard
+from snapshot_parse import SnapshotPool
+from trend_store import TrendStore
+from parallel_scrape import scrape_categories_parallel
+
+
+
+# Use this code snippet in your app.
+# If you need more information about configurations
+# or implementing the sample code, visit the AWS docs:
+# https://aws.amazon.com/developer/language/python/
+
+import boto3
+from botocore.exceptions import ClientError
+from functools import lru_cache
+
+@lru_cache(maxsize=None)  # one Secrets Manager call per process (and secret)
+def get_secret(secret_name: str = "tickertrends_login"):
+
+    region_name = "eu-north-1"
+
+    # Create a Secrets Manager client
+    session = boto3.session.Session()
+    client = session.client(
+        service_name='secretsmanager',
+        region_name=region_name
+    )
+
+    try:
+        get_secret_value_response = client.get_secret_value(
+            SecretId=secret_name
+        )
+    except ClientError as e:
+        # For a list of exceptions thrown, see
+        # https://docs.aws.amazon.com/secretsmanager/latest/apireference/API_GetSecretValue.html
+        raise e
+
+    secret = get_secret_value_response['SecretString']
+    return json.loads(secret)
+    # Your code goes here.
+
+
+
+CATEGORIES = [
+    "Arts & Culture","Automotive & Mobility","Business & Finance","Consumer Products",
+    "E-commerce & Retail","Education & Learning","Entertainment","Fashion & Beauty",
+    "Food & Beverage","Gaming & Virtual Worlds","Health & Wellness","Home & Living",
+    "Politics & Government","Real Estate & Housing","Science & Innovation",
+    "Social Media & Influencers","Sports","Technology","Travel & Hospitality",
+]
+
+MAX_PAGES = 11  # cap per category because of a personal account!
+GRANULARITY = "Daily"  # only daily
+PREFETCH_TABS = 3  # extra tabs loading pages 2..N by pageNo URL while page 1 is extracted
+WORKERS = 1  # > 1 scrapes categories in parallel browser contexts sharing one login
+BLOCK_ASSETS = True  # abort images, fonts, media and trackers (see routing_profile.py)
+CAPTURE_RESPONSES = False  # read rows from the grid's JSON responses (DOM stays the fallback)
+SNAPSHOT_WORKERS = 0  # > 0: pages are only snapshotted as HTML and parsed in this many processes
+SNAPSHOT_DIR = ""  # e.g. "output/snapshots" keeps the raw snapshots (re-parse with snapshot_parse.py)
+MEMORY_WATERMARK_MB = 0  # > 0 recycles the tab between categories above this RSS (see memory_guard.py)
+
+INCREMENTAL_BASELINE = ""  # previous run (JSON/NDJSON/diff, local or s3://) → write only the diff
+INCREMENTAL_KNOWN_PAGES = 2  # stop a category after this many fully known pages in a row
+CHECKPOINT_PATH = ".tickertrends_checkpoint.sqlite"  # "" disables checkpoint/resume
+DASHBOARD_PREFIX = "dashboard/"  # manifest + per-category shards for index.html; "" disables
+TREND_STORE_PATH = "tickertrends_history.sqlite"  # every run upserted for history queries (trend_store.py); "" disables
+PARQUET_ROOT = ""  # e.g. "s3://bucket/parquet" → typed Parquet partitioned by date= / category=
+METRICS_DIR = "output/metrics"  # per-step timing spans as JSON; "" disables the file
+TRACE_SLOW_MS = 0  # > 0 saves a Playwright trace of every step slower than this (to traces/)
+
+BASE_URL = "https://tickertrends.io/"
+LAUNCH_KWARGS = {"headless": True}
+SESSION_CACHE = SessionCache(ttl_seconds=6 * 3600)  # warm runs skip the login flow
+METRICS = Instrumentation(trace_slow_ms=TRACE_SLOW_MS or None)
+
+
+# ---------- SCRAPING ----------
+def login(page: Page, credentials: Optional[Dict[str, str]] = None) -> None:
+    """Logs in from the landing page with `credentials` (default: the ones from Secrets Manager)."""
+    page.goto(BASE_URL, wait_until="domcontentloaded", timeout=30_000)
+    MainPage(page).prepare_and_open_login()
+
+    login_page = LoginPage(page)
+    login_page.open_email_login()
+    tickertrends_credentials = credentials or get_secret()
+    login_page.fill_username(tickertrends_credentials["tickertrends_email"])
+    login_page.fill_password(tickertrends_credentials["tickertrends_password"])
+    login_page.submit_login()
+    if not login_page.wait_until_logged_in():
+        raise RuntimeError("Login modal still open after submitting — wrong credentials or a changed login flow?")
+
+
+def new_context(browser: Browser, routing: Optional[RoutingProfile], storage_state=None) -> BrowserContext:
+    """New context (optionally from a saved session) with the routing profile installed."""
+    context = browser.new_context(storage_state=storage_state)
+    if routing is not None:
+        routing.install(context)
+    return context
+
+
+def exploding_trends_page(page: Page) -> ExplodingTrendsPage:
+    """Page object for Exploding Trends, with network capture when enabled."""
+    capture = TrendCapture().attach(page) if CAPTURE_RESPONSES else None
+    return METRICS.wrap(ExplodingTrendsPage(page, capture=capture))
+
+
+def apply_filters(et: ExplodingTrendsPage) -> ExplodingTrendsPage:
+    """Sets the Tiktok / List / Daily filters."""
+    et.choose_data_type("Tiktok")
+    et.choose_view("List View")
+    et.choose_time_granularity(GRANULARITY)
+    return et
+
+
+def open_exploding_trends(page: Page) -> ExplodingTrendsPage:
+    """Opens Exploding Trends from the home page and sets the Tiktok / List / Daily filters."""
+    HomePage(page).open_exploding_trends()
+    return apply_filters(exploding_trends_page(page))
+
+
+def open_session(browser: Browser, routing: Optional[RoutingProfile]) -> Tuple[BrowserContext, ExplodingTrendsPage]:
+    """
+    Opens an authenticated Exploding Trends page with the filters set.
+
+    A fresh cached session goes straight to the page; the full login only runs on a
+    cache miss, after expiry, or when the site no longer accepts the cached cookies.
+    """
+    cached = SESSION_CACHE.load()
+    if cached:
+        context = new_context(browser, routing, storage_state=cached["storage_state"])
+        page = context.new_page()
+        page.goto(cached["url"], wait_until="domcontentloaded", timeout=30_000)
+        MainPage(page).close_subscription_popup_if_present()  # the newsletter overlay shows for returning visitors too
+        et = exploding_trends_page(page)
+        if et.is_open(timeout=10_000):
+            logging.info("Reusing cached session — login skipped")
+            return context, apply_filters(et)
+
+        logging.info("Cached session rejected — logging in again")
+        SESSION_CACHE.invalidate()
+        context.close()
+
+    context = new_context(browser, routing)
+    page = context.new_page()
+    with METRICS.span("login", context=context):
+        login(page)
+
+    HomePage(page).open_exploding_trends()
+    et = exploding_trends_page(page)
+    if et.is_open(timeout=20_000):
+        SESSION_CACHE.save(context, page.url)
+    return context, apply_filters(et)
+
+
+def open_exploding_trends_logged_in(page: Page) -> ExplodingTrendsPage:
+    """Same as `open_exploding_trends` for a fresh page in an already authenticated context."""
+    page.goto(BASE_URL, wait_until="domcontentloaded", timeout=30_000)
+    MainPage(page).close_subscription_popup_if_present()
+    return open_exploding_trends(page)
+
+
+def scrape_category(
+    et: ExplodingTrendsPage,
+    cat: str,
+    scrape_time: str,
+    incremental: Optional[IncrementalRun] = None,
+    journal: Optional[CheckpointJournal] = None,
+) -> List[Dict[str, str]]:
+    """Selects one category, walks its pages and unselects it again."""
+    stop_when = incremental.stop_condition(cat) if incremental is not None else None
+    if journal is not None:
+        # Page by page, skipping what an earlier (crashed) attempt already finished
+        trends = scrape_category_resumable(et, cat, journal, MAX_PAGES, stop_when=stop_when, on_retry=METRICS.note_retry)
+    else:
+        et.choose_category(cat)
+        try:
+            trends = et.extract_all_trends(
+                max_pages=MAX_PAGES, prefetch_tabs=PREFETCH_TABS, stop_when=stop_when, page_factory=exploding_trends_page
+            )
+        finally:
+            et.choose_category(cat)  # unselect, also after a failure: the page is reused for the next category
+
+    return trend_rows(trends, scrape_time, cat)
+
+
+def trend_rows(trends: List[Dict[str, str]], scrape_time: str, cat: str, granularity: str = GRANULARITY) -> List[Dict[str, str]]:
+    """Page-object trend dicts → normalized output rows, repeats across pages dropped."""
+    records = dedupe_records(records_from_trends(cat, trends))
+    if len(records) < len(trends):
+        logging.info(f"  {cat}: dropped {len(trends) - len(records)} duplicate trends")
+    return [r.as_row(scrape_time, granularity) for r in records]
+
+
+def timed_category(et: ExplodingTrendsPage, cat: str, *args: Any) -> List[Dict[str, str]]:
+    """`scrape_category` inside a "category" span (retries of its pages are counted there)."""
+    with METRICS.span("category", category=cat) as span:
+        rows = scrape_category(et, cat, *args)
+        span["rows"] = len(rows)
+        return rows
+
+
+def scrape_categories(
+    et: ExplodingTrendsPage,
+    scrape_time: str,
+    collect: Callable[[str, List[Dict[str, str]]], None],
+    incremental: Optional[IncrementalRun] = None,
+    journal: Optional[CheckpointJournal] = None,
+    guard: Optional[MemoryGuard] = None,
+    categories: Sequence[str] = (),
+) -> int:
+    """All categories (or `categories`) one after another on an open Exploding Trends page; returns the row count."""
+    total = 0
+    for cat in categories or CATEGORIES:
+        logging.info(f"Scraping category: {cat}")
+        try:
+            rows = timed_category(et, cat, scrape_time, incremental, journal)
+            collect(cat, rows)
+            total += len(rows)
+            logging.info(f"  → Collected {len(rows)} rows for {cat}")
+        except Exception as e:
+            logging.warning(f"  ⚠️ Skipped {cat} due to error: {e}")
+        if guard is not None:
+            try:
+                guard.check(et, cat)
+            except Exception as e:
+                logging.warning(f"  ⚠️ Recycling the tab failed, going on with the current one: {e}")
+    return total
+
+
+def scrape_tickertrends_daily(
+    playwright: Playwright,
+    workers: int = WORKERS,
+    sinks: Sequence[Any] = (),
+    incremental: Optional[IncrementalRun] = None,
+    journal: Optional[CheckpointJournal] = None,
+    scrape_time: str = "",
+):
+    """
+    Scrapes TickerTrends 'Daily' granularity for all categories and returns a list of dicts.
+    With `sinks` (TrendSink, ParquetWriter, IncrementalRun ...), every finished category
+    is streamed out instead and nothing is kept. `incremental` cuts pagination short
+    once pages match the baseline. With a checkpoint `journal`, a re-run resumes at
+    the first unfinished (category, page); pass its `scrape_time` along so resumed
+    rows keep the time they were scraped at.
+    """
+    browser = playwright.chromium.launch(**LAUNCH_KWARGS)
+    routing = RoutingProfile() if BLOCK_ASSETS else None
+
+    scrape_time = scrape_time or datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S %Z")
+    all_rows = []
+
+    def collect(cat: str, rows: List[Dict[str, str]]) -> None:
+        write_to_sinks(sinks, cat, rows)
+        if not sinks:
+            all_rows.extend(rows)
+
+    # --- Login (or cached session) & navigation ---
+    context, et = open_session(browser, routing)
+
+    if workers > 1:
+        # Parallel mode: hand the authenticated session to the workers and get out of the way
+        storage_state = context.storage_state()
+        browser.close()
+
+        results = scrape_categories_parallel(
+            storage_state,
+            CATEGORIES,
+            open_page=open_exploding_trends_logged_in,
+            scrape_category=lambda et, cat: timed_category(et, cat, scrape_time, incremental, journal),
+            workers=workers,
+            launch_kwargs=LAUNCH_KWARGS,
+            setup_context=routing.install if routing is not None else None,
+        )
+        if routing is not None:
+            routing.log_stats()
+        for cat in CATEGORIES:
+            if cat in results:
+                collect(cat, results.pop(cat))
+        return all_rows
+
+    guard = None
+    if MEMORY_WATERMARK_MB:
+        guard = MemoryGuard(MEMORY_WATERMARK_MB, setup_context=routing.install if routing is not None else None)
+    if SNAPSHOT_WORKERS and (incremental is not None or journal is not None):
+        logging.info("Snapshot parsing is off: checkpoint / incremental runs need every page parsed right away")
+    if SNAPSHOT_WORKERS and incremental is None and journal is None:
+        # The browser only snapshots and clicks on; the pool parses pages and categories meanwhile
+        keep_dir = f"{SNAPSHOT_DIR}/{datetime.now():%Y%m%d_%H%M%S}" if SNAPSHOT_DIR else None
+        with SnapshotPool(SNAPSHOT_WORKERS, keep_dir=keep_dir) as pool:
+            pool.scrape(
+                et, CATEGORIES, MAX_PAGES, lambda cat, trends: collect(cat, trend_rows(trends, scrape_time, cat)), guard
+            )
+    else:
+        scrape_categories(et, scrape_time, collect, incremental, journal, guard)
+
+    ready = Readiness.for_page(et.page)  # the guard may have moved to a fresh tab
+    logging.info(f"Readiness: {ready.wait_count()} waits took {ready.total_seconds():.1f}s")
+    if guard is not None:
+        guard.log_summary()
+    if routing is not None:
+        routing.log_stats()
+    browser.close()
+    return all_rows
+
+
+# ---------- SINKS ----------
+def make_sinks(bucket_name: str, run_name: str, s3_client: Any = None) -> Tuple[List[Any], Optional[IncrementalRun]]:
+    """Outputs of one run: NDJSON (+ dashboard), or only the diff in incremental mode; optional Parquet and history store."""
+    incremental = None
+    if INCREMENTAL_BASELINE:
+        # Only the churn against the previous run is stored, not the full list
+        out_dir = f"s3://{bucket_name}/data/" if bucket_name else "output/data/"
+        incremental = IncrementalRun(
+            BaselineIndex.load(INCREMENTAL_BASELINE, s3_client=s3_client),
+            consecutive_pages=INCREMENTAL_KNOWN_PAGES,
+            out_path=f"{out_dir}{run_name}_diff.json",
+            s3_client=s3_client,
+        )
+        sinks: List[Any] = [incremental]
+    else:
+        sinks = [TrendSink(name=run_name, bucket_name=bucket_name, prefix="data/", s3_client=s3_client)]
+        if DASHBOARD_PREFIX:
+            # Only full runs: an incremental run may have cut categories short
+            sinks.append(DashboardPublisher(run_name, bucket_name=bucket_name, prefix=DASHBOARD_PREFIX, s3_client=s3_client))
+    if PARQUET_ROOT:
+        sinks.append(ParquetWriter(PARQUET_ROOT, run_name=run_name))
+    if TREND_STORE_PATH:
+        sinks.append(TrendStore(TREND_STORE_PATH, run_id=run_name))
+    return sinks, incremental
+
+
+def write_to_sinks(sinks: Sequence[Any], cat: str, rows: List[Dict[str, str]]) -> None:
+    for sink in sinks:
+        with METRICS.span(f"upload.{type(sink).__name__}.write_category", category=cat) as span:
+            sink.write_category(cat, rows)
+            span["rows"] = len(rows)
+
+
+def finish_sinks(sinks: Sequence[Any], run_name: str) -> bool:
+    """Complete every sink (even after a crash half-way) and write the run's metrics; True if all closed."""
+    ok = True
+    for sink in sinks:
+        try:
+            with METRICS.span(f"upload.{type(sink).__name__}.close"):
+                sink.close()
+        except Exception as e:
+            ok = False
+            logging.error(f"❌ Failed to finish {type(sink).__name__}: {e}")
+            if isinstance(sink, TrendSink):
+                sink.abort()
+
+    METRICS.log_summary()
+    if METRICS_DIR:
+        METRICS.write(Path(METRICS_DIR) / f"{run_name}_metrics.json")
+    return ok
+
+
+# ---------- MAIN ----------
+def main(bucket_name: str):
+    """Runs the scrape and streams NDJSON per category to S3 (or ./output without a bucket)."""
+    logger = logging.getLogger(__name__)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    run_name = f"tickertrends_daily_{timestamp}"
+    scrape_time = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S %Z")
+
+    journal = None
+    if CHECKPOINT_PATH:
+        # An unfinished earlier run is picked up again (same name and scrape time); finished runs are cleared
+        journal = CheckpointJournal.resume(CHECKPOINT_PATH, run_id=run_name, scrape_time=scrape_time)
+        run_name, scrape_time = journal.run_id, journal.scrape_time
+
+    s3_client = boto3.client("s3", region_name="eu-north-1") if bucket_name else None
+    sinks, incremental = make_sinks(bucket_name, run_name, s3_client)
+
+    scraped = False
+    try:
+        with sync_playwright() as pw:
+            scrape_tickertrends_daily(pw, sinks=sinks, incremental=incremental, journal=journal, scrape_time=scrape_time)
+        scraped = True
+    finally:
+        finished = finish_sinks(sinks, run_name)
+        if journal is not None:
+            if scraped and finished:
+                journal.clear()
+            journal.close()
+
+    if isinstance(sinks[0], TrendSink) and not sinks[0].total_rows:
+        logger.warning("No data collected — nothing saved.")
+
+
+# ---------- ENTRY POINT ----------
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+
     main(bucket_name="")
\ No newline at end of file
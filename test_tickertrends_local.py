@@ -1,117 +1,174 @@
-# Scraping & Saving TickerTrends Data (per-category JSON → S3)
-import json
-import logging
-import re
-import gc
-from datetime import datetime, timezone
-from pathlib import Path
-from playwright.sync_api import Playwright, sync_playwright
-
-from mainpage_tickertrends import MainPage
-from loginpage_tickertrends import LoginPage
-from homepage_tickertrends import HomePage
-from exploding_trends_page import ExplodingTrendsPage
-
-# ---------- Config ----------
-CATEGORIES = [
-    "Consumer Products", "Arts & Culture","Automotive & Mobility","Business & Finance",
-    "E-commerce & Retail","Education & Learning","Entertainment","Fashion & Beauty",
-    "Food & Beverage","Gaming & Virtual Worlds","Health & Wellness","Home & Living",
-    "Politics & Government","Real Estate & Housing","Science & Innovation",
-    "Social Media & Influencers","Sports","Technology","Travel & Hospitality",
-]
-MAX_PAGES = 11
-GRANULARITY = "Daily"
-S3_REGION = "eu-north-1"
-S3_PREFIX = "data/"  # S3 folder prefix (= "directory")
-
-def _slug(s: str) -> str:
-    # keep hyphens between words, replace everything else with '-'
-    return re.sub(r"[^a-z0-9]+", "-", s.lower()).strip("-")
-
-# ---------- Scrape ----------
-def scrape_tickertrends_daily(playwright: Playwright, bucket_name: str):
-    """Scrape each category and upload one JSON per category to S3."""
-    if not bucket_name:
-        raise ValueError("bucket_name must be provided")
-
-
-    browser = playwright.chromium.launch(headless=False,
-                                         args=[
-                                             "--disable-dev-shm-usage",  # important on small Linux instances
-                                         ],
-                                         )
-    context = browser.new_context()
-    page = context.new_page()
-
-    # one run timestamp used across all category files
-    run_ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    scrape_time = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S %Z")
-
-    # --- Login & navigation ---
-    page.goto("https://tickertrends.io/", wait_until="domcontentloaded", timeout=30_000)
-    MainPage(page).prepare_and_open_login()
-
-    login_page = LoginPage(page)
-    login_page.open_email_login()
-    login_page.fill_username("")
-    login_page.fill_password("")
-    login_page.submit_login()
-
-    page.wait_for_timeout(6_000)
-    HomePage(page).open_exploding_trends()
-
-    et = ExplodingTrendsPage(page)
-    et.choose_data_type("Tiktok")
-    et.choose_view("List View")
-    et.choose_time_granularity(GRANULARITY)
-
-    for cat in CATEGORIES:
-        logging.info(f"Scraping category: {cat}")
-        try:
-            page.wait_for_timeout(6_000)
-            et.choose_category(cat)
-            print(f"Cat chosen")
-            page.wait_for_timeout(300)
-
-            trends = et.extract_all_trends(max_pages=MAX_PAGES)
-            et.choose_category(cat)
-            # build per-category rows
-            rows = [{
-                "scrape_time": scrape_time,
-                "granularity": GRANULARITY,
-                "category": cat,
-                "name": t.get("name", ""),
-                "sign": t.get("sign", ""),
-                "value": t.get("value", ""),
-                "raw_growth": t.get("raw_growth", ""),
-                "ticker_symbol": t.get("ticker_symbol", ""),
-                "ticker_percent": t.get("ticker_percent", "")
-            } for t in trends]
-
-            # filename format: tickertrends_daily_<category>_<timestamp>.json
-            key = f"{S3_PREFIX}tickertrends_daily_{_slug(cat)}_{run_ts}.json"
-
-
-        except Exception as e:
-            logging.warning(f"⚠️ Skipped '{cat}' due to error: {e}")
-        finally:
-            # free memory between categories
-            try: del rows
-            except Exception: pass
-            try: del trends
-            except Exception: pass
-            gc.collect()
-
-    browser.close()
-
-# ---------- Main ----------
-def main(bucket_name: str):
-    with sync_playwright() as pw:
-        scrape_tickertrends_daily(pw, bucket_name=bucket_name)
-
-# ---------- Entry ----------
-if __name__ == "__main__":
-    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
-    # 👇 pass your bucket name here
-    main(bucket_name="")
+# Scraping & Saving TickerTrends Data (per-category JSON → S3)
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+import boto3
+from playwright.sync_api import Page, Playwright, sync_playwright
+
+from mainpage_tickertrends import MainPage
+from loginpage_tickertrends import LoginPage
+from homepage_tickertrends import HomePage
+from exploding_trends_page import ExplodingTrendsPage
+from memory_guard import MemoryGuard
+from parallel_scrape import scrape_categories_parallel
+from readiness import Readiness
+from routing_profile import RoutingProfile
+from trend_sink import TrendSink
+from trend_records import dedupe_records, records_from_trends
+from trend_values import slug
+
+# ---------- Config ----------
+CATEGORIES = [
+    "Consumer Products", "Arts & Culture","Automotive & Mobility","Business & Finance",
+    "E-commerce & Retail","Education & Learning","Entertainment","Fashion & Beauty",
+    "Food & Beverage","Gaming & Virtual Worlds","Health & Wellness","Home & Living",
+    "Politics & Government","Real Estate & Housing","Science & Innovation",
+    "Social Media & Influencers","Sports","Technology","Travel & Hospitality",
+]
+MAX_PAGES = 11
+GRANULARITY = "Daily"
+S3_REGION = "eu-north-1"
+S3_PREFIX = "data/"  # S3 folder prefix (= "directory")
+WORKERS = 1  # > 1 scrapes categories in parallel browser contexts sharing one login
+BLOCK_ASSETS = True  # abort images, fonts, media and trackers (see routing_profile.py)
+MEMORY_WATERMARK_MB = 1200  # recycle the page above this RSS (python + browser); 0 disables
+RECYCLE_MODE = "page"  # "page": fresh tab, "context": fresh context from the same session
+LAUNCH_KWARGS = {
+    "headless": False,
+    "args": [
+        "--disable-dev-shm-usage",  # important on small Linux instances
+    ],
+}
+
+def _open_exploding_trends(page: Page) -> ExplodingTrendsPage:
+    """Open Exploding Trends from the home page and set the Tiktok / List / Daily filters."""
+    HomePage(page).open_exploding_trends()
+
+    et = ExplodingTrendsPage(page)
+    et.choose_data_type("Tiktok")
+    et.choose_view("List View")
+    et.choose_time_granularity(GRANULARITY)
+    return et
+
+def _open_exploding_trends_logged_in(page: Page) -> ExplodingTrendsPage:
+    """Same as `_open_exploding_trends` for a fresh page in an authenticated context."""
+    page.goto("https://tickertrends.io/", wait_until="domcontentloaded", timeout=30_000)
+    MainPage(page).close_subscription_popup_if_present()
+    return _open_exploding_trends(page)
+
+def _scrape_category(
+    et: ExplodingTrendsPage, cat: str, scrape_time: str, guard: Optional[MemoryGuard] = None
+) -> List[Dict[str, str]]:
+    """Select one category, walk its pages, unselect it and build the per-category rows."""
+    et.choose_category(cat)
+    try:
+        # With a guard, memory is checked before every 'Next' (the tab may be swapped for a fresh one)
+        between_pages = (lambda: guard.check(et, cat)) if guard is not None else None
+        trends = et.extract_all_trends(max_pages=MAX_PAGES, between_pages=between_pages)
+    finally:
+        et.choose_category(cat)  # unselect, also after a failure: the page is reused for the next category
+    # build per-category rows (normalized, repeats across pages dropped)
+    records = dedupe_records(records_from_trends(cat, trends))
+    return [r.as_row(scrape_time, GRANULARITY) for r in records]
+
+# ---------- Scrape ----------
+def scrape_tickertrends_daily(playwright: Playwright, bucket_name: str, workers: int = WORKERS):
+    """Scrape each category and upload one NDJSON object per category to S3 as soon as it is done."""
+    if not bucket_name:
+        raise ValueError("bucket_name must be provided")
+
+
+    browser = playwright.chromium.launch(**LAUNCH_KWARGS)
+    context = browser.new_context()
+    routing = RoutingProfile() if BLOCK_ASSETS else None
+    if routing is not None:
+        routing.install(context)
+    page = context.new_page()
+
+    # one run timestamp used across all category files
+    run_ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    scrape_time = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S %Z")
+
+    sink = TrendSink(
+        name=f"tickertrends_daily_{run_ts}",
+        bucket_name=bucket_name,
+        prefix=S3_PREFIX,
+        s3_client=boto3.client("s3", region_name=S3_REGION),
+        per_category=True,
+        # filename format: tickertrends_daily_<category>_<timestamp>.ndjson
+        key_for=lambda cat: f"{S3_PREFIX}tickertrends_daily_{slug(cat)}_{run_ts}.ndjson",
+    )
+
+    # --- Login & navigation ---
+    page.goto("https://tickertrends.io/", wait_until="domcontentloaded", timeout=30_000)
+    MainPage(page).prepare_and_open_login()
+
+    login_page = LoginPage(page)
+    login_page.open_email_login()
+    login_page.fill_username("")
+    login_page.fill_password("")
+    login_page.submit_login()
+    if not login_page.wait_until_logged_in():
+        raise RuntimeError("Login modal still open after submitting — wrong credentials or a changed login flow?")
+
+    if workers > 1:
+        # Parallel mode: every worker gets its own context from the saved login
+        storage_state = context.storage_state()
+        browser.close()
+
+        results = scrape_categories_parallel(
+            storage_state,
+            CATEGORIES,
+            open_page=_open_exploding_trends_logged_in,
+            scrape_category=lambda et, cat: _scrape_category(et, cat, scrape_time),
+            workers=workers,
+            launch_kwargs=LAUNCH_KWARGS,
+            setup_context=routing.install if routing is not None else None,
+        )
+        for cat in CATEGORIES:
+            if cat in results:
+                sink.write_category(cat, results.pop(cat))
+        sink.close()
+        return
+
+    et = _open_exploding_trends(page)
+    guard = None
+    if MEMORY_WATERMARK_MB:
+        guard = MemoryGuard(
+            MEMORY_WATERMARK_MB,
+            mode=RECYCLE_MODE,
+            setup_context=routing.install if routing is not None else None,
+        )
+
+    for cat in CATEGORIES:
+        logging.info(f"Scraping category: {cat}")
+        try:
+            sink.write_category(cat, _scrape_category(et, cat, scrape_time, guard))
+        except Exception as e:
+            logging.warning(f"⚠️ Skipped '{cat}' due to error: {e}")
+        if guard is not None:
+            try:
+                guard.check(et, cat)
+            except Exception as e:
+                logging.warning(f"⚠️ Recycling the tab failed, going on with the current one: {e}")
+
+    # et.page, not page: the guard may have moved to a fresh tab
+    ready = Readiness.for_page(et.page)
+    logging.info(f"Readiness: {ready.wait_count()} waits took {ready.total_seconds():.1f}s")
+    if guard is not None:
+        guard.log_summary()
+    if routing is not None:
+        routing.log_stats()
+    browser.close()
+    sink.close()
+
+# ---------- Main ----------
+def main(bucket_name: str):
+    with sync_playwright() as pw:
+        scrape_tickertrends_daily(pw, bucket_name=bucket_name)
+
+# ---------- Entry ----------
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    # 👇 pass your bucket name here
+    main(bucket_name="")
@@ -0,0 +1,138 @@
+"""
+TrendCapture against the mock site's /api/trends payloads, offline (no browser):
+
+    python -m pytest test_trend_capture.py
+"""
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from mock_tickertrends_site import MockSite
+from trend_capture import TrendCapture, payload_to_trends
+
+API_URL = "http://127.0.0.1:8765/api/trends?dataType=Tiktok&sectors=Sports&pageNo={}"
+
+
+def _response(payload, url=API_URL.format(1), ok=True, resource_type="fetch"):
+    return SimpleNamespace(ok=ok, url=url, request=SimpleNamespace(resource_type=resource_type), json=lambda: payload)
+
+
+def _not_json():
+    raise ValueError("not JSON")
+
+
+class FakePage:
+    """The bits of a Playwright page TrendCapture uses; `respond` plays a response event."""
+
+    def __init__(self, pending=()):
+        self.listeners = []
+        self.pending = list(pending)  # what wait_for_event hands out next
+
+    def on(self, event, handler):
+        assert event == "response"
+        self.listeners.append(handler)
+
+    def remove_listener(self, event, handler):
+        self.listeners.remove(handler)
+
+    def respond(self, response):
+        for handler in list(self.listeners):
+            handler(response)
+
+    def wait_for_event(self, event, predicate, timeout):
+        for response in self.pending:
+            if predicate(response):
+                self.pending.remove(response)
+                return response
+        raise PlaywrightTimeoutError(f"no {event} within {timeout} ms")
+
+
+def _payload(page_no=1, sectors="Sports", site=None):
+    site = site or MockSite(cards_per_page=24, pages=3)
+    return site.trends_payload({"dataType": ["Tiktok"], "sectors": [sectors], "pageNo": [str(page_no)]})
+
+
+def test_payload_to_trends_matches_the_mock_items():
+    payload = _payload()
+    trends = payload_to_trends(payload)
+
+    assert len(trends) == 24
+    for item, trend in zip(payload["trends"], trends):
+        assert trend["name"] == item["name"]
+        growth = item["growth"]
+        assert trend["sign"] == ("-" if growth < 0 else "+")
+        assert trend["value"] == str(abs(growth))
+        assert trend["raw_growth"] == f"{'-' if growth < 0 else '+'}{abs(growth)}%"
+        ticker = item["tickers"][0] if item["tickers"] else {}
+        assert trend["ticker_symbol"] == ticker.get("symbol", "")
+        assert trend["ticker_percent"] == (str(ticker["percent"]) if ticker else "")
+
+
+def test_newest_payload_wins_and_is_taken_once():
+    page = FakePage()
+    capture = TrendCapture().attach(page)
+    page.respond(_response(_payload(1)))
+    page.respond(_response(_payload(2), url=API_URL.format(2)))
+
+    assert capture.take_rows() == payload_to_trends(_payload(2))
+    assert capture.take_rows(timeout=10) is None  # nothing new arrived
+
+
+def test_waits_for_a_payload_that_has_not_arrived_yet():
+    page = FakePage(pending=[_response(_payload(3))])
+    capture = TrendCapture().attach(page)
+
+    assert capture.take_rows() == payload_to_trends(_payload(3))
+
+
+def test_ignores_other_responses():
+    page = FakePage()
+    capture = TrendCapture().attach(page)
+    page.respond(_response(_payload(), url="http://127.0.0.1:8765/api/login"))
+    page.respond(_response(_payload(), ok=False))
+    page.respond(_response(_payload(), resource_type="document"))
+
+    assert capture.take_rows(timeout=10) is None
+
+
+def test_clear_and_detach_drop_pending_payloads():
+    page = FakePage()
+    capture = TrendCapture().attach(page)
+    page.respond(_response(_payload(1)))
+    capture.clear()
+    assert capture.take_rows(timeout=10) is None
+
+    capture.detach()
+    assert page.listeners == []
+    page.respond(_response(_payload(1)))
+    assert capture.take_rows(timeout=10) is None
+
+
+def test_empty_or_broken_payload_falls_back_to_the_dom():
+    page = FakePage()
+    capture = TrendCapture().attach(page)
+    page.respond(_response(_payload(4)))  # past the last page: no trends
+    assert capture.take_rows() is None
+
+    broken = _response(None)
+    broken.json = _not_json
+    page.respond(broken)
+    assert capture.take_rows() is None
+
+
+def test_recorded_payloads_replay_through_the_mock(tmp_path):
+    page = FakePage()
+    capture = TrendCapture(record_dir=tmp_path).attach(page)
+    expected = []
+    for page_no in (1, 2, 3):
+        page.respond(_response(_payload(page_no), url=API_URL.format(page_no)))
+        expected.append(capture.take_rows())
+
+    replay = MockSite(payload_dir=str(tmp_path))
+    for page_no, rows in enumerate(expected, start=1):
+        assert payload_to_trends(replay.trends_payload({"pageNo": [str(page_no)]})) == rows
+    assert replay.trends_payload({"pageNo": ["4"]})["trends"] == []
@@ -0,0 +1,81 @@
+"""
+normalize_batch (NumPy and pure-Python paths) and dedupe_records:
+
+    python -m pytest test_trend_records.py
+"""
+import pytest
+
+import trend_records
+from trend_records import TrendRecord, dedupe_records, normalize_batch, records_from_trends
+
+TRENDS = [
+    {"name": "a", "sign": "+", "value": "4454", "ticker_percent": "83"},
+    {"name": "b", "sign": "-", "value": "12.5", "ticker_percent": "83%"},
+    {"name": "c", "sign": "+-", "value": "1.2e5", "ticker_percent": ""},
+    {"name": "d", "sign": "+", "value": "1,234", "ticker_percent": "<1%"},
+    {"name": "e", "sign": "", "value": "", "ticker_percent": None},
+    {"name": "f"},
+    {"name": "g", "sign": "+", "value": "n/a", "ticker_percent": "7"},
+]
+
+EXPECTED = {
+    "value": [4454.0, 12.5, 120000.0, 1234.0, None, None, None],
+    "growth": [4454.0, -12.5, -120000.0, 1234.0, None, None, None],
+    "ticker_percent": [83.0, 83.0, None, None, None, None, 7.0],
+}
+
+
+def _pure(trends):
+    np, trend_records.np = trend_records.np, None
+    try:
+        return normalize_batch(trends)
+    finally:
+        trend_records.np = np
+
+
+def test_pure_python_path():
+    assert _pure(TRENDS) == EXPECTED
+
+
+def test_numpy_path_matches_pure_python():
+    pytest.importorskip("numpy")
+    result = normalize_batch(TRENDS)
+    assert result == EXPECTED
+    assert all(type(v) is float for col in result.values() for v in col if v is not None)
+
+    clean = [t for t in TRENDS if t.get("value") != "n/a"]  # no garbage: the fully vectorized branch
+    assert normalize_batch(clean) == _pure(clean)
+
+
+def test_empty_batch():
+    assert normalize_batch([]) == _pure([]) == {"value": [], "growth": [], "ticker_percent": []}
+
+
+def test_records_keep_the_card_texts():
+    [record] = records_from_trends("Sports", [
+        {"name": "a", "sign": "+-", "value": "12.50", "raw_growth": "+-12.50%", "ticker_symbol": "NKE", "ticker_percent": "<1%"},
+    ])
+    assert (record.value, record.growth, record.ticker_percent) == (12.5, -12.5, None)
+    row = record.as_row("2025-01-01 00:00:00 UTC", "Daily")
+    assert (row["value"], row["raw_growth"], row["ticker_percent"]) == ("12.50", "+-12.50%", "<1%")
+
+
+def test_dedupe_keeps_the_first_copy_per_category_name_and_ticker():
+    def rec(category, name, ticker, growth):
+        return TrendRecord(category, name, "+", str(growth), f"+{growth}%", ticker, "", growth=float(growth))
+
+    records = [
+        rec("Sports", "a", "NKE", 10),
+        rec("Sports", "b", "", 20),
+        rec("Sports", "a", "NKE", 99),  # repeat from a later page
+        rec("Sports", "a", "ADDYY", 30),  # other ticker: a different trend row
+        rec("Health", "a", "NKE", 40),  # other category
+        rec("Sports", "b", "", 50),
+    ]
+    kept = dedupe_records(records)
+    assert [(r.category, r.name, r.ticker_symbol, r.growth) for r in kept] == [
+        ("Sports", "a", "NKE", 10.0),
+        ("Sports", "b", "", 20.0),
+        ("Sports", "a", "ADDYY", 30.0),
+        ("Health", "a", "NKE", 40.0),
+    ]
@@ -0,0 +1,139 @@
+"""
+TrendSink against a moto S3 stand-in (no AWS access needed):
+
+    pip install boto3 "moto[s3]" pytest
+    python -m pytest test_trend_sink.py
+"""
+import json
+
+import pytest
+
+boto3 = pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+
+from trend_sink import MIN_PART_SIZE, TrendSink, ndjson_bytes
+
+BUCKET = "tickertrends-test"
+
+
+@pytest.fixture
+def s3():
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+def _rows(category, n, pad=0):
+    return [{"category": category, "name": f"trend {i}", "pad": "x" * pad} for i in range(n)]
+
+
+def _keys(s3):
+    return sorted(o["Key"] for o in s3.list_objects_v2(Bucket=BUCKET).get("Contents", []))
+
+
+def _ndjson(s3, key):
+    body = s3.get_object(Bucket=BUCKET, Key=key)["Body"].read().decode("utf-8")
+    return [json.loads(line) for line in body.splitlines()]
+
+
+def test_whole_run_lands_per_category_and_is_merged_on_close(s3):
+    sink = TrendSink("run", bucket_name=BUCKET, s3_client=s3)
+    sink.write_category("Sports", _rows("Sports", 3))
+    assert _ndjson(s3, "data/run.ndjson.chunks/0000_sports.ndjson") == _rows("Sports", 3)  # landed before close
+    sink.write_category("Real Estate", _rows("Real Estate", 2))
+
+    manifest = sink.close()
+
+    assert _keys(s3) == ["data/run.ndjson", "data/run_manifest.json"]
+    assert _ndjson(s3, "data/run.ndjson") == _rows("Sports", 3) + _rows("Real Estate", 2)
+    assert manifest["total_rows"] == 5
+    assert manifest["categories"] == {"Sports": 3, "Real Estate": 2}
+    assert json.loads(s3.get_object(Bucket=BUCKET, Key="data/run_manifest.json")["Body"].read()) == manifest
+
+
+def _count_reads(s3, monkeypatch):
+    reads = []
+    get_object = s3.get_object
+
+    def counting(**kwargs):
+        reads.append(kwargs)
+        return get_object(**kwargs)
+
+    monkeypatch.setattr(s3, "get_object", counting)
+    return reads
+
+
+def test_large_run_copies_chunks_server_side(s3, monkeypatch):
+    sink = TrendSink("big", bucket_name=BUCKET, s3_client=s3)
+    rows = _rows("Technology", 60, pad=200_000)  # two ~6 MB chunks → one copied part each
+    sink.write_category("Technology", rows[:30])
+    sink.write_category("Technology", rows[30:])
+    reads = _count_reads(s3, monkeypatch)
+
+    manifest = sink.close()
+
+    assert reads == []
+    assert manifest["objects"][0]["parts"] == 2
+    assert manifest["objects"][0]["bytes"] > 2 * MIN_PART_SIZE
+    assert _ndjson(s3, "data/big.ndjson") == rows
+
+
+def test_small_chunks_are_buffered_into_parts(s3, monkeypatch):
+    sink = TrendSink("mixed", bucket_name=BUCKET, s3_client=s3)
+    small = _rows("Sports", 10, pad=200_000)  # ~2 MB, read back
+    large = _rows("Technology", 60, pad=200_000)  # ~12 MB: head completes the part, the rest is copied
+    tail = _rows("Health", 2)
+    sink.write_category("Sports", small)
+    sink.write_category("Technology", large)
+    sink.write_category("Health", tail)
+    reads = _count_reads(s3, monkeypatch)
+
+    manifest = sink.close()
+
+    assert [r.get("Range") for r in reads] == [None, f"bytes=0-{MIN_PART_SIZE - len(ndjson_bytes(small)) - 1}", None]
+    assert manifest["objects"][0]["parts"] == 3
+    assert _ndjson(s3, "data/mixed.ndjson") == small + large + tail
+
+
+def test_per_category_objects(s3):
+    sink = TrendSink("run", bucket_name=BUCKET, s3_client=s3, per_category=True)
+    sink.write_category("Sports", _rows("Sports", 2))
+    assert _keys(s3) == ["data/run_sports.ndjson"]
+    sink.write_category("Health", _rows("Health", 1))
+
+    manifest = sink.close()
+
+    assert [o["key"] for o in manifest["objects"]] == ["data/run_sports.ndjson", "data/run_health.ndjson"]
+    assert _ndjson(s3, "data/run_health.ndjson") == _rows("Health", 1)
+
+
+def test_abort_after_failed_close_drops_the_upload_and_keeps_the_chunks(s3, monkeypatch):
+    sink = TrendSink("run", bucket_name=BUCKET, s3_client=s3)
+    sink.write_category("Sports", _rows("Sports", 40, pad=200_000))
+
+    def fail(**kwargs):
+        raise RuntimeError("completion failed")
+
+    monkeypatch.setattr(s3, "complete_multipart_upload", fail)
+    with pytest.raises(RuntimeError):
+        sink.close()
+    assert not sink.closed
+    assert s3.list_multipart_uploads(Bucket=BUCKET).get("Uploads")
+
+    sink.abort()
+
+    assert sink.closed
+    assert not s3.list_multipart_uploads(Bucket=BUCKET).get("Uploads")
+    assert _keys(s3) == ["data/run.ndjson.chunks/0000_sports.ndjson"]
+
+
+def test_local_files_without_bucket(tmp_path):
+    sink = TrendSink("run", local_dir=str(tmp_path))
+    sink.write_category("Sports", _rows("Sports", 2))
+    assert len((tmp_path / "data/run.ndjson").read_text(encoding="utf-8").splitlines()) == 2  # flushed already
+
+    manifest = sink.close()
+
+    assert manifest["bucket"] is None
+    assert (tmp_path / "data/run_manifest.json").exists()
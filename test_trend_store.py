@@ -0,0 +1,127 @@
+"""
+TrendStore upserts and queries on a temp SQLite file:
+
+    python -m pytest test_trend_store.py
+"""
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from trend_store import TIME_FORMAT, TrendStore
+from trend_values import SCRAPE_TIME_FORMAT
+
+
+def _when(days_ago: float) -> str:
+    t = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(days=days_ago)
+    return t.strftime(SCRAPE_TIME_FORMAT)
+
+
+def _row(scrape_time, category, name, sign="+", value="100", ticker="", pct=""):
+    return {
+        "scrape_time": scrape_time,
+        "granularity": "Daily",
+        "category": category,
+        "name": name,
+        "sign": sign,
+        "value": value,
+        "raw_growth": f"{sign}{value}%",
+        "ticker_symbol": ticker,
+        "ticker_percent": pct,
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = TrendStore(tmp_path / "history.sqlite", run_id="run")
+    yield s
+    s.db.close()
+
+
+@pytest.fixture
+def history(store):
+    old, last_week, yesterday = _when(60), _when(6), _when(1)
+    store.upsert([
+        _row(old, "Technology", "Matcha Latte", value="9000", ticker="SBUX", pct="80"),
+        _row(last_week, "Technology", "Matcha Latte", value="300", ticker="SBUX", pct="70"),
+        _row(last_week, "Technology", "Robot Vacuum", value="50", ticker="IRBT", pct="40"),
+        _row(last_week, "Sports", "Pickleball", sign="+-", value="20", ticker="SBUX", pct="10"),
+        _row(yesterday, "Technology", "Matcha Latte", value="500", ticker="SBUX", pct="90"),
+        _row(yesterday, "Technology", "Robot Vacuum", value="80", ticker=""),
+    ])
+    return store
+
+
+def test_upsert_ranks_and_parses(store):
+    t = _when(1)
+    store.upsert([
+        _row(t, "Sports", "A", value="1.5e3", ticker="NKE", pct="83%"),
+        _row(t, "Sports", "B", sign="+-", value="1,200"),
+        _row(t, "Health", "C"),
+    ])
+    rows = [dict(r) for r in store.db.execute("SELECT category, name, rank, growth, ticker_percent FROM trends ORDER BY name")]
+    assert rows == [
+        {"category": "Sports", "name": "A", "rank": 1, "growth": 1500.0, "ticker_percent": 83.0},
+        {"category": "Sports", "name": "B", "rank": 2, "growth": -1200.0, "ticker_percent": None},
+        {"category": "Health", "name": "C", "rank": 1, "growth": 100.0, "ticker_percent": None},
+    ]
+
+
+def test_upsert_same_key_updates(store):
+    t = _when(1)
+    store.upsert([_row(t, "Sports", "A", value="10")])
+    store.upsert([_row(t, "Sports", "A", value="20")], run_id="rerun")
+    assert [tuple(r) for r in store.db.execute("SELECT growth, run_id FROM trends")] == [(20.0, "rerun")]
+
+
+def test_series_oldest_first_within_the_window(history):
+    series = history.series("Matcha Latte", days=30)
+    assert [r["growth"] for r in series] == [300.0, 500.0]
+    assert len(history.series("Matcha Latte")) == 3  # no window
+    assert history.series("Matcha Latte", category="Sports", days=30) == []
+
+
+def test_top_growth(history):
+    top = history.top_growth(days=7)
+    assert [(r["name"], r["max_growth"], r["seen"]) for r in top] == [
+        ("Matcha Latte", 500.0, 2), ("Robot Vacuum", 80.0, 2), ("Pickleball", -20.0, 1),
+    ]
+    assert [r["name"] for r in history.top_growth(category="Sports", days=7)] == ["Pickleball"]
+    assert len(history.top_growth(days=7, limit=1)) == 1
+
+
+def test_ticker_queries(history):
+    occurrence = history.ticker_occurrence(days=30)
+    assert [(r["ticker_symbol"], r["appearances"], r["trends"], r["runs"]) for r in occurrence] == [
+        ("SBUX", 3, 2, 2), ("IRBT", 1, 1, 1),
+    ]
+    assert occurrence[0]["avg_percent"] == round((70 + 10 + 90) / 3, 1)
+    categories = history.ticker_categories("SBUX", days=30)
+    assert sorted((r["category"], r["trends"], r["appearances"]) for r in categories) == [
+        ("Sports", 1, 1), ("Technology", 1, 2),
+    ]
+
+
+def test_sink_interface_records_the_run(store):
+    t = _when(1)
+    store.write_category("Sports", [_row(t, "Sports", "A"), _row(t, "Sports", "B")])
+    store.write_category("Health", [])
+    db_path = store.path
+
+    assert store.close() == {"path": str(db_path), "rows": 2}
+
+    reopened = TrendStore(db_path)
+    run = dict(reopened.db.execute("SELECT run_id, scrape_time, rows FROM runs").fetchone())
+    assert run == {"run_id": "run", "scrape_time": t, "rows": 2}
+    reopened.db.close()
+
+
+def test_load_backfills_a_run_file(store, tmp_path):
+    t = _when(2)
+    path = tmp_path / "tickertrends_daily_1.ndjson"
+    path.write_text("\n".join(json.dumps(_row(t, "Sports", n)) for n in "ABC"), encoding="utf-8")
+
+    assert store.load(str(path)) == 3
+    assert store.db.execute("SELECT rows FROM runs WHERE run_id = ?", (path.stem,)).fetchone()[0] == 3
+    stored = store.db.execute("SELECT DISTINCT scrape_time FROM trends").fetchone()[0]
+    assert stored == datetime.strptime(t, SCRAPE_TIME_FORMAT).strftime(TIME_FORMAT)
@@ -0,0 +1,121 @@
+"""
+SQLiteQueue leases, retries and the coordinator's merge, on a temp file (no browser):
+
+    python -m pytest test_work_queue.py
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from work_queue import SQLiteQueue, merge_run, plan_units
+
+RUN = "run"
+EXPIRED = -1  # lease_seconds that is over as soon as it is granted
+
+
+@pytest.fixture
+def queue(tmp_path):
+    q = SQLiteQueue(tmp_path / "queue.sqlite", max_attempts=2)
+    yield q
+    q.close()
+
+
+def _create(queue, categories=("Sports",), pages=4, pages_per_unit=2, data_types=("Tiktok",)):
+    units = plan_units(RUN, data_types, ["Daily"], categories, pages, pages_per_unit)
+    meta = {"data_types": list(data_types), "granularities": ["Daily"], "scrape_time": "2025-01-01 00:00:00 UTC"}
+    queue.create_run(RUN, units, meta)
+    return units
+
+
+def _trends(unit):
+    return [{"name": f"{unit.category} p{p}"} for p in range(unit.first_page, unit.last_page + 1)]
+
+
+def test_expired_lease_is_claimed_again(queue):
+    first, second = _create(queue)
+
+    assert queue.claim(RUN, "a", EXPIRED) == first
+    assert queue.claim(RUN, "b", 300) == first  # a's lease ran out
+    assert not queue.heartbeat(first, "a", 300)
+    assert queue.heartbeat(first, "b", 300)
+    assert queue.claim(RUN, "a", 300) == second
+    assert queue.claim(RUN, "c", 300) is None
+    assert queue.progress(RUN) == {"pending": 0, "leased": 2, "done": 0, "failed": 0}
+
+
+def test_failed_unit_is_retried_up_to_max_attempts(queue):
+    unit, _ = _create(queue)
+
+    assert queue.claim(RUN, "a", 300) == unit
+    queue.fail(unit, "a", "RuntimeError: boom")
+    assert queue.claim(RUN, "b", 300) == unit  # back to pending
+    queue.fail(unit, "b", "RuntimeError: boom again")
+
+    assert queue.progress(RUN)["failed"] == 1
+    [failure] = queue.failures(RUN)
+    assert (failure["seq"], failure["attempts"], failure["error"]) == (unit.seq, 2, "RuntimeError: boom again")
+    assert queue.claim(RUN, "c", 300).seq == 1  # the failed unit is not handed out again
+
+
+def test_expired_lease_on_the_last_attempt_fails_the_unit(queue):
+    unit, _ = _create(queue)
+    queue.claim(RUN, "a", EXPIRED)
+    queue.claim(RUN, "b", EXPIRED)
+
+    assert queue.claim(RUN, "c", 300).seq == 1
+    assert [f["error"] for f in queue.failures(RUN)] == ["lease expired"]
+
+
+def test_late_complete_after_a_re_lease(queue):
+    unit, _ = _create(queue)
+    queue.claim(RUN, "a", EXPIRED)
+    queue.claim(RUN, "b", 300)
+
+    assert queue.complete(unit, "a", _trends(unit))  # the late result still counts
+    assert not queue.complete(unit, "b", [{"name": "other"}])  # the unit is already done
+    queue.fail(unit, "b", "too late")  # no effect on a finished unit
+
+    assert queue.progress(RUN)["done"] == 1
+    assert [trends for _, trends in queue.results(RUN)] == [_trends(unit)]
+
+
+def test_merge_run_keeps_page_order_and_marks_cut_off_groups(queue):
+    units = _create(queue, categories=("Sports", "Health"))
+    sports_1, sports_2, health_1, health_2 = units
+    for unit in (health_1, sports_2, sports_1):  # finished out of order
+        assert queue.claim(RUN, "w", 300) is not None
+        queue.complete(unit, "w", _trends(unit))
+    queue.claim(RUN, "w", 300)
+    queue.fail(health_2, "w", "TimeoutError")
+    queue.claim(RUN, "w", 300)
+    queue.fail(health_2, "w", "TimeoutError")
+
+    written = []
+    incremental = SimpleNamespace(cut_off={})
+    counts = merge_run(
+        queue,
+        RUN,
+        lambda label, rows: written.append((label, [r["name"] for r in rows])),
+        lambda trends, scrape_time, category, granularity: [dict(t, category=category) for t in trends],
+        incremental=incremental,
+    )
+
+    assert written == [
+        ("Sports", ["Sports p1", "Sports p2", "Sports p3", "Sports p4"]),
+        ("Health", ["Health p1", "Health p2"]),
+    ]
+    assert counts == {"Sports": 4, "Health": 2}
+    assert incremental.cut_off == {"Health": True}
+
+
+def test_merge_run_labels_by_data_type_when_the_run_has_several(queue):
+    units = _create(queue, pages=2, data_types=("Tiktok", "Reddit"))
+    for unit in units:
+        queue.claim(RUN, "w", 300)
+        queue.complete(unit, "w", _trends(unit))
+
+    written = {}
+    merge_run(queue, RUN, written.__setitem__, lambda trends, *_: [dict(t) for t in trends])
+
+    assert list(written) == ["Tiktok / Daily / Sports", "Reddit / Daily / Sports"]
+    assert [r["data_type"] for r in written["Reddit / Daily / Sports"]] == ["Reddit", "Reddit"]
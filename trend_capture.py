@@ -0,0 +1,94 @@
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Pattern, Union
+
+from playwright.sync_api import Page, Response, TimeoutError as PlaywrightTimeoutError
+
+from exploding_trends_page import TRENDS_URL_RE
+from trend_payload import payload_to_trends  # re-exported
+
+
+class TrendCapture:
+    """
+    Collects the trend grid's JSON responses for one page and turns them into rows.
+
+    Opt-in: pass it to `ExplodingTrendsPage(page, capture=...)`. When no matching
+    payload shows up, `take_rows` returns None and the page object falls back to the DOM.
+    """
+
+    def __init__(
+        self,
+        url_pattern: Union[str, Pattern[str]] = TRENDS_URL_RE,
+        record_dir: Optional[Union[str, Path]] = None,
+    ) -> None:
+        self.url_pattern: Pattern[str] = re.compile(url_pattern) if isinstance(url_pattern, str) else url_pattern
+        self.record_dir = Path(record_dir) if record_dir else None
+        self.page: Optional[Page] = None
+        self.responses: List[Response] = []
+        self.recorded = 0
+
+    def attach(self, page: Page) -> "TrendCapture":
+        """Start listening to the page's responses."""
+        self.page = page
+        page.on("response", self._on_response)
+        return self
+
+    def detach(self) -> None:
+        """Stop listening and forget pending responses."""
+        if self.page is not None:
+            self.page.remove_listener("response", self._on_response)
+        self.page = None
+        self.responses.clear()
+
+    def matches(self, response: Response) -> bool:
+        """True for successful XHR/fetch responses of the trends endpoint."""
+        return (
+            response.ok
+            and response.request.resource_type in ("xhr", "fetch")
+            and bool(self.url_pattern.search(response.url))
+        )
+
+    def _on_response(self, response: Response) -> None:
+        # Only keep the reference here; the body is read later from the main flow
+        if self.matches(response):
+            self.responses.append(response)
+
+    def clear(self) -> None:
+        """Drop payloads seen so far (e.g. before switching category)."""
+        self.responses.clear()
+
+    def take_rows(self, timeout: int = 5_000) -> Optional[List[Dict[str, str]]]:
+        """
+        Rows from the newest trends payload since the last call, or None if none arrived
+        within `timeout` ms or it could not be decoded.
+        """
+        if not self.responses and self.page is not None:
+            try:
+                self.responses.append(
+                    self.page.wait_for_event("response", predicate=self.matches, timeout=timeout)
+                )
+            except PlaywrightTimeoutError:
+                return None
+        if not self.responses:
+            return None
+
+        response = self.responses[-1]  # newest wins, older ones belong to previous pages
+        self.responses.clear()
+        try:
+            payload = response.json()
+        except Exception as e:
+            logging.debug(f"Trends payload not decodable ({response.url}): {e}")
+            return None
+
+        if self.record_dir is not None:
+            self._record(payload)
+        return payload_to_trends(payload) or None
+
+    def _record(self, payload: Any) -> None:
+        """Save a payload so it can be replayed by mock_tickertrends_site."""
+        self.record_dir.mkdir(parents=True, exist_ok=True)
+        self.recorded += 1
+        path = self.record_dir / f"page_{self.recorded}.json"
+        path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
@@ -0,0 +1,77 @@
+"""
+The trends API payload as scraper rows, without a browser: `payload_to_trends`
+turns one /api/trends response into the dicts `extract_page_trends` returns.
+Used by trend_capture, the mock site and the parsing benchmarks.
+"""
+from typing import Any, Dict, List
+
+from trend_values import parse_card
+
+# Payload keys seen for the item list and for each field of an item (first match wins)
+ITEM_LIST_KEYS = ("trends", "data", "results", "items", "rows")
+NAME_KEYS = ("name", "keyword", "term", "title", "trend")
+GROWTH_KEYS = ("raw_growth", "growth", "growth_rate", "growthRate", "change")
+TICKER_LIST_KEYS = ("tickers", "top_tickers", "topTickers", "associated_tickers")
+TICKER_KEYS = ("ticker_symbol", "tickerSymbol", "ticker", "symbol")
+TICKER_PCT_KEYS = ("ticker_percent", "tickerPercent", "percent", "percentage", "score")
+
+
+def _first(item: Dict[str, Any], keys) -> Any:
+    for k in keys:
+        if item.get(k) not in (None, ""):
+            return item[k]
+    return None
+
+
+def _num_text(v: Any) -> str:
+    """Format a JSON number the way the cards print it (no trailing '.0')."""
+    if isinstance(v, float) and v.is_integer():
+        v = int(v)
+    return str(v)
+
+
+def _growth_text(v: Any) -> str:
+    """Render a growth value like the card chip does, e.g. 4454 -> '+4454%'."""
+    if v is None:
+        return ""
+    if isinstance(v, (int, float)) and not isinstance(v, bool):
+        return f"{'-' if v < 0 else '+'}{_num_text(abs(v))}%"
+    return str(v).strip()
+
+
+def _payload_items(payload: Any) -> List[Dict[str, Any]]:
+    """Find the list of trend objects inside a response payload."""
+    if isinstance(payload, list):
+        return [i for i in payload if isinstance(i, dict)]
+    if isinstance(payload, dict):
+        for k in ITEM_LIST_KEYS:
+            if k in payload:
+                return _payload_items(payload[k])
+    return []
+
+
+def payload_to_trends(payload: Any) -> List[Dict[str, str]]:
+    """Convert one trends JSON payload into the same dicts `extract_page_trends` returns."""
+    results: List[Dict[str, str]] = []
+
+    for item in _payload_items(payload):
+        ticker: Any = item
+        tickers = _first(item, TICKER_LIST_KEYS)
+        if isinstance(tickers, list):
+            ticker = tickers[0] if tickers and isinstance(tickers[0], dict) else {}
+        elif isinstance(tickers, dict):
+            ticker = tickers
+
+        symbol = _first(ticker, TICKER_KEYS)
+        if isinstance(symbol, dict):
+            ticker, symbol = symbol, _first(symbol, TICKER_KEYS)
+        pct = _first(ticker, TICKER_PCT_KEYS)
+
+        results.append(parse_card(
+            name=str(_first(item, NAME_KEYS) or "").strip(),
+            raw_growth=_growth_text(_first(item, GROWTH_KEYS)),
+            ticker_symbol=str(symbol or "").strip(),
+            pct_txt=_num_text(pct).strip() if pct is not None else "",
+        ))
+
+    return results
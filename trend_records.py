@@ -0,0 +1,154 @@
+"""
+Compact, normalized trend records.
+
+`normalize_batch` parses value (scientific notation included), sign and ticker
+percent of a whole category in one go (vectorized with NumPy when installed, plain
+Python otherwise). `TrendRecord` is a slotted record holding the card's texts,
+which the rows carry unchanged, next to the parsed numbers; `dedupe_records`
+drops repeats of the same (category, name, ticker) — rankings can shift while
+paginating, so a trend can show up on two pages.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from trend_values import to_float
+
+try:
+    import numpy as np
+except ImportError:  # optional: only speeds up normalize_batch
+    np = None
+
+Trend = Dict[str, str]
+Key = Tuple[str, str, str]
+
+
+def _nan_if_none(v: Optional[float]) -> float:
+    return float("nan") if v is None else v
+
+
+def _floats(texts: List[str]) -> Any:
+    """Texts → float64 array (NaN for empty / unparsable)."""
+    arr = np.char.strip(np.char.replace(np.char.replace(np.array(texts, dtype=str), ",", ""), "%", ""))
+    out = np.full(arr.shape, np.nan)
+    filled = arr != ""
+    try:
+        out[filled] = arr[filled].astype(np.float64)
+    except ValueError:  # some garbage in the batch → parse those one by one
+        out[filled] = [_nan_if_none(to_float(t)) for t in arr[filled]]
+    return out
+
+
+def normalize_batch(trends: List[Trend]) -> Dict[str, List[Optional[float]]]:
+    """
+    Numeric columns of a batch of page-object trend dicts:
+    `value` (unsigned growth), `growth` (signed) and `ticker_percent`; None where missing.
+    """
+    values = [t.get("value", "") or "" for t in trends]
+    percents = [t.get("ticker_percent", "") or "" for t in trends]
+    signs = [t.get("sign", "") or "" for t in trends]
+
+    if np is None or not trends:  # NumPy's string ops fail on empty arrays
+        value = [to_float(v) for v in values]
+        growth = [None if v is None else (-v if "-" in s else v) for v, s in zip(value, signs)]
+        return {"value": value, "growth": growth, "ticker_percent": [to_float(p) for p in percents]}
+
+    value_arr = _floats(values)
+    negative = np.char.find(np.array(signs, dtype=str), "-") >= 0
+    growth_arr = np.where(negative, -value_arr, value_arr)
+    pct_arr = _floats(percents)
+
+    def column(arr: Any) -> List[Optional[float]]:
+        return [None if v != v else v for v in arr.tolist()]  # NaN → None
+
+    return {"value": column(value_arr), "growth": column(growth_arr), "ticker_percent": column(pct_arr)}
+
+
+class TrendRecord:
+    """
+    One trend card of one category: the card's texts as scraped (written out
+    unchanged, e.g. '<1%' or '12.50') plus the parsed numbers for sorting and math.
+    """
+
+    __slots__ = (
+        "category", "name", "sign", "value_text", "raw_growth", "ticker_symbol", "ticker_percent_text",
+        "value", "growth", "ticker_percent",
+    )
+
+    def __init__(
+        self,
+        category: str,
+        name: str,
+        sign: str,
+        value_text: str,
+        raw_growth: str,
+        ticker_symbol: str,
+        ticker_percent_text: str,
+        value: Optional[float] = None,
+        growth: Optional[float] = None,
+        ticker_percent: Optional[float] = None,
+    ) -> None:
+        self.category = category
+        self.name = name
+        self.sign = sign
+        self.value_text = value_text
+        self.raw_growth = raw_growth
+        self.ticker_symbol = ticker_symbol
+        self.ticker_percent_text = ticker_percent_text
+        self.value = value  # unsigned growth
+        self.growth = growth  # signed ('+-' counts as negative, see trend_values.signed_growth)
+        self.ticker_percent = ticker_percent
+
+    def key(self) -> Key:
+        return self.category, self.name, self.ticker_symbol
+
+    def as_row(self, scrape_time: str, granularity: str) -> Dict[str, str]:
+        """The nine-key string row the sinks write, with the card's texts unchanged."""
+        return {
+            "scrape_time": scrape_time,
+            "granularity": granularity,
+            "category": self.category,
+            "name": self.name,
+            "sign": self.sign,
+            "value": self.value_text,
+            "raw_growth": self.raw_growth,
+            "ticker_symbol": self.ticker_symbol,
+            "ticker_percent": self.ticker_percent_text,
+        }
+
+    def __repr__(self) -> str:
+        return f"TrendRecord({self.category!r}, {self.name!r}, {self.raw_growth!r}, {self.ticker_symbol!r})"
+
+
+def records_from_trends(category: str, trends: List[Trend]) -> List[TrendRecord]:
+    """Normalize one category's trend dicts (all pages) into records, in page order."""
+    cols = normalize_batch(trends)
+    return [
+        TrendRecord(
+            category,
+            t.get("name", ""),
+            t.get("sign", ""),
+            t.get("value", "") or "",
+            t.get("raw_growth", ""),
+            t.get("ticker_symbol", ""),
+            t.get("ticker_percent", "") or "",
+            value,
+            growth,
+            pct,
+        )
+        for t, value, growth, pct in zip(trends, cols["value"], cols["growth"], cols["ticker_percent"])
+    ]
+
+
+def dedupe_records(records: Iterable[TrendRecord]) -> List[TrendRecord]:
+    """
+    Keep the first record per (category, name, ticker), in scrape order. The first
+    copy is the one from the earlier page, i.e. the better rank at the time of the
+    scrape, so the result does not depend on how far the ranking shifted.
+    """
+    seen = set()
+    out: List[TrendRecord] = []
+    for r in records:
+        key = r.key()
+        if key not in seen:
+            seen.add(key)
+            out.append(r)
+    return out
@@ -0,0 +1,290 @@
+"""
+Streaming NDJSON output, written category by category.
+
+Rows are serialized compactly (one JSON object per line) as soon as a category is
+finished and land right away: locally they are appended to the file, on S3 every
+category is put as an object of its own (per category, or a chunk of the run
+object). In whole-run mode `close()` assembles the run object from the chunks with
+an S3 multipart upload and deletes them; a run that crashes keeps its chunks. Chunks
+of a full part or more are copied server-side (`upload_part_copy`); only smaller
+ones are read back, into one part buffer. `close()` also writes a small manifest
+next to the data.
+
+Works with any boto3-compatible S3 client, e.g. a moto `mock_aws()` one in tests.
+"""
+import io
+import json
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from trend_values import slug
+
+MIN_PART_SIZE = 5 * 1024 * 1024  # S3 minimum for every part except the last
+
+
+def ndjson_bytes(rows: Iterable[Dict[str, Any]]) -> bytes:
+    """Rows as newline-delimited, non-indented JSON."""
+    return b"".join(
+        json.dumps(r, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+        for r in rows
+    )
+
+
+class _S3Object:
+    """One S3 object fed in chunks; uses multipart only once a full part is buffered."""
+
+    def __init__(self, client: Any, bucket: str, key: str, part_size: int = MIN_PART_SIZE) -> None:
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = max(part_size, MIN_PART_SIZE)
+        self.buffer = io.BytesIO()
+        self.upload_id: Optional[str] = None
+        self.parts: List[Dict[str, Any]] = []
+        self.bytes_written = 0
+
+    def write(self, data: bytes, label: str = "") -> None:
+        self.buffer.write(data)
+        self.bytes_written += len(data)
+        if self.buffer.tell() >= self.part_size:
+            self._upload_part()
+
+    def _start_upload(self) -> None:
+        if self.upload_id is None:
+            resp = self.client.create_multipart_upload(
+                Bucket=self.bucket, Key=self.key, ContentType="application/x-ndjson"
+            )
+            self.upload_id = resp["UploadId"]
+
+    def _upload_part(self) -> None:
+        self._start_upload()
+        body = self.buffer.getvalue()
+        self.buffer = io.BytesIO()
+        number = len(self.parts) + 1
+        resp = self.client.upload_part(
+            Bucket=self.bucket, Key=self.key, UploadId=self.upload_id, PartNumber=number, Body=body
+        )
+        self.parts.append({"ETag": resp["ETag"], "PartNumber": number})
+        logging.info(f"  ↑ part {number} ({len(body)} bytes) → s3://{self.bucket}/{self.key}")
+
+    def copy_part(self, source_key: str, start: int, end: int) -> None:
+        """Bytes [start, end) of another object in the bucket as the next part, copied server-side."""
+        if self.buffer.tell():
+            self._upload_part()  # callers flush only full parts here
+        self._start_upload()
+        number = len(self.parts) + 1
+        resp = self.client.upload_part_copy(
+            Bucket=self.bucket, Key=self.key, UploadId=self.upload_id, PartNumber=number,
+            CopySource={"Bucket": self.bucket, "Key": source_key}, CopySourceRange=f"bytes={start}-{end - 1}",
+        )
+        self.parts.append({"ETag": resp["CopyPartResult"]["ETag"], "PartNumber": number})
+        self.bytes_written += end - start
+        logging.info(f"  ⇉ part {number} ({end - start} bytes) copied from {source_key}")
+
+    def close(self) -> None:
+        if self.upload_id is None:
+            # Small object: a single put is cheaper than a multipart upload
+            self.client.put_object(
+                Bucket=self.bucket, Key=self.key, Body=self.buffer.getvalue(),
+                ContentType="application/x-ndjson",
+            )
+            return
+        if self.buffer.tell():
+            self._upload_part()
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket, Key=self.key, UploadId=self.upload_id,
+            MultipartUpload={"Parts": self.parts},
+        )
+        self.upload_id = None  # completed: nothing left to abort
+
+    def abort(self) -> None:
+        if self.upload_id is not None:
+            self.client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id)
+
+
+class _LocalObject:
+    """Local stand-in for `_S3Object`: appends straight to a file."""
+
+    def __init__(self, root: Path, key: str) -> None:
+        self.key = key
+        self.path = root / key
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.path, "wb")
+        self.parts: List[Dict[str, Any]] = []
+        self.bytes_written = 0
+
+    def write(self, data: bytes, label: str = "") -> None:
+        self.file.write(data)
+        self.file.flush()
+        self.bytes_written += len(data)
+
+    def close(self) -> None:
+        self.file.close()
+
+    def abort(self) -> None:
+        self.file.close()
+
+
+class _S3Chunks:
+    """
+    Whole-run object on S3: each category lands at once as a chunk object, and
+    `close()` concatenates the chunks into `key` (multipart for large runs). A
+    chunk that can fill a part is copied by S3 itself; when small chunks are
+    buffered before it, just enough of its head is read to complete that part.
+    """
+
+    def __init__(self, client: Any, bucket: str, key: str, part_size: int = MIN_PART_SIZE) -> None:
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.chunk_prefix = f"{key}.chunks/"
+        self.chunks: List[Tuple[str, int]] = []  # (key, size)
+        self.target = _S3Object(client, bucket, key, part_size)
+        self.parts = self.target.parts
+        self.bytes_written = 0
+
+    def write(self, data: bytes, label: str = "") -> None:
+        key = f"{self.chunk_prefix}{len(self.chunks):04d}{f'_{slug(label)}' if label else ''}.ndjson"
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=data, ContentType="application/x-ndjson")
+        self.chunks.append((key, len(data)))
+        self.bytes_written += len(data)
+
+    def _read(self, key: str, end: Optional[int] = None) -> bytes:
+        kwargs = {"Range": f"bytes=0-{end - 1}"} if end is not None else {}
+        return self.client.get_object(Bucket=self.bucket, Key=key, **kwargs)["Body"].read()
+
+    def close(self) -> None:
+        for key, size in self.chunks:
+            buffered = self.target.buffer.tell()
+            head = self.target.part_size - buffered if buffered else 0  # bytes that complete the buffered part
+            if size - head < MIN_PART_SIZE:
+                self.target.write(self._read(key))  # too small to be a part of its own
+                continue
+            if head:
+                self.target.write(self._read(key, head))  # fills the buffer → uploaded as one part
+            self.target.copy_part(key, head, size)
+        self.target.close()
+        keys = [k for k, _ in self.chunks]
+        for i in range(0, len(keys), 1000):  # delete_objects takes up to 1000 keys
+            self.client.delete_objects(
+                Bucket=self.bucket, Delete={"Objects": [{"Key": k} for k in keys[i:i + 1000]], "Quiet": True}
+            )
+
+    def abort(self) -> None:
+        """Drop the unfinished run object; the chunks (the data) stay."""
+        self.target.abort()
+
+
+class TrendSink:
+    """
+    Streams scraped rows category by category.
+
+    - bucket_name set → S3 (multipart), else files under `local_dir`
+    - per_category=False → one NDJSON object for the whole run (on S3 built from per-category chunks)
+    - per_category=True  → one NDJSON object per category, closed as soon as it is written
+    """
+
+    def __init__(
+        self,
+        name: str,
+        bucket_name: str = "",
+        prefix: str = "data/",
+        s3_client: Any = None,
+        local_dir: str = "output",
+        per_category: bool = False,
+        part_size: int = MIN_PART_SIZE,
+        key_for: Optional[Callable[[str], str]] = None,
+    ) -> None:
+        if bucket_name and s3_client is None:
+            raise ValueError("s3_client is required when bucket_name is set")
+        self.name = name
+        self.bucket_name = bucket_name
+        self.prefix = prefix
+        self.s3_client = s3_client
+        self.local_dir = Path(local_dir)
+        self.per_category = per_category
+        self.part_size = part_size
+        self.key_for = key_for or (lambda cat: f"{self.prefix}{self.name}_{slug(cat)}.ndjson")
+
+        self.categories: Dict[str, int] = {}
+        self.objects: List[Dict[str, Any]] = []
+        self._run_object: Any = None
+        self.closed = False
+
+    def _open(self, key: str, whole_run: bool = False) -> Any:
+        if self.bucket_name and whole_run:
+            return _S3Chunks(self.s3_client, self.bucket_name, key, self.part_size)
+        if self.bucket_name:
+            return _S3Object(self.s3_client, self.bucket_name, key, self.part_size)
+        return _LocalObject(self.local_dir, key)
+
+    def _describe(self, obj: Any, categories: List[str]) -> Dict[str, Any]:
+        return {
+            "key": obj.key,
+            "categories": categories,
+            "rows": sum(self.categories.get(c, 0) for c in categories),
+            "bytes": obj.bytes_written,
+            "parts": len(obj.parts) or 1,
+        }
+
+    @property
+    def total_rows(self) -> int:
+        return sum(self.categories.values())
+
+    def write_category(self, category: str, rows: List[Dict[str, Any]]) -> None:
+        """Serialize and flush one finished category."""
+        data = ndjson_bytes(rows)
+        self.categories[category] = self.categories.get(category, 0) + len(rows)
+
+        if self.per_category:
+            obj = self._open(self.key_for(category))
+            obj.write(data)
+            obj.close()
+            self.objects.append(self._describe(obj, [category]))
+            return
+
+        if self._run_object is None:
+            self._run_object = self._open(f"{self.prefix}{self.name}.ndjson", whole_run=True)
+        self._run_object.write(data, category)
+
+    def close(self) -> Dict[str, Any]:
+        """Finish the open object, write `<name>_manifest.json` and return the manifest."""
+        if self.closed:
+            return self.manifest()
+
+        if self._run_object is not None:
+            self._run_object.close()  # on failure the object stays open, so abort() can drop it
+            self.objects.append(self._describe(self._run_object, list(self.categories)))
+            self._run_object = None
+
+        manifest = self.manifest()
+        body = json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8")
+        key = f"{self.prefix}{self.name}_manifest.json"
+        if self.bucket_name:
+            self.s3_client.put_object(Bucket=self.bucket_name, Key=key, Body=body, ContentType="application/json")
+            logging.info(f"✅ {self.total_rows} records streamed, manifest s3://{self.bucket_name}/{key}")
+        else:
+            path = self.local_dir / key
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(body)
+            logging.info(f"✅ {self.total_rows} records streamed, manifest {path}")
+        self.closed = True
+        return manifest
+
+    def abort(self) -> None:
+        """Drop an unfinished multipart upload (already closed objects and landed chunks stay)."""
+        if self._run_object is not None:
+            self._run_object.abort()
+            self._run_object = None
+        self.closed = True
+
+    def manifest(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "format": "ndjson",
+            "bucket": self.bucket_name or None,
+            "total_rows": self.total_rows,
+            "categories": self.categories,
+            "objects": self.objects,
+        }
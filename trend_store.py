@@ -0,0 +1,267 @@
+"""
+Historical trend store: every run upserted into one local SQLite file.
+
+Rows are keyed by (scrape_time, granularity, category, name, ticker) and indexed on
+(category, scrape_time), name and ticker symbol, so questions across runs are
+answered from the index instead of by scanning every run file:
+
+    python trend_store.py load output/data/tickertrends_daily_*.ndjson
+    python trend_store.py series "Matcha Latte" --days 30
+    python trend_store.py top --category Technology --days 7 -n 20
+    python trend_store.py tickers --category Technology --days 30
+
+Same write_category / close interface as trend_sink.TrendSink, so the driver can
+upsert while it scrapes.
+"""
+import argparse
+import json
+import logging
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from incremental import load_rows
+from trend_values import parse_scrape_time, signed_growth, to_float
+
+Row = Dict[str, Any]
+
+DEFAULT_PATH = Path("tickertrends_history.sqlite")
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"  # UTC, sorts as text
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trends (
+    scrape_time    TEXT NOT NULL,
+    granularity    TEXT NOT NULL,
+    category       TEXT NOT NULL,
+    name           TEXT NOT NULL,
+    ticker_symbol  TEXT NOT NULL DEFAULT '',
+    rank           INTEGER,
+    sign           TEXT,
+    growth         REAL,
+    raw_growth     TEXT,
+    ticker_percent REAL,
+    run_id         TEXT,
+    PRIMARY KEY (scrape_time, granularity, category, name, ticker_symbol)
+);
+CREATE INDEX IF NOT EXISTS idx_trends_category_time ON trends (category, scrape_time);
+CREATE INDEX IF NOT EXISTS idx_trends_name ON trends (name, scrape_time);
+CREATE INDEX IF NOT EXISTS idx_trends_ticker ON trends (ticker_symbol, scrape_time);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      TEXT PRIMARY KEY,
+    scrape_time TEXT,
+    rows        INTEGER NOT NULL,
+    loaded_at   REAL NOT NULL
+);
+"""
+
+UPSERT = """
+INSERT INTO trends VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (scrape_time, granularity, category, name, ticker_symbol) DO UPDATE SET
+    rank = excluded.rank, sign = excluded.sign, growth = excluded.growth,
+    raw_growth = excluded.raw_growth, ticker_percent = excluded.ticker_percent, run_id = excluded.run_id
+"""
+
+
+def _since(days: Optional[float]) -> str:
+    if not days:
+        return ""
+    return (datetime.now(timezone.utc) - timedelta(days=days)).strftime(TIME_FORMAT)
+
+
+class TrendStore:
+    """SQLite store of all scraped rows, with a few indexed queries."""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_PATH, run_id: str = "") -> None:
+        self.path = Path(path)
+        self.run_id = run_id
+        self.db = sqlite3.connect(self.path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+        self.rows_written = 0
+        self.scrape_time = ""
+
+    # ---------- writing ----------
+    def upsert(self, rows: List[Row], run_id: str = "") -> int:
+        """Insert or update rows (the nine-key dicts the drivers produce); returns the count."""
+        params = []
+        rank: Dict[str, int] = {}
+        for r in rows:
+            cat = r.get("category", "")
+            rank[cat] = rank.get(cat, 0) + 1  # position within the category, in scrape order
+            params.append((
+                parse_scrape_time(r["scrape_time"]).strftime(TIME_FORMAT),
+                r.get("granularity", ""),
+                cat,
+                r.get("name", ""),
+                r.get("ticker_symbol", "") or "",
+                rank[cat],
+                r.get("sign", ""),
+                signed_growth(r.get("sign", ""), r.get("value")),
+                r.get("raw_growth", ""),
+                to_float(r.get("ticker_percent")),
+                run_id or self.run_id,
+            ))
+        with self.db:
+            self.db.executemany(UPSERT, params)
+        return len(params)
+
+    def record_run(self, run_id: str, scrape_time: str, rows: int) -> None:
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?)", (run_id, scrape_time, rows, time.time())
+            )
+
+    def load(self, source: str, s3_client: Any = None) -> int:
+        """Backfill one run file (JSON list, NDJSON or diff; local or s3://)."""
+        rows = load_rows(source, s3_client)
+        run_id = Path(source).stem
+        n = self.upsert(rows, run_id=run_id)
+        self.record_run(run_id, rows[0].get("scrape_time", "") if rows else "", n)
+        return n
+
+    # ---------- sink interface ----------
+    def write_category(self, category: str, rows: List[Row]) -> None:
+        if rows:
+            self.scrape_time = self.scrape_time or rows[0].get("scrape_time", "")
+            self.rows_written += self.upsert(rows)
+
+    def close(self) -> Dict[str, Any]:
+        if self.run_id:
+            self.record_run(self.run_id, self.scrape_time, self.rows_written)
+        self.db.close()
+        logging.info(f"✅ {self.rows_written} rows upserted into {self.path}")
+        return {"path": str(self.path), "rows": self.rows_written}
+
+    # ---------- queries ----------
+    def _query(self, sql: str, params: Dict[str, Any]) -> List[Row]:
+        return [dict(r) for r in self.db.execute(sql, params)]
+
+    @staticmethod
+    def _where(category: str, days: Optional[float], *conditions: str) -> str:
+        """WHERE clause; the category filter is only added when set so the (category, scrape_time) index applies."""
+        clauses = list(conditions) + (["category = :category"] if category else []) + ["scrape_time >= :since"]
+        return "WHERE " + " AND ".join(clauses)
+
+    def series(self, name: str, category: str = "", days: Optional[float] = None) -> List[Row]:
+        """Growth / ticker of one trend over time (oldest first)."""
+        return self._query(
+            f"""
+            SELECT scrape_time, category, rank, growth, raw_growth, ticker_symbol, ticker_percent
+            FROM trends
+            {self._where(category, days, "name = :name")}
+            ORDER BY scrape_time
+            """,
+            {"name": name, "category": category, "since": _since(days)},
+        )
+
+    def top_growth(self, category: str = "", days: Optional[float] = 7, limit: int = 20) -> List[Row]:
+        """Trends with the highest growth seen within the window."""
+        return self._query(
+            f"""
+            SELECT category, name, MAX(growth) AS max_growth, COUNT(*) AS seen,
+                   MIN(scrape_time) AS first_seen, MAX(scrape_time) AS last_seen
+            FROM trends
+            {self._where(category, days, "growth IS NOT NULL")}
+            GROUP BY category, name
+            ORDER BY max_growth DESC
+            LIMIT :limit
+            """,
+            {"category": category, "since": _since(days), "limit": limit},
+        )
+
+    def ticker_occurrence(self, category: str = "", days: Optional[float] = 30, limit: int = 20) -> List[Row]:
+        """Tickers that keep showing up: appearances, distinct trends and distinct runs."""
+        return self._query(
+            f"""
+            SELECT ticker_symbol, COUNT(*) AS appearances, COUNT(DISTINCT name) AS trends,
+                   COUNT(DISTINCT scrape_time) AS runs, ROUND(AVG(ticker_percent), 1) AS avg_percent
+            FROM trends
+            {self._where(category, days, "ticker_symbol != ''")}
+            GROUP BY ticker_symbol
+            ORDER BY runs DESC, appearances DESC
+            LIMIT :limit
+            """,
+            {"category": category, "since": _since(days), "limit": limit},
+        )
+
+    def ticker_categories(self, ticker: str, days: Optional[float] = 30) -> List[Row]:
+        """Categories (and how many trends in each) one ticker co-occurs with."""
+        return self._query(
+            f"""
+            SELECT category, COUNT(DISTINCT name) AS trends, COUNT(*) AS appearances
+            FROM trends
+            {self._where("", days, "ticker_symbol = :ticker")}
+            GROUP BY category
+            ORDER BY trends DESC
+            """,
+            {"ticker": ticker, "since": _since(days)},
+        )
+
+
+# ---------- CLI ----------
+def _print_table(rows: List[Row]) -> None:
+    if not rows:
+        print("(no rows)")
+        return
+    cols = list(rows[0])
+    widths = [max(len(c), *(len(str(r[c])) for r in rows)) for c in cols]
+    print("  ".join(c.ljust(w) for c, w in zip(cols, widths)))
+    for r in rows:
+        print("  ".join(str(r[c]).ljust(w) for c, w in zip(cols, widths)))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="Query the historical trend store.")
+    parser.add_argument("--db", default=str(DEFAULT_PATH))
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("load", help="upsert run files (JSON / NDJSON / diff, local or s3://)")
+    p.add_argument("sources", nargs="+")
+
+    p = sub.add_parser("series", help="one trend over time")
+    p.add_argument("name")
+    p.add_argument("--category", default="")
+    p.add_argument("--days", type=float, default=30)
+
+    p = sub.add_parser("top", help="top-N growth within a window")
+    p.add_argument("--category", default="")
+    p.add_argument("--days", type=float, default=7)
+    p.add_argument("-n", type=int, default=20)
+
+    p = sub.add_parser("tickers", help="tickers that keep showing up (or where one ticker shows up)")
+    p.add_argument("--category", default="")
+    p.add_argument("--ticker", default="", help="list the categories of this ticker instead")
+    p.add_argument("--days", type=float, default=30)
+    p.add_argument("-n", type=int, default=20)
+    args = parser.parse_args()
+
+    store = TrendStore(args.db)
+    start = time.perf_counter()
+    if args.command == "load":
+        s3_client = None
+        if any(s.startswith("s3://") for s in args.sources):
+            import boto3
+            s3_client = boto3.client("s3")
+        for source in args.sources:
+            logging.info(f"{source}: {store.load(source, s3_client)} rows")
+        result: List[Row] = []
+    elif args.command == "series":
+        result = store.series(args.name, args.category, args.days)
+    elif args.command == "top":
+        result = store.top_growth(args.category, args.days, args.n)
+    elif args.ticker:
+        result = store.ticker_categories(args.ticker, args.days)
+    else:
+        result = store.ticker_occurrence(args.category, args.days, args.n)
+
+    if args.command != "load":
+        if args.json:
+            print(json.dumps(result, indent=2))
+        else:
+            _print_table(result)
+        logging.info(f"{len(result)} rows in {(time.perf_counter() - start) * 1000:.1f} ms")
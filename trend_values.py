@@ -0,0 +1,67 @@
+"""Helpers for the string fields of a scraped row: card texts, numbers, scrape time, category slugs."""
+import re
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+SCRAPE_TIME_FORMAT = "%Y-%m-%d %H:%M:%S %Z"
+GROWTH_RE = re.compile(r"^\s*([+\-]{1,2})\s*([\d,\.]+(?:e[+\-]?\d+)?)\s*%?\s*$", re.I)
+PCT_RE = re.compile(r"^\s*([\d\.]+)\s*%?\s*$")
+
+
+def parse_card(name: str, raw_growth: str, ticker_symbol: str, pct_txt: str) -> Dict[str, str]:
+    """Turn the raw texts of one trend card into the row dict used by the scrapers."""
+    # --- growth chip (e.g., +4454%) ---
+    m = GROWTH_RE.match(raw_growth.replace("%", ""))
+    if m:
+        sign, val = m.groups()
+        # There are not any commas but just in case
+        val = val.replace(",", "")
+    else:
+        sign = val = ""
+
+    # --- top ticker percent ('83%' -> '83') ---
+    pm = PCT_RE.match(pct_txt)
+    ticker_percent = pm.group(1) if pm else pct_txt  # '83' or fallback
+
+    return {
+        "name": name,
+        "sign": sign,  # '+', '-', '+-'
+        "value": val,  # numeric string (supports scientific notation)
+        "raw_growth": raw_growth,  # original chip text
+        "ticker_symbol": ticker_symbol,  # e.g., 'AAPL'
+        "ticker_percent": ticker_percent,  # e.g., '83'
+    }
+
+
+def to_float(text: Optional[str]) -> Optional[float]:
+    """'4454', '1.2e5', '83%', '1,234' -> float; '' or garbage -> None."""
+    if text is None:
+        return None
+    text = str(text).strip().replace(",", "").rstrip("%").strip()
+    if not text:
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def signed_growth(sign: str, value: Optional[str]) -> Optional[float]:
+    """
+    Growth with its sign applied. The chip prints negatives as '-' or '+-'
+    (a '+' prefix glued to a negative number), so any '-' in the sign means negative.
+    """
+    v = to_float(value)
+    if v is None:
+        return None
+    return -v if "-" in (sign or "") else v
+
+
+def parse_scrape_time(text: str) -> datetime:
+    """'2025-10-29 23:38:30 UTC' -> aware datetime (UTC)."""
+    return datetime.strptime(text, SCRAPE_TIME_FORMAT).replace(tzinfo=timezone.utc)
+
+
+def slug(text: str) -> str:
+    """'Real Estate & Housing' -> 'real-estate-housing' (for object keys and file names)."""
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
@@ -0,0 +1,554 @@
+"""
+Distributed scrape runs: a work queue shared by workers on several machines / accounts.
+
+A run is split into units of (data type, granularity, category, page range).
+Workers, each with its own credentials and browser, claim units with a lease,
+heartbeat while scraping, and hand the unit's trends back through the queue.
+A unit whose lease runs out (crashed worker) is claimed again by someone else,
+and one that fails is retried up to `max_attempts` times. The coordinator merges
+the finished units back, pages in order and repeats dropped, into the usual
+sinks (NDJSON, dashboard, trend store ...).
+
+The queue is a SQLite file here (`SQLiteQueue`, fine for workers on one host or a
+shared volume with proper locking); another broker plugs in as a `QueueBackend`
+registered in `BACKENDS` under its URL scheme.
+
+    python work_queue.py plan   --run sweep_0601 --data-types Tiktok --granularities Daily Weekly --pages-per-unit 4
+    python work_queue.py worker --run sweep_0601 --secret tickertrends_login_2     # one per account / host
+    python work_queue.py status --run sweep_0601
+    python work_queue.py merge  --run sweep_0601 --wait
+"""
+import argparse
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Union
+
+Row = Dict[str, str]
+
+DEFAULT_URL = "sqlite:///tickertrends_queue.sqlite"
+
+
+class WorkUnit(NamedTuple):
+    run_id: str
+    seq: int  # position in the run, used for claiming and merging in order
+    data_type: str
+    granularity: str
+    category: str
+    first_page: int
+    last_page: int
+
+    @property
+    def unit_id(self) -> str:
+        return f"{self.data_type}|{self.granularity}|{self.category}|{self.first_page}-{self.last_page}"
+
+
+def plan_units(
+    run_id: str,
+    data_types: Sequence[str],
+    granularities: Sequence[str],
+    categories: Sequence[str],
+    max_pages: int,
+    pages_per_unit: int,
+) -> List[WorkUnit]:
+    """Every combination split into page ranges of `pages_per_unit` (the last one may be shorter)."""
+    units: List[WorkUnit] = []
+    for data_type in data_types:
+        for granularity in granularities:
+            for category in categories:
+                for first in range(1, max_pages + 1, pages_per_unit):
+                    last = min(max_pages, first + pages_per_unit - 1)
+                    units.append(WorkUnit(run_id, len(units), data_type, granularity, category, first, last))
+    return units
+
+
+# ---------- BACKENDS ----------
+class QueueBackend(ABC):
+    """What a queue has to provide; `SQLiteQueue` is the local implementation."""
+
+    @abstractmethod
+    def create_run(self, run_id: str, units: Sequence[WorkUnit], meta: Dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    def run_meta(self, run_id: str) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    def claim(self, run_id: str, worker_id: str, lease_seconds: float) -> Optional[WorkUnit]:
+        """Lease the next pending (or expired) unit, or None."""
+
+    @abstractmethod
+    def heartbeat(self, unit: WorkUnit, worker_id: str, lease_seconds: float) -> bool:
+        """Extend the lease; False when the worker no longer holds it."""
+
+    @abstractmethod
+    def complete(self, unit: WorkUnit, worker_id: str, trends: List[Row]) -> bool:
+        ...
+
+    @abstractmethod
+    def fail(self, unit: WorkUnit, worker_id: str, error: str) -> None:
+        ...
+
+    @abstractmethod
+    def progress(self, run_id: str) -> Dict[str, int]:
+        """Unit counts per status: pending, leased, done, failed."""
+
+    @abstractmethod
+    def results(self, run_id: str) -> Iterator[tuple]:
+        """(unit, trends) of every finished unit, in `seq` order."""
+
+    @abstractmethod
+    def failures(self, run_id: str) -> List[Dict[str, Any]]:
+        """Units given up on: seq, data_type, granularity, category, pages, attempts and the last error."""
+
+    def close(self) -> None:
+        pass
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id     TEXT PRIMARY KEY,
+    meta       TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS units (
+    run_id      TEXT NOT NULL,
+    seq         INTEGER NOT NULL,
+    data_type   TEXT NOT NULL,
+    granularity TEXT NOT NULL,
+    category    TEXT NOT NULL,
+    first_page  INTEGER NOT NULL,
+    last_page   INTEGER NOT NULL,
+    status      TEXT NOT NULL DEFAULT 'pending',
+    worker      TEXT,
+    lease_until REAL,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    error       TEXT,
+    trends      TEXT,
+    updated_at  REAL,
+    PRIMARY KEY (run_id, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_units_claim ON units (run_id, status, seq);
+"""
+
+
+class SQLiteQueue(QueueBackend):
+    """
+    Work queue in one SQLite file (WAL). Claims run in an IMMEDIATE transaction, so
+    two workers never lease the same unit. Thread-safe (the heartbeat runs in its
+    own thread).
+    """
+
+    def __init__(self, path: Union[str, Path], max_attempts: int = 3) -> None:
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.db
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+            self.db.execute("COMMIT")
+
+    def create_run(self, run_id: str, units: Sequence[WorkUnit], meta: Dict[str, Any]) -> None:
+        with self._transaction() as db:
+            if db.execute("SELECT 1 FROM runs WHERE run_id = ?", (run_id,)).fetchone():
+                raise ValueError(f"run {run_id!r} already exists in {self.path}")
+            db.execute("INSERT INTO runs VALUES (?, ?, ?)", (run_id, json.dumps(meta), time.time()))
+            db.executemany(
+                "INSERT INTO units (run_id, seq, data_type, granularity, category, first_page, last_page) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [tuple(u) for u in units],
+            )
+
+    def run_meta(self, run_id: str) -> Dict[str, Any]:
+        with self.lock:
+            row = self.db.execute("SELECT meta FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"no run {run_id!r} in {self.path}")
+        return json.loads(row[0])
+
+    def claim(self, run_id: str, worker_id: str, lease_seconds: float) -> Optional[WorkUnit]:
+        now = time.time()
+        with self._transaction() as db:
+            # Expired leases that used up their attempts are given up on
+            db.execute(
+                "UPDATE units SET status = 'failed', error = COALESCE(error, 'lease expired'), updated_at = ? "
+                "WHERE run_id = ? AND status = 'leased' AND lease_until < ? AND attempts >= ?",
+                (now, run_id, now, self.max_attempts),
+            )
+            row = db.execute(
+                "SELECT run_id, seq, data_type, granularity, category, first_page, last_page FROM units "
+                "WHERE run_id = ? AND (status = 'pending' OR (status = 'leased' AND lease_until < ?)) "
+                "ORDER BY seq LIMIT 1",
+                (run_id, now),
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE units SET status = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE run_id = ? AND seq = ?",
+                (worker_id, now + lease_seconds, now, run_id, row[1]),
+            )
+        return WorkUnit(*row)
+
+    def heartbeat(self, unit: WorkUnit, worker_id: str, lease_seconds: float) -> bool:
+        now = time.time()
+        with self._transaction() as db:
+            cur = db.execute(
+                "UPDATE units SET lease_until = ?, updated_at = ? "
+                "WHERE run_id = ? AND seq = ? AND status = 'leased' AND worker = ?",
+                (now + lease_seconds, now, unit.run_id, unit.seq, worker_id),
+            )
+        return cur.rowcount == 1
+
+    def complete(self, unit: WorkUnit, worker_id: str, trends: List[Row]) -> bool:
+        # A late result of an expired lease still counts, unless another worker finished first
+        with self._transaction() as db:
+            cur = db.execute(
+                "UPDATE units SET status = 'done', worker = ?, trends = ?, error = NULL, updated_at = ? "
+                "WHERE run_id = ? AND seq = ? AND status != 'done'",
+                (worker_id, json.dumps(trends, ensure_ascii=False), time.time(), unit.run_id, unit.seq),
+            )
+        return cur.rowcount == 1
+
+    def fail(self, unit: WorkUnit, worker_id: str, error: str) -> None:
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE units SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "error = ?, lease_until = NULL, updated_at = ? "
+                "WHERE run_id = ? AND seq = ? AND status = 'leased' AND worker = ?",
+                (self.max_attempts, error, time.time(), unit.run_id, unit.seq, worker_id),
+            )
+
+    def progress(self, run_id: str) -> Dict[str, int]:
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        with self.lock:
+            for status, n in self.db.execute(
+                "SELECT status, COUNT(*) FROM units WHERE run_id = ? GROUP BY status", (run_id,)
+            ):
+                counts[status] = n
+        return counts
+
+    def results(self, run_id: str) -> Iterator[tuple]:
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT run_id, seq, data_type, granularity, category, first_page, last_page, trends FROM units "
+                "WHERE run_id = ? AND status = 'done' ORDER BY seq",
+                (run_id,),
+            ).fetchall()
+        for row in rows:
+            yield WorkUnit(*row[:7]), json.loads(row[7])
+
+    def failures(self, run_id: str) -> List[Dict[str, Any]]:
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT seq, data_type, granularity, category, first_page, last_page, attempts, error FROM units "
+                "WHERE run_id = ? AND status = 'failed' ORDER BY seq",
+                (run_id,),
+            ).fetchall()
+        keys = ("seq", "data_type", "granularity", "category", "first_page", "last_page", "attempts", "error")
+        return [dict(zip(keys, r)) for r in rows]
+
+    def close(self) -> None:
+        self.db.close()
+
+
+BACKENDS: Dict[str, Callable[[str], QueueBackend]] = {
+    "sqlite": lambda location: SQLiteQueue(location),
+}
+
+
+def open_queue(url: str = DEFAULT_URL) -> QueueBackend:
+    """`sqlite:///path/queue.sqlite` (or a plain path) → SQLiteQueue; other schemes from BACKENDS."""
+    scheme, sep, location = url.partition("://")
+    if not sep:
+        scheme, location = "sqlite", url
+    elif scheme == "sqlite":
+        location = location[1:] if location.startswith("/") else location  # sqlite:///rel, sqlite:////abs
+    factory = BACKENDS.get(scheme)
+    if factory is None:
+        raise ValueError(f"no queue backend for {scheme!r} (known: {', '.join(BACKENDS)})")
+    return factory(location)
+
+
+# ---------- WORKER ----------
+@contextmanager
+def heartbeat(queue: QueueBackend, unit: WorkUnit, worker_id: str, lease_seconds: float) -> Iterator[threading.Event]:
+    """Keeps the lease alive in the background; the yielded event is set once it was lost."""
+    lost, stop = threading.Event(), threading.Event()
+
+    def beat() -> None:
+        while not stop.wait(lease_seconds / 3):
+            if not queue.heartbeat(unit, worker_id, lease_seconds):
+                logging.warning(f"⚠️ Lease on {unit.unit_id} lost — another worker may redo it")
+                lost.set()
+                return
+
+    thread = threading.Thread(target=beat, name=f"heartbeat-{unit.seq}", daemon=True)
+    thread.start()
+    try:
+        yield lost
+    finally:
+        stop.set()
+        thread.join()
+
+
+def scrape_unit(et: Any, unit: WorkUnit) -> List[Row]:
+    """
+    Trends of the unit's pages (page-object dicts). A unit starting past the last
+    page is empty; any other page that does not render raises, so the unit is retried.
+    """
+    et.choose_data_type(unit.data_type)  # all three skip when already set
+    et.choose_view("List View")
+    et.choose_time_granularity(unit.granularity)
+    et.choose_category(unit.category)
+    try:
+        trends: List[Row] = []
+        for page_no in range(unit.first_page, unit.last_page + 1):
+            if page_no > 1:
+                et.page.goto(et.page_url(page_no), wait_until="domcontentloaded", timeout=30_000)
+            try:
+                rows = et.extract_page_trends()
+            except AssertionError:
+                if page_no == unit.first_page and page_no > 1 and et.past_last_page():
+                    break
+                raise
+            trends.extend(rows)
+            if not et.has_next():
+                break  # last page of the category
+        return trends
+    finally:
+        if et.current_page_no() != 1:
+            try:
+                et.page.goto(et.page_url(1), wait_until="domcontentloaded", timeout=30_000)
+            except Exception as e:  # never hide the scrape's own error
+                logging.warning(f"  ⚠️ Could not go back to page 1 of {unit.category}: {e}")
+        et.choose_category(unit.category)  # unselect
+
+
+def run_worker(
+    queue: QueueBackend,
+    run_id: str,
+    worker_id: str,
+    open_page: Callable[[], Any],
+    lease_seconds: float = 300,
+    poll_seconds: float = 10,
+) -> int:
+    """
+    Claim and scrape units until the run has nothing left to lease; returns the units done.
+    `open_page()` opens this worker's logged-in Exploding Trends page (own account / browser).
+    """
+    et = None
+    done = 0
+    while True:
+        unit = queue.claim(run_id, worker_id, lease_seconds)
+        if unit is None:
+            progress = queue.progress(run_id)
+            if not progress["pending"] and not progress["leased"]:
+                break
+            time.sleep(poll_seconds)  # others hold the rest; their leases may still expire
+            continue
+
+        logging.info(f"[{worker_id}] Unit {unit.seq}: {unit.unit_id}")
+        try:
+            with heartbeat(queue, unit, worker_id, lease_seconds) as lost:
+                if et is None:
+                    et = open_page()
+                trends = scrape_unit(et, unit)
+            if lost.is_set():
+                logging.info(f"[{worker_id}] Handing back {unit.unit_id} after a lost lease")
+            if queue.complete(unit, worker_id, trends):
+                done += 1
+            logging.info(f"[{worker_id}]  → {len(trends)} trends")
+        except Exception as e:
+            logging.warning(f"[{worker_id}] ⚠️ Unit {unit.unit_id} failed: {e}")
+            queue.fail(unit, worker_id, f"{type(e).__name__}: {e}")
+            et = None  # start from a fresh page for the next unit
+    logging.info(f"[{worker_id}] No units left — {done} done")
+    return done
+
+
+# ---------- COORDINATOR ----------
+def merge_run(
+    queue: QueueBackend,
+    run_id: str,
+    write: Callable[[str, List[Row]], None],
+    to_rows: Callable[[List[Row], str, str, str], List[Row]],
+    incremental: Optional[Any] = None,
+) -> Dict[str, int]:
+    """
+    Hand every (data type, granularity, category) of the run to `write(label, rows)`,
+    its units' pages concatenated in order and turned into rows with
+    `to_rows(trends, scrape_time, category, granularity)`. Returns rows per label.
+    With an `incremental.IncrementalRun` among the sinks, groups with failed units
+    are marked as cut off, so their missing pages are not reported as removed.
+    """
+    meta = queue.run_meta(run_id)
+    multi = len(meta["data_types"]) > 1 or len(meta["granularities"]) > 1
+    failed = {(f["data_type"], f["granularity"], f["category"]) for f in queue.failures(run_id)}
+    written: Dict[str, int] = {}
+
+    def flush(key: tuple, trends: List[Row]) -> None:
+        data_type, granularity, category = key
+        rows = to_rows(trends, meta["scrape_time"], category, granularity)
+        if multi:
+            for row in rows:
+                row["data_type"] = data_type
+        label = f"{data_type} / {granularity} / {category}" if multi else category
+        if incremental is not None and key in failed:
+            incremental.cut_off[label] = True
+        write(label, rows)
+        written[label] = len(rows)
+
+    key, trends = None, []
+    for unit, unit_trends in queue.results(run_id):
+        unit_key = (unit.data_type, unit.granularity, unit.category)
+        if unit_key != key and key is not None:
+            flush(key, trends)
+            trends = []
+        key = unit_key
+        trends.extend(unit_trends)
+    if key is not None:
+        flush(key, trends)
+    return written
+
+
+def wait_for_run(queue: QueueBackend, run_id: str, poll_seconds: float = 15) -> Dict[str, int]:
+    while True:
+        progress = queue.progress(run_id)
+        if not progress["pending"] and not progress["leased"]:
+            return progress
+        logging.info(f"Waiting for {run_id}: {progress}")
+        time.sleep(poll_seconds)
+
+
+# ---------- CLI ----------
+class WorkerBrowser:
+    """One worker's own browser, logged in with its own account (kept for the worker's lifetime)."""
+
+    def __init__(self, secret: str) -> None:
+        from playwright.sync_api import sync_playwright
+
+        import test_tickertrends as driver
+
+        self.driver = driver
+        self.secret = secret
+        self.playwright = sync_playwright().start()
+        self.browser = self.playwright.chromium.launch(**driver.LAUNCH_KWARGS)
+        self.context = None
+
+    def open_page(self) -> Any:
+        """Fresh context + login → Exploding Trends page (the previous context is dropped, it may be broken)."""
+        from homepage_tickertrends import HomePage
+        from routing_profile import RoutingProfile
+
+        if self.context is not None:
+            self.context.close()
+        self.context = self.driver.new_context(self.browser, RoutingProfile() if self.driver.BLOCK_ASSETS else None)
+        page = self.context.new_page()
+        self.driver.login(page, self.driver.get_secret(self.secret))
+        HomePage(page).open_exploding_trends()
+        return self.driver.exploding_trends_page(page)
+
+    def close(self) -> None:
+        self.browser.close()
+        self.playwright.stop()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="Share one scrape run between workers via a work queue.")
+    parser.add_argument("--queue", default=DEFAULT_URL, help="queue URL (sqlite:///path or a registered backend)")
+    parser.add_argument("--run", required=True, help="run id")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("plan", help="split a run into units")
+    p.add_argument("--data-types", nargs="+", default=["Tiktok"])
+    p.add_argument("--granularities", nargs="+", default=["Daily"])
+    p.add_argument("--categories", nargs="+", default=None)
+    p.add_argument("--max-pages", type=int, default=11)
+    p.add_argument("--pages-per-unit", type=int, default=4)
+
+    p = sub.add_parser("worker", help="claim and scrape units with one account")
+    p.add_argument("--secret", default="tickertrends_login", help="Secrets Manager secret with this worker's login")
+    p.add_argument("--worker-id", default=f"{socket.gethostname()}-{os.getpid()}")
+    p.add_argument("--lease-seconds", type=float, default=300)
+
+    sub.add_parser("status", help="unit counts and failures")
+
+    p = sub.add_parser("merge", help="write the finished units to the usual outputs")
+    p.add_argument("--wait", action="store_true", help="wait until no unit is pending or leased")
+    p.add_argument("--bucket", default="", help="S3 bucket (default: files under ./output)")
+    args = parser.parse_args()
+
+    queue = open_queue(args.queue)
+    try:
+        if args.command == "plan":
+            import test_tickertrends as driver
+
+            categories = args.categories or driver.CATEGORIES
+            units = plan_units(args.run, args.data_types, args.granularities, categories, args.max_pages, args.pages_per_unit)
+            queue.create_run(args.run, units, {
+                "data_types": args.data_types,
+                "granularities": args.granularities,
+                "categories": categories,
+                "max_pages": args.max_pages,
+                "scrape_time": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S %Z"),
+            })
+            logging.info(f"✅ Planned {len(units)} units for {args.run}")
+
+        elif args.command == "worker":
+            worker = WorkerBrowser(args.secret)
+            try:
+                run_worker(queue, args.run, args.worker_id, worker.open_page, lease_seconds=args.lease_seconds)
+            finally:
+                worker.close()
+
+        elif args.command == "status":
+            print(json.dumps(queue.progress(args.run)))
+            for failure in queue.failures(args.run):
+                print(json.dumps(failure, ensure_ascii=False))
+
+        else:
+            import test_tickertrends as driver
+
+            progress = wait_for_run(queue, args.run) if args.wait else queue.progress(args.run)
+            if progress["pending"] or progress["leased"] or progress["failed"]:
+                logging.warning(f"⚠️ Merging an incomplete run: {progress}")
+            s3_client = None
+            if args.bucket:
+                import boto3
+                s3_client = boto3.client("s3", region_name="eu-north-1")
+            sinks, incremental = driver.make_sinks(args.bucket, args.run, s3_client)
+            try:
+                written = merge_run(
+                    queue,
+                    args.run,
+                    lambda label, rows: driver.write_to_sinks(sinks, label, rows),
+                    lambda trends, scrape_time, cat, gran: driver.trend_rows(trends, scrape_time, cat, granularity=gran),
+                    incremental,
+                )
+            finally:
+                driver.finish_sinks(sinks, args.run)
+            logging.info(f"✅ Merged {sum(written.values())} rows in {len(written)} groups")
+    finally:
+        queue.close()